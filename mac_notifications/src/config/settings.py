@@ -37,6 +37,7 @@ class Settings:
     DAEMON_BATCH_SIZE = 100
     DAEMON_PID_FILE = DATA_DIR / "notification_daemon.pid"
     DAEMON_LOG_FILE = LOG_DIR / "notification_daemon.log"
+    DAEMON_STATUS_CACHE_TTL = 1.0  # seconds; keep well below DAEMON_UPDATE_INTERVAL
     
     # Cleanup settings
     MAX_NOTIFICATION_AGE_DAYS = 30
@@ -77,6 +78,9 @@ class Settings:
     GROUPING_MIN_SIZE = 2
     GROUPING_DEFAULT_HOURS = 4
     
+    # Batch action settings
+    BATCH_SELECTION_CACHE_TTL = 5.0  # seconds a resolved selection is reused
+    
     # Summary settings
     SUMMARY_TIME_RANGES = {
         "1h": 1,
@@ -90,6 +94,11 @@ class Settings:
     # Analytics settings
     ANALYTICS_DEFAULT_DAYS = 7
     ANALYTICS_MAX_DAYS = 90
+    ANALYTICS_BUCKET_MINUTES = 5  # window end snapped to this interval; results cached per bucket
+    ANALYTICS_PRECOMPUTE_HOUR = 3  # local hour of the nightly precompute run
+    ANALYTICS_PRECOMPUTE_DAYS = (7, 30)  # windows long enough for a nightly snapshot to stay close
+    ANALYTICS_PRECOMPUTE_MAX_NEW = 100  # new notifications before a precomputed result is stale
+    ANALYTICS_PRECOMPUTE_MAX_AGE = 0.1  # fraction of the window a precomputed result may lag behind
     
     # Logging settings
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -101,6 +110,10 @@ class Settings:
     # Performance settings
     CACHE_ENABLED = True
     CACHE_TTL = 300  # seconds
+    RESPONSE_CACHE_TTL = 5.0  # seconds, for idempotent MCP read tools
+    ANALYTICS_RESPONSE_CACHE_TTL = 30.0  # seconds; analytics windows only move per bucket
+    RESPONSE_CACHE_SIZE = 512
+    JSON_EPOCH_DATETIMES = False  # emit datetimes in JSON as Unix epoch seconds
     
     @classmethod
     def load_from_file(cls, config_file: Optional[Path] = None) -> "Settings":
@@ -142,6 +155,10 @@ class Settings:
         if log_level := os.getenv("MAC_NOTIFICATIONS_LOG_LEVEL"):
             cls.LOG_LEVEL = log_level.upper()
         
+        # MCP responses
+        if epoch_datetimes := os.getenv("MAC_NOTIFICATIONS_JSON_EPOCH_DATETIMES"):
+            cls.JSON_EPOCH_DATETIMES = epoch_datetimes.lower() in ('true', '1', 'yes', 'on')
+        
         # Features
         for feature in cls.FEATURES:
             env_key = f"MAC_NOTIFICATIONS_FEATURE_{feature.upper()}"
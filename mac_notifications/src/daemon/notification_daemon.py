@@ -4,6 +4,7 @@ Unified Notification Monitoring Daemon
 Consolidates all daemon functionality with improved architecture
 """
 
+import bisect
 import sqlite3
 import os
 import plistlib
@@ -27,6 +28,10 @@ DEFAULT_CLEANUP_DAYS = 30
 DEFAULT_DB_NAME = "notifications.db"
 MACOS_DB_PATH = os.path.expanduser("~/Library/Group Containers/group.com.apple.usernoted/db2/db")
 
+# Minimum score for each priority level above LOW
+PRIORITY_THRESHOLDS = (5, 10, 15)
+PRIORITY_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
 
 @dataclass
 class NotificationData:
@@ -62,14 +67,17 @@ class DatabaseManager:
     """Handles all database operations"""
     
     def __init__(self, db_path: str):
+        # "file:" URIs (e.g. shared-cache in-memory databases) are passed to SQLite as-is
+        self.is_uri = str(db_path).startswith("file:")
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.is_uri:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
     
     @contextmanager
     def get_connection(self):
         """Context manager for database connections"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = sqlite3.connect(str(self.db_path), uri=self.is_uri)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -108,15 +116,114 @@ class DatabaseManager:
             indexes = [
                 'CREATE INDEX IF NOT EXISTS idx_rec_id ON notifications(rec_id)',
                 'CREATE INDEX IF NOT EXISTS idx_delivered_time ON notifications(delivered_time)',
+                "CREATE INDEX IF NOT EXISTS idx_delivered_epoch ON notifications(CAST(strftime('%s', delivered_time) AS INTEGER))",
                 'CREATE INDEX IF NOT EXISTS idx_app_identifier ON notifications(app_identifier)',
                 'CREATE INDEX IF NOT EXISTS idx_priority_score ON notifications(priority_score DESC)',
                 'CREATE INDEX IF NOT EXISTS idx_priority_level ON notifications(priority_level)',
                 'CREATE INDEX IF NOT EXISTS idx_is_archived ON notifications(is_archived)',
+                'CREATE INDEX IF NOT EXISTS idx_app_time ON notifications(app_identifier, delivered_time DESC)',
+                'CREATE INDEX IF NOT EXISTS idx_time_prio ON notifications(delivered_time DESC, priority_level)',
+                'CREATE INDEX IF NOT EXISTS idx_prio_time ON notifications(priority_level, delivered_time DESC)',
+                'CREATE INDEX IF NOT EXISTS idx_unread_time ON notifications(is_read, delivered_time DESC) WHERE is_read = 0',
             ]
             
             for index in indexes:
                 cursor.execute(index)
             
+            # Trigram full-text index for keyword search (same as migration 7);
+            # AUTOINCREMENT ids are never reused, so rows replaced by
+            # INSERT OR REPLACE cannot leave entries that match a live row
+            fts_statements = [
+                """CREATE VIRTUAL TABLE IF NOT EXISTS notifications_fts USING fts5(
+                    title, subtitle, body,
+                    content='notifications', content_rowid='id', tokenize='trigram'
+                )""",
+                """CREATE TRIGGER IF NOT EXISTS notifications_fts_ai AFTER INSERT ON notifications BEGIN
+                    INSERT INTO notifications_fts(rowid, title, subtitle, body)
+                    VALUES (new.id, new.title, new.subtitle, new.body);
+                END""",
+                """CREATE TRIGGER IF NOT EXISTS notifications_fts_ad AFTER DELETE ON notifications BEGIN
+                    INSERT INTO notifications_fts(notifications_fts, rowid, title, subtitle, body)
+                    VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+                END""",
+                """CREATE TRIGGER IF NOT EXISTS notifications_fts_au
+                AFTER UPDATE OF title, subtitle, body ON notifications BEGIN
+                    INSERT INTO notifications_fts(notifications_fts, rowid, title, subtitle, body)
+                    VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+                    INSERT INTO notifications_fts(rowid, title, subtitle, body)
+                    VALUES (new.id, new.title, new.subtitle, new.body);
+                END""",
+            ]
+            try:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'notifications_fts'")
+                fts_exists = cursor.fetchone() is not None
+                for statement in fts_statements:
+                    cursor.execute(statement)
+                if not fts_exists:
+                    cursor.execute("INSERT INTO notifications_fts(notifications_fts) VALUES ('rebuild')")
+            except sqlite3.OperationalError as e:
+                # SQLite built without FTS5 or the trigram tokenizer (< 3.34)
+                logging.warning(f"Full-text index unavailable, search will use LIKE: {e}")
+            
+            # Hourly rollup for the analytics dashboard (same as migration 9),
+            # maintained with signed deltas; the BEFORE INSERT trigger takes
+            # out the row an INSERT OR REPLACE is about to overwrite
+            hourly_delta = """
+                INSERT INTO notifications_hourly (
+                    hour, app_identifier, priority_level,
+                    notification_count, score_sum, score_count, unread_count
+                )
+                SELECT strftime('%Y-%m-%d %H:00:00', {row}.delivered_time), {row}.app_identifier,
+                       {row}.priority_level, {sign}1, {sign}COALESCE({row}.priority_score, 0),
+                       {sign}({row}.priority_score IS NOT NULL), {sign}({row}.is_read IS 0)
+                {source}
+                ON CONFLICT (hour, app_identifier, priority_level) DO UPDATE SET
+                    notification_count = notification_count + excluded.notification_count,
+                    score_sum = score_sum + excluded.score_sum,
+                    score_count = score_count + excluded.score_count,
+                    unread_count = unread_count + excluded.unread_count;"""
+            add_new = hourly_delta.format(row="new", sign="", source="WHERE true")
+            sub_old = hourly_delta.format(row="old", sign="-", source="WHERE true")
+            sub_replaced = hourly_delta.format(
+                row="n", sign="-", source="FROM notifications n WHERE n.rec_id = new.rec_id"
+            )
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'notifications_hourly'")
+            hourly_exists = cursor.fetchone() is not None
+            for statement in [
+                """CREATE TABLE IF NOT EXISTS notifications_hourly (
+                    hour TEXT,
+                    app_identifier TEXT,
+                    priority_level TEXT,
+                    notification_count INTEGER NOT NULL DEFAULT 0,
+                    score_sum REAL NOT NULL DEFAULT 0,
+                    score_count INTEGER NOT NULL DEFAULT 0,
+                    unread_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (hour, app_identifier, priority_level)
+                )""",
+                f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_bi
+                BEFORE INSERT ON notifications BEGIN {sub_replaced} END""",
+                f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_ai
+                AFTER INSERT ON notifications BEGIN {add_new} END""",
+                f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_ad
+                AFTER DELETE ON notifications BEGIN {sub_old} END""",
+                f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_au
+                AFTER UPDATE OF delivered_time, app_identifier, priority_level, priority_score, is_read
+                ON notifications BEGIN {sub_old} {add_new} END""",
+            ]:
+                cursor.execute(statement)
+            if not hourly_exists:
+                cursor.execute("""
+                    INSERT INTO notifications_hourly (
+                        hour, app_identifier, priority_level,
+                        notification_count, score_sum, score_count, unread_count
+                    )
+                    SELECT strftime('%Y-%m-%d %H:00:00', delivered_time), app_identifier, priority_level,
+                           COUNT(*), COALESCE(SUM(priority_score), 0), COUNT(priority_score),
+                           COUNT(CASE WHEN is_read = 0 THEN 1 END)
+                    FROM notifications
+                    GROUP BY 1, 2, 3
+                """)
+            
             # Create metadata table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS daemon_metadata (
@@ -147,29 +254,45 @@ class DatabaseManager:
         if not notifications:
             return 0
         
+        insert_sql = '''
+            INSERT OR REPLACE INTO notifications 
+            (rec_id, app_identifier, delivered_time, title, subtitle, body, 
+             category, thread, priority_score, priority_level, priority_factors, 
+             is_read, is_archived, raw_data, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        '''
+        rows = []
+        for notif in notifications:
+            data = notif.to_dict()
+            rows.append((
+                data['rec_id'], data['app_identifier'], data['delivered_time'],
+                data['title'], data['subtitle'], data['body'],
+                data['category'], data['thread'],
+                data['priority_score'], data['priority_level'], data['priority_factors'],
+                data['is_read'], data['is_archived'], data['raw_data']
+            ))
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            saved_count = 0
             
-            for notif in notifications:
-                data = notif.to_dict()
-                try:
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO notifications 
-                        (rec_id, app_identifier, delivered_time, title, subtitle, body, 
-                         category, thread, priority_score, priority_level, priority_factors, 
-                         is_read, is_archived, raw_data, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ''', (
-                        data['rec_id'], data['app_identifier'], data['delivered_time'],
-                        data['title'], data['subtitle'], data['body'],
-                        data['category'], data['thread'],
-                        data['priority_score'], data['priority_level'], data['priority_factors'],
-                        data['is_read'], data['is_archived'], data['raw_data']
-                    ))
-                    saved_count += 1
-                except sqlite3.Error as e:
-                    logging.error(f"Error saving notification {notif.rec_id}: {e}")
+            # One transaction and one executemany for the whole batch; if
+            # any row fails, redo it row by row so only bad rows are skipped
+            cursor.execute('BEGIN')
+            cursor.execute('SAVEPOINT save_batch')
+            try:
+                cursor.executemany(insert_sql, rows)
+                cursor.execute('RELEASE save_batch')
+                saved_count = len(rows)
+            except sqlite3.Error:
+                cursor.execute('ROLLBACK TO save_batch')
+                cursor.execute('RELEASE save_batch')
+                saved_count = 0
+                for notif, row in zip(notifications, rows):
+                    try:
+                        cursor.execute(insert_sql, row)
+                        saved_count += 1
+                    except sqlite3.Error as e:
+                        logging.error(f"Error saving notification {notif.rec_id}: {e}")
             
             # Update last_rec_id
             if notifications:
@@ -200,9 +323,15 @@ class DatabaseManager:
             
             deleted = cursor.rowcount
             if deleted > 0:
+                # Drop rollup buckets whose notifications are all gone
+                cursor.execute("DELETE FROM notifications_hourly WHERE notification_count = 0")
                 conn.commit()
                 cursor.execute("VACUUM")
             
+            # Keep planner statistics current for the composite indexes;
+            # cheap when nothing changed much since the last run
+            cursor.execute("PRAGMA optimize")
+            
             return deleted
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -399,16 +528,61 @@ class PriorityScorer:
     
     def calculate_priority(self, notification: NotificationData) -> Tuple[float, str, List[str]]:
         """Calculate priority score, level, and factors"""
-        score = 0.0
-        factors = []
-        
         # Check content for urgent keywords
-        content = f"{notification.title} {notification.subtitle} {notification.body}".lower()
+        content = self._content(notification)
+        keyword_hits = [(keyword, weight) for keyword, weight in self.URGENT_KEYWORDS.items()
+                        if keyword in content]
         
+        return self._score(notification, keyword_hits, datetime.now())
+    
+    def calculate_priority_batch(
+        self, notifications: List[NotificationData]
+    ) -> List[Tuple[float, str, List[str]]]:
+        """Calculate priority score, level, and factors for many notifications
+        
+        Each keyword is searched for once in the newline-joined content of
+        all notifications, and every hit is attributed to its notification
+        by offset. Results are identical to calling calculate_priority on
+        each notification.
+        """
+        contents = [self._content(notif) for notif in notifications]
+        joined = "\n".join(contents)
+        
+        # Offset at which each notification's content starts in joined
+        starts = []
+        offset = 0
+        for content in contents:
+            starts.append(offset)
+            offset += len(content) + 1
+        
+        keyword_hits = [[] for _ in notifications]
         for keyword, weight in self.URGENT_KEYWORDS.items():
-            if keyword in content:
-                score += weight
-                factors.append(f"Contains '{keyword}' (+{weight})")
+            pos = joined.find(keyword)
+            while pos != -1:
+                row = bisect.bisect_right(starts, pos) - 1
+                keyword_hits[row].append((keyword, weight))
+                # One hit per notification is enough; resume at the next one
+                if row + 1 == len(starts):
+                    break
+                pos = joined.find(keyword, starts[row + 1])
+        
+        now = datetime.now()
+        return [self._score(notif, hits, now) for notif, hits in zip(notifications, keyword_hits)]
+    
+    @staticmethod
+    def _content(notification: NotificationData) -> str:
+        """Lowercased text the urgent keywords are matched against"""
+        return f"{notification.title} {notification.subtitle} {notification.body}".lower()
+    
+    def _score(self, notification: NotificationData, keyword_hits: List[Tuple[str, int]],
+               now: datetime) -> Tuple[float, str, List[str]]:
+        """Score a notification given the urgent keywords found in its content"""
+        score = 0.0
+        factors = []
+        
+        for keyword, weight in keyword_hits:
+            score += weight
+            factors.append(f"Contains '{keyword}' (+{weight})")
         
         # App priority
         app_weight = self.APP_PRIORITY.get(notification.app_identifier, 0)
@@ -419,7 +593,7 @@ class PriorityScorer:
         # Time-based factors
         try:
             delivered = datetime.fromisoformat(notification.delivered_time)
-            age_hours = (datetime.now() - delivered).total_seconds() / 3600
+            age_hours = (now - delivered).total_seconds() / 3600
             
             if age_hours < 1:
                 score += 3
@@ -430,15 +604,7 @@ class PriorityScorer:
         except:
             pass
         
-        # Determine level
-        if score >= 15:
-            level = "CRITICAL"
-        elif score >= 10:
-            level = "HIGH"
-        elif score >= 5:
-            level = "MEDIUM"
-        else:
-            level = "LOW"
+        level = PRIORITY_LEVELS[bisect.bisect_right(PRIORITY_THRESHOLDS, score)]
         
         return score, level, factors
 
@@ -482,6 +648,42 @@ class NotificationDaemon:
         if self.pid_file.exists():
             self.pid_file.unlink()
     
+    def run_once(self) -> int:
+        """Extract, score and save new notifications once
+        
+        Returns:
+            Number of notifications saved
+        """
+        # Get last processed ID
+        last_rec_id = self.db_manager.get_last_rec_id()
+        
+        # Extract new notifications
+        notifications = self.extractor.extract_notifications(last_rec_id)
+        
+        # Calculate priorities
+        priorities = self.scorer.calculate_priority_batch(notifications)
+        for notif, (score, level, factors) in zip(notifications, priorities):
+            notif.priority_score = score
+            notif.priority_level = level
+            notif.priority_factors = factors
+        
+        # Save to database
+        if not notifications:
+            return 0
+        
+        saved = self.db_manager.save_notifications(notifications)
+        self.logger.info(f"Saved {saved} new notifications")
+        
+        # Log high priority ones
+        high_priority = [n for n in notifications if n.priority_score >= 10]
+        for hp in high_priority:
+            self.logger.warning(
+                f"HIGH PRIORITY: {hp.app_identifier} - {hp.title} "
+                f"(Score: {hp.priority_score})"
+            )
+        
+        return saved
+    
     def run(self):
         """Main daemon loop"""
         self.logger.info("Starting Notification Daemon v2.0")
@@ -493,31 +695,7 @@ class NotificationDaemon:
         
         while self.running:
             try:
-                # Get last processed ID
-                last_rec_id = self.db_manager.get_last_rec_id()
-                
-                # Extract new notifications
-                notifications = self.extractor.extract_notifications(last_rec_id)
-                
-                # Calculate priorities
-                for notif in notifications:
-                    score, level, factors = self.scorer.calculate_priority(notif)
-                    notif.priority_score = score
-                    notif.priority_level = level
-                    notif.priority_factors = factors
-                
-                # Save to database
-                if notifications:
-                    saved = self.db_manager.save_notifications(notifications)
-                    self.logger.info(f"Saved {saved} new notifications")
-                    
-                    # Log high priority ones
-                    high_priority = [n for n in notifications if n.priority_score >= 10]
-                    for hp in high_priority:
-                        self.logger.warning(
-                            f"HIGH PRIORITY: {hp.app_identifier} - {hp.title} "
-                            f"(Score: {hp.priority_score})"
-                        )
+                self.run_once()
                 
                 update_count += 1
                 
@@ -6,6 +6,7 @@ Provides models, connection management, repositories, and migrations.
 
 from .models import Notification, DaemonMetadata
 from .connection import DatabaseConnection, get_db_connection
+from .pool import SQLiteConnectionPool
 from .repositories import NotificationRepository, DaemonMetadataRepository
 from .migrations import MigrationManager, run_migrations
 
@@ -14,6 +15,7 @@ __all__ = [
     'DaemonMetadata',
     'DatabaseConnection',
     'get_db_connection',
+    'SQLiteConnectionPool',
     'NotificationRepository', 
     'DaemonMetadataRepository',
     'MigrationManager',
@@ -20,14 +20,20 @@ class DatabaseConnection:
         """Initialize the database connection manager
         
         Args:
-            db_path: Path to the database file. If None, uses default from settings.
+            db_path: Path to the database file, or a "file:" URI (e.g. a
+                shared-cache in-memory database). If None, uses default from settings.
         """
         self.settings = Settings()
         self.db_path = db_path or str(self.settings.DEFAULT_DB_PATH)
+        self.is_uri = self.db_path.startswith("file:")
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
         """Ensure the database file and directory exist"""
+        if self.is_uri:
+            # SQLite resolves URIs itself; there may be no file at all
+            return
+        
         db_path = Path(self.db_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -48,7 +54,8 @@ class DatabaseConnection:
         try:
             conn = sqlite3.connect(
                 self.db_path,
-                timeout=self.settings.DB_TIMEOUT
+                timeout=self.settings.DB_TIMEOUT,
+                uri=self.is_uri
             )
             # Enable row factory for dict-like access
             conn.row_factory = sqlite3.Row
@@ -8,6 +8,10 @@ from typing import List, Callable
 from datetime import datetime
 
 from .connection import DatabaseConnection
+from .repositories import (
+    DELIVERED_EPOCH_SQL, NOTIFICATIONS_FTS_DDL,
+    NOTIFICATIONS_HOURLY_BACKFILL, NOTIFICATIONS_HOURLY_DDL
+)
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +81,36 @@ class MigrationManager:
                 name="add_indexes",
                 up=self._migration_4_add_indexes
             ),
+            Migration(
+                version=5,
+                name="add_delivered_epoch_index",
+                up=self._migration_5_add_delivered_epoch_index,
+                down=self._migration_5_down
+            ),
+            Migration(
+                version=6,
+                name="add_composite_indexes",
+                up=self._migration_6_add_composite_indexes,
+                down=self._migration_6_down
+            ),
+            Migration(
+                version=7,
+                name="add_fulltext_index",
+                up=self._migration_7_add_fulltext_index,
+                down=self._migration_7_down
+            ),
+            Migration(
+                version=8,
+                name="add_priority_time_index",
+                up=self._migration_8_add_priority_time_index,
+                down=self._migration_8_down
+            ),
+            Migration(
+                version=9,
+                name="add_hourly_rollup",
+                up=self._migration_9_add_hourly_rollup,
+                down=self._migration_9_down
+            ),
         ]
     
     def _migration_1_initial_schema(self, conn: sqlite3.Connection):
@@ -161,6 +195,89 @@ class MigrationManager:
             ON notifications(is_read, delivered_time DESC)
         """)
     
+    def _migration_5_add_delivered_epoch_index(self, conn: sqlite3.Connection):
+        """Index delivered_time as epoch seconds for integer range queries"""
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_notifications_delivered_epoch 
+            ON notifications({DELIVERED_EPOCH_SQL})
+        """)
+    
+    def _migration_5_down(self, conn: sqlite3.Connection):
+        """Drop the delivered_time epoch index"""
+        conn.execute("DROP INDEX IF EXISTS idx_notifications_delivered_epoch")
+    
+    def _migration_6_add_composite_indexes(self, conn: sqlite3.Connection):
+        """Add composite indexes for per-app and per-priority time range queries"""
+        # Per-app counts within a time range
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_app_time 
+            ON notifications(app_identifier, delivered_time DESC)
+        """)
+        
+        # Priority breakdowns within a time range
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_time_priority 
+            ON notifications(delivered_time DESC, priority_level)
+        """)
+        
+        # Unread notifications only; read ones are never looked up this way
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_unread_time 
+            ON notifications(is_read, delivered_time DESC) WHERE is_read = 0
+        """)
+    
+    def _migration_6_down(self, conn: sqlite3.Connection):
+        """Drop the composite indexes"""
+        for index in ("idx_notifications_app_time", "idx_notifications_time_priority",
+                      "idx_notifications_unread_time"):
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+    
+    def _migration_7_add_fulltext_index(self, conn: sqlite3.Connection):
+        """Add a trigram FTS5 index for keyword search and index existing rows"""
+        try:
+            for statement in NOTIFICATIONS_FTS_DDL:
+                conn.execute(statement)
+            conn.execute("INSERT INTO notifications_fts(notifications_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5 or the trigram tokenizer (< 3.34), as
+            # in the daemon; search falls back to LIKE, so the migration is
+            # still recorded and the later ones apply
+            logger.warning(f"Full-text index unavailable, search will use LIKE: {e}")
+            self._migration_7_down(conn)
+    
+    def _migration_7_down(self, conn: sqlite3.Connection):
+        """Drop the full-text index and its triggers"""
+        for trigger in ("notifications_fts_ai", "notifications_fts_ad", "notifications_fts_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS notifications_fts")
+    
+    def _migration_8_add_priority_time_index(self, conn: sqlite3.Connection):
+        """Index priority level then time, for newest-first reads of one priority"""
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_priority_time 
+            ON notifications(priority_level, delivered_time DESC)
+        """)
+        
+        # Refresh planner statistics so the new indexes are costed correctly
+        conn.execute("ANALYZE")
+    
+    def _migration_8_down(self, conn: sqlite3.Connection):
+        """Drop the priority/time index"""
+        conn.execute("DROP INDEX IF EXISTS idx_notifications_priority_time")
+    
+    def _migration_9_add_hourly_rollup(self, conn: sqlite3.Connection):
+        """Add the trigger-maintained hourly rollup used by the analytics dashboard"""
+        for statement in NOTIFICATIONS_HOURLY_DDL:
+            conn.execute(statement)
+        conn.execute(NOTIFICATIONS_HOURLY_BACKFILL)
+    
+    def _migration_9_down(self, conn: sqlite3.Connection):
+        """Drop the hourly rollup and its triggers"""
+        for trigger in ("notifications_hourly_bi", "notifications_hourly_ai",
+                        "notifications_hourly_ad", "notifications_hourly_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS notifications_hourly")
+    
     def get_current_version(self) -> int:
         """Get the current schema version
         
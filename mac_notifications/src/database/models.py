@@ -3,12 +3,37 @@ Database Models
 Defines the data structures for notifications and related entities
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 import json
 
 
+def _default(value: Any, default: Any) -> Any:
+    """Return default when a database value is NULL"""
+    return default if value is None else value
+
+
+def _add_slots(cls: type) -> type:
+    """Rebuild a dataclass with __slots__ for its fields
+    
+    Equivalent to dataclass(slots=True), which needs Python 3.10. Instances
+    carry no per-object __dict__, which matters when queries materialize
+    thousands of rows. Apply it above @dataclass.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict['__slots__'] = field_names
+    # Class-level defaults would shadow the slot descriptors; __init__
+    # keeps its own copy of them
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_add_slots
 @dataclass
 class Notification:
     """Notification model representing a macOS notification"""
@@ -58,6 +83,22 @@ class Notification:
         if self.updated_at and isinstance(self.updated_at, str):
             self.updated_at = datetime.fromisoformat(self.updated_at)
     
+    @property
+    def sort_key(self) -> Tuple[float, float]:
+        """Ordering key: highest priority first, then most recent first
+        
+        Plain numbers, so sorted() and heapq compare floats instead of
+        parsing timestamps. Computed on access because priority_score is
+        assigned after construction when notifications are rescored.
+        """
+        return (-self.priority_score, -self.delivered_time.timestamp())
+    
+    def __lt__(self, other: 'Notification') -> bool:
+        """Order notifications by sort_key (used by sorted() and heapq)"""
+        if not isinstance(other, Notification):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         data = asdict(self)
@@ -135,6 +176,74 @@ class Notification:
         
         return cls.from_dict(row)
     
+    @classmethod
+    def rows_to_mcp(cls, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Convert raw database rows directly to MCP format dicts
+        
+        Produces the same dicts as ``from_row(dict(row)).to_mcp_format()`` but
+        resolves the column names once and never builds Notification objects.
+        
+        Args:
+            rows: sqlite3.Row objects (or mappings) from the notifications table
+            
+        Returns:
+            List of MCP format dictionaries
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        
+        columns = tuple(rows[0].keys())
+        results = []
+        append = results.append
+        
+        for row in rows:
+            data = dict(zip(columns, row))
+            get = data.get
+            
+            delivered = get('delivered_time')
+            if isinstance(delivered, str):
+                delivered = datetime.fromisoformat(delivered).isoformat()
+            elif isinstance(delivered, datetime):
+                delivered = delivered.isoformat()
+            
+            factors = get('priority_factors')
+            if isinstance(factors, str):
+                try:
+                    factors = json.loads(factors)
+                except json.JSONDecodeError:
+                    factors = []
+            elif factors is None:
+                factors = []
+            
+            rec_id = get('rec_id')
+            body = _default(get('body'), "")
+            append({
+                "id": _default(get('id'), f"notif_{rec_id}"),
+                "rec_id": rec_id,
+                "app_identifier": get('app_identifier'),
+                "delivered_time": delivered,
+                "timestamp": delivered,
+                "title": _default(get('title'), ""),
+                "subtitle": _default(get('subtitle'), ""),
+                "body": body,
+                "informative_text": body,  # MCP compatibility
+                "category": _default(get('category'), ""),
+                "thread": _default(get('thread'), ""),
+                "activated": False,  # MCP compatibility
+                "delivery_date": delivered,
+                "sound_name": "default",  # MCP compatibility
+                "has_action_button": False,  # MCP compatibility
+                "action_button_title": "",  # MCP compatibility
+                "priority_score": _default(get('priority_score'), 0.0),
+                "priority_level": _default(get('priority_level'), "UNKNOWN"),
+                "priority_factors": factors,
+                "is_read": _default(get('is_read'), False),
+                "is_archived": _default(get('is_archived'), False)
+            })
+        
+        return results
+    
     def matches_search(self, query: str) -> bool:
         """Check if notification matches search query"""
         query_lower = query.lower()
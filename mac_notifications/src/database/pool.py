@@ -0,0 +1,169 @@
+"""
+SQLite connection pooling for the notification system
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional
+
+from ..config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteConnectionPool:
+    """Thread-safe pool of reusable SQLite connections
+
+    Connections are opened lazily (up to ``max_size``), configured once with
+    WAL journaling and the other pragmas below, and handed back to the pool
+    instead of being closed. This removes the open/pragma cost from every
+    MCP tool call.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -20000",
+        "PRAGMA foreign_keys = ON",
+    )
+
+    def __init__(self, db_path: str, min_size: int = 2, max_size: int = 10,
+                 timeout: Optional[float] = None):
+        """Initialize the pool
+
+        Args:
+            db_path: Path to the SQLite database file
+            min_size: Connections opened up front when the database already exists
+            max_size: Upper bound on simultaneously open connections
+            timeout: Seconds to wait for a free connection (and SQLite busy timeout)
+        """
+        self.db_path = db_path
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = Settings.DB_TIMEOUT if timeout is None else timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._waits = 0
+        self._closed = False
+
+        # Don't create the database file just by warming the pool
+        if Path(db_path).exists():
+            for _ in range(min_size):
+                self._size += 1
+                self._idle.put(self._open())
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection for an already-reserved slot"""
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                try:
+                    conn.execute(pragma)
+                except sqlite3.DatabaseError as e:
+                    logger.debug(f"Could not apply '{pragma}': {e}")
+            return conn
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection from the pool, opening one if none are idle
+
+        Raises:
+            queue.Empty: If no connection frees up within the pool timeout
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._size < self.max_size
+            if can_open:
+                self._size += 1
+            else:
+                self._waits += 1
+
+        if can_open:
+            return self._open()
+        return self._idle.get(timeout=self.timeout)
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Closed or broken connections are not reused
+            self._discard(conn)
+            return
+
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection and drop it from the pool's accounting"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        finally:
+            with self._lock:
+                self._size -= 1
+
+    @contextmanager
+    def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager yielding a pooled connection with row factory set"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close all idle connections; busy ones are closed when released"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool health metrics
+
+        Returns:
+            Dict with open, idle and active connection counts and the number
+            of acquisitions that had to wait for a free connection
+        """
+        with self._lock:
+            size = self._size
+            waits = self._waits
+        idle = self._idle.qsize()
+        return {
+            "size": size,
+            "idle": idle,
+            "active": size - idle,
+            "max_size": self.max_size,
+            "waits": waits
+        }
@@ -2,15 +2,140 @@
 Repository pattern for database operations
 """
 
+import calendar
 import json
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Generator, List, Optional, Dict, Any, Tuple
 
 from .connection import DatabaseConnection
 from .models import Notification, DaemonMetadata
 
 
+# delivered_time as integer seconds; matches the expression index created by
+# the daemon and migration 5, so range filters on it are index seeks
+DELIVERED_EPOCH_SQL = "CAST(strftime('%s', delivered_time) AS INTEGER)"
+
+
+# Trigram full-text index over the notification text, kept in sync with
+# the notifications table by triggers; created by migration 7. REPLACE
+# conflicts skip the delete trigger, but AUTOINCREMENT ids are never
+# reused, so any entry left behind can never match a live row.
+NOTIFICATIONS_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS notifications_fts USING fts5(
+        title, subtitle, body,
+        content='notifications', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS notifications_fts_ai AFTER INSERT ON notifications BEGIN
+        INSERT INTO notifications_fts(rowid, title, subtitle, body)
+        VALUES (new.id, new.title, new.subtitle, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notifications_fts_ad AFTER DELETE ON notifications BEGIN
+        INSERT INTO notifications_fts(notifications_fts, rowid, title, subtitle, body)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notifications_fts_au
+    AFTER UPDATE OF title, subtitle, body ON notifications BEGIN
+        INSERT INTO notifications_fts(notifications_fts, rowid, title, subtitle, body)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+        INSERT INTO notifications_fts(rowid, title, subtitle, body)
+        VALUES (new.id, new.title, new.subtitle, new.body);
+    END""",
+)
+
+
+# Hourly rollup of the notifications table for the analytics dashboard,
+# kept in sync by triggers; created by migration 9. Counts are applied as
+# signed deltas, so keys with NULL parts (which never conflict) still sum
+# correctly. INSERT OR REPLACE skips the delete trigger, so the row being
+# replaced is subtracted before the insert instead.
+_HOURLY_DELTA_SQL = """
+        INSERT INTO notifications_hourly (
+            hour, app_identifier, priority_level,
+            notification_count, score_sum, score_count, unread_count
+        )
+        SELECT strftime('%Y-%m-%d %H:00:00', {row}.delivered_time), {row}.app_identifier,
+               {row}.priority_level, {sign}1, {sign}COALESCE({row}.priority_score, 0),
+               {sign}({row}.priority_score IS NOT NULL), {sign}({row}.is_read IS 0)
+        {source}
+        ON CONFLICT (hour, app_identifier, priority_level) DO UPDATE SET
+            notification_count = notification_count + excluded.notification_count,
+            score_sum = score_sum + excluded.score_sum,
+            score_count = score_count + excluded.score_count,
+            unread_count = unread_count + excluded.unread_count;"""
+
+_HOURLY_ADD_NEW = _HOURLY_DELTA_SQL.format(row="new", sign="", source="WHERE true")
+_HOURLY_SUB_OLD = _HOURLY_DELTA_SQL.format(row="old", sign="-", source="WHERE true")
+_HOURLY_SUB_REPLACED = _HOURLY_DELTA_SQL.format(
+    row="n", sign="-", source="FROM notifications n WHERE n.rec_id = new.rec_id"
+)
+
+NOTIFICATIONS_HOURLY_DDL = (
+    """CREATE TABLE IF NOT EXISTS notifications_hourly (
+        hour TEXT,
+        app_identifier TEXT,
+        priority_level TEXT,
+        notification_count INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_count INTEGER NOT NULL DEFAULT 0,
+        unread_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (hour, app_identifier, priority_level)
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_bi BEFORE INSERT ON notifications BEGIN
+        {_HOURLY_SUB_REPLACED}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_ai AFTER INSERT ON notifications BEGIN
+        {_HOURLY_ADD_NEW}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_ad AFTER DELETE ON notifications BEGIN
+        {_HOURLY_SUB_OLD}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_hourly_au
+    AFTER UPDATE OF delivered_time, app_identifier, priority_level, priority_score, is_read
+    ON notifications BEGIN
+        {_HOURLY_SUB_OLD}
+        {_HOURLY_ADD_NEW}
+    END""",
+)
+
+# Fills notifications_hourly from existing rows when it is first created
+NOTIFICATIONS_HOURLY_BACKFILL = """
+    INSERT INTO notifications_hourly (
+        hour, app_identifier, priority_level,
+        notification_count, score_sum, score_count, unread_count
+    )
+    SELECT strftime('%Y-%m-%d %H:00:00', delivered_time), app_identifier, priority_level,
+           COUNT(*), COALESCE(SUM(priority_score), 0), COUNT(priority_score),
+           COUNT(CASE WHEN is_read = 0 THEN 1 END)
+    FROM notifications
+    GROUP BY 1, 2, 3
+"""
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a naive local datetime to the integer DELIVERED_EPOCH_SQL compares against
+    
+    SQLite's strftime('%s') reads the stored local time as if it were UTC,
+    so the bound value must be computed the same way.
+    """
+    return calendar.timegm(value.timetuple())
+
+
+@contextmanager
+def _cursor(db: DatabaseConnection, conn: Optional[sqlite3.Connection] = None) -> Generator[sqlite3.Cursor, None, None]:
+    """Yield a cursor on the caller's connection, or on a fresh one from db
+    
+    Passing ``conn`` lets a caller run several repository reads inside one
+    transaction; transaction control then stays with the caller.
+    """
+    if conn is None:
+        with db.get_cursor() as cursor:
+            yield cursor
+    else:
+        yield conn.cursor()
+
+
 class NotificationRepository:
     """Handle all notification-related database operations"""
     
@@ -22,12 +147,14 @@ class NotificationRepository:
         """
         self.db = db_connection
     
-    def get_recent(self, limit: int = 10, offset: int = 0) -> List[Notification]:
+    def get_recent(self, limit: int = 10, offset: int = 0,
+                   conn: Optional[sqlite3.Connection] = None) -> List[Notification]:
         """Get recent notifications
         
         Args:
             limit: Maximum number of notifications to return
             offset: Number of notifications to skip
+            conn: Optional connection to reuse (e.g. inside a transaction)
             
         Returns:
             List of Notification objects
@@ -38,9 +165,9 @@ class NotificationRepository:
             LIMIT ? OFFSET ?
         """
         
-        with self.db.get_cursor() as cursor:
+        with _cursor(self.db, conn) as cursor:
             cursor.execute(query, (limit, offset))
-            return [Notification.from_db_row(dict(row)) for row in cursor.fetchall()]
+            return [Notification.from_row(dict(row)) for row in cursor.fetchall()]
     
     def get_by_id(self, rec_id: int) -> Optional[Notification]:
         """Get a notification by its record ID
@@ -56,14 +183,16 @@ class NotificationRepository:
         with self.db.get_cursor() as cursor:
             cursor.execute(query, (rec_id,))
             row = cursor.fetchone()
-            return Notification.from_db_row(dict(row)) if row else None
+            return Notification.from_row(dict(row)) if row else None
     
-    def get_by_priority(self, priority_level: str, limit: int = 50) -> List[Notification]:
+    def get_by_priority(self, priority_level: str, limit: int = 50,
+                        conn: Optional[sqlite3.Connection] = None) -> List[Notification]:
         """Get notifications by priority level
         
         Args:
             priority_level: Priority level (CRITICAL, HIGH, MEDIUM, LOW)
             limit: Maximum number of notifications
+            conn: Optional connection to reuse (e.g. inside a transaction)
             
         Returns:
             List of Notification objects
@@ -75,15 +204,17 @@ class NotificationRepository:
             LIMIT ?
         """
         
-        with self.db.get_cursor() as cursor:
+        with _cursor(self.db, conn) as cursor:
             cursor.execute(query, (priority_level, limit))
-            return [Notification.from_db_row(dict(row)) for row in cursor.fetchall()]
+            return [Notification.from_row(dict(row)) for row in cursor.fetchall()]
     
-    def get_important(self, limit: int = 20) -> List[Notification]:
+    def get_important(self, limit: int = 20,
+                      conn: Optional[sqlite3.Connection] = None) -> List[Notification]:
         """Get important notifications (CRITICAL and HIGH priority)
         
         Args:
             limit: Maximum number of notifications
+            conn: Optional connection to reuse (e.g. inside a transaction)
             
         Returns:
             List of Notification objects
@@ -95,20 +226,49 @@ class NotificationRepository:
             LIMIT ?
         """
         
-        with self.db.get_cursor() as cursor:
+        with _cursor(self.db, conn) as cursor:
             cursor.execute(query, (limit,))
-            return [Notification.from_db_row(dict(row)) for row in cursor.fetchall()]
+            return [Notification.from_row(dict(row)) for row in cursor.fetchall()]
+    
+    def get_top_by_priorities(self, levels: List[str], limit: int = 10,
+                              conn: Optional[sqlite3.Connection] = None) -> List[Notification]:
+        """Get the highest-scored notifications across several priority levels
+        
+        Args:
+            levels: Priority levels to include (e.g. ['CRITICAL', 'HIGH'])
+            limit: Maximum number of notifications
+            conn: Optional connection to reuse (e.g. inside a transaction)
+            
+        Returns:
+            List of Notification objects, best score first
+        """
+        if not levels:
+            return []
+        
+        placeholders = ','.join(['?' for _ in levels])
+        query = f"""
+            SELECT * FROM notifications 
+            WHERE priority_level IN ({placeholders})
+            ORDER BY priority_score DESC, delivered_time DESC
+            LIMIT ?
+        """
+        
+        with _cursor(self.db, conn) as cursor:
+            cursor.execute(query, (*levels, limit))
+            return [Notification.from_row(dict(row)) for row in cursor.fetchall()]
     
-    def search(self, keyword: str, app: Optional[str] = None, limit: int = 50) -> List[Notification]:
+    def search(self, keyword: str, app: Optional[str] = None, limit: int = 50,
+               raw: bool = False) -> List[Notification]:
         """Search notifications by keyword and/or app
         
         Args:
             keyword: Keyword to search for
             app: Optional app identifier filter
             limit: Maximum number of results
+            raw: Return sqlite3.Row objects instead of Notification objects
             
         Returns:
-            List of Notification objects
+            List of Notification objects (or rows if raw)
         """
         query = """
             SELECT * FROM notifications 
@@ -137,16 +297,20 @@ class NotificationRepository:
         
         with self.db.get_cursor() as cursor:
             cursor.execute(query, params)
-            return [Notification.from_db_row(dict(row)) for row in cursor.fetchall()]
+            rows = cursor.fetchall()
+            if raw:
+                return rows
+            return [Notification.from_row(dict(row)) for row in rows]
     
-    def get_since(self, since_time: str) -> List[Notification]:
+    def get_since(self, since_time: str, raw: bool = False) -> List[Notification]:
         """Get notifications since a specific time
         
         Args:
             since_time: Time string in format 'YYYY-MM-DD HH:MM:SS'
+            raw: Return sqlite3.Row objects instead of Notification objects
             
         Returns:
-            List of Notification objects
+            List of Notification objects (or rows if raw)
         """
         query = """
             SELECT * FROM notifications 
@@ -156,7 +320,38 @@ class NotificationRepository:
         
         with self.db.get_cursor() as cursor:
             cursor.execute(query, (since_time,))
-            return [Notification.from_db_row(dict(row)) for row in cursor.fetchall()]
+            rows = cursor.fetchall()
+            if raw:
+                return rows
+            return [Notification.from_row(dict(row)) for row in rows]
+    
+    def get_since_epoch(self, since_epoch: int, raw: bool = False,
+                        conn: Optional[sqlite3.Connection] = None) -> List[Notification]:
+        """Get notifications delivered at or after an epoch timestamp
+        
+        delivered_time is stored as naive local time, so ``since_epoch`` must
+        be computed the same way, i.e. with ``to_epoch``.
+        
+        Args:
+            since_epoch: Cutoff in seconds, with delivered_time read as UTC
+            raw: Return sqlite3.Row objects instead of Notification objects
+            conn: Optional connection to reuse (e.g. inside a transaction)
+            
+        Returns:
+            List of Notification objects (or rows if raw)
+        """
+        query = f"""
+            SELECT * FROM notifications 
+            WHERE {DELIVERED_EPOCH_SQL} >= ?
+            ORDER BY delivered_time DESC
+        """
+        
+        with _cursor(self.db, conn) as cursor:
+            cursor.execute(query, (since_epoch,))
+            rows = cursor.fetchall()
+            if raw:
+                return rows
+            return [Notification.from_row(dict(row)) for row in rows]
     
     def get_by_time_range(self, start_time: datetime, end_time: datetime) -> List[Notification]:
         """Get notifications within a time range
@@ -168,18 +363,15 @@ class NotificationRepository:
         Returns:
             List of Notification objects
         """
-        query = """
+        query = f"""
             SELECT * FROM notifications 
-            WHERE datetime(delivered_time) BETWEEN datetime(?) AND datetime(?)
+            WHERE {DELIVERED_EPOCH_SQL} BETWEEN ? AND ?
             ORDER BY delivered_time DESC
         """
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (
-                start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                end_time.strftime('%Y-%m-%d %H:%M:%S')
-            ))
-            return [Notification.from_db_row(dict(row)) for row in cursor.fetchall()]
+            cursor.execute(query, (to_epoch(start_time), to_epoch(end_time)))
+            return [Notification.from_row(dict(row)) for row in cursor.fetchall()]
     
     def update_priority(self, rec_id: int, priority_score: float, 
                        priority_level: str, priority_factors: List[str]) -> bool:
@@ -288,15 +480,18 @@ class NotificationRepository:
             cursor.execute(query, rec_ids)
             return cursor.rowcount
     
-    def get_statistics(self) -> Dict[str, Any]:
+    def get_statistics(self, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
         """Get notification statistics
         
+        Args:
+            conn: Optional connection to reuse (e.g. inside a transaction)
+            
         Returns:
             Dictionary with various statistics
         """
         stats = {}
         
-        with self.db.get_cursor() as cursor:
+        with _cursor(self.db, conn) as cursor:
             # Total count
             cursor.execute("SELECT COUNT(*) FROM notifications")
             stats['total'] = cursor.fetchone()[0]
@@ -345,11 +540,11 @@ class NotificationRepository:
         Returns:
             int: Number of notifications deleted
         """
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
-        query = "DELETE FROM notifications WHERE datetime(delivered_time) < datetime(?)"
+        cutoff = to_epoch(datetime.now() - timedelta(days=days))
+        query = f"DELETE FROM notifications WHERE {DELIVERED_EPOCH_SQL} < ?"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (cutoff_date,))
+            cursor.execute(query, (cutoff,))
             return cursor.rowcount
 
 
@@ -395,15 +590,18 @@ class DaemonMetadataRepository:
         with self.db.get_cursor() as cursor:
             cursor.execute(query, (key, value))
     
-    def get_all(self) -> Dict[str, str]:
+    def get_all(self, conn: Optional[sqlite3.Connection] = None) -> Dict[str, str]:
         """Get all metadata as a dictionary
         
+        Args:
+            conn: Optional connection to reuse (e.g. inside a transaction)
+            
         Returns:
             Dict mapping keys to values
         """
         query = "SELECT key, value FROM daemon_metadata"
         
-        with self.db.get_cursor() as cursor:
+        with _cursor(self.db, conn) as cursor:
             cursor.execute(query)
             return dict(cursor.fetchall())
     
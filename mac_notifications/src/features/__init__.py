@@ -5,7 +5,7 @@ This module contains all the advanced features for the notification system.
 """
 
 from .priority_scoring import PriorityScorer, calculate_priority_score
-from .templates import NotificationTemplateEngine, format_notification
+from .templates import NotificationTemplates, format_notification
 from .enhanced_search import EnhancedSearch, search_notifications, parse_search_query
 from .grouping import NotificationGrouper, group_notifications, generate_grouping_report
 from .batch_actions import BatchActions
@@ -17,6 +17,7 @@ from .smart_summaries import (
 )
 from .analytics import (
     NotificationAnalytics,
+    AnalyticsPrecomputer,
     generate_analytics_dashboard,
     get_notification_metrics,
     get_productivity_report
@@ -28,7 +29,7 @@ __all__ = [
     'calculate_priority_score',
     
     # Templates
-    'NotificationTemplateEngine',
+    'NotificationTemplates',
     'format_notification',
     
     # Enhanced Search
@@ -52,6 +53,7 @@ __all__ = [
     
     # Analytics
     'NotificationAnalytics',
+    'AnalyticsPrecomputer',
     'generate_analytics_dashboard',
     'get_notification_metrics',
     'get_productivity_report',
@@ -8,19 +8,127 @@ metrics, and actionable recommendations.
 
 import sqlite3
 import json
+import logging
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 from collections import defaultdict, Counter
 import statistics
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class NotificationAnalytics:
     """Generate analytics and insights from notification data."""
     
+    # Per-window analytics that can be materialized ahead of time, and the
+    # get_dashboard_bundle section each one's result is found in
+    BUNDLE_SECTIONS = {
+        "get_key_metrics": "metrics",
+        "get_hourly_pattern": "hourly_pattern",
+        "get_app_analytics": "app_analytics",
+        "get_productivity_metrics": "productivity",
+    }
+    PRECOMPUTED_METHODS = tuple(BUNDLE_SECTIONS)
+    
     def __init__(self, db_path: str = "notifications.db"):
         self.db_path = db_path
         
+    def precompute(self, days_options: Iterable[int] = (7, 30),
+                   now: Optional[datetime] = None) -> int:
+        """
+        Materialize PRECOMPUTED_METHODS results into the analytics_cache table.
+        
+        Args:
+            days_options: Window lengths (in days) to compute
+            now: End of every window; defaults to the current time
+            
+        Returns:
+            Number of payloads written
+        """
+        now = now or datetime.now()
+        computed_at = now.strftime('%Y-%m-%d %H:%M:%S')
+        
+        rows = []
+        for days in days_options:
+            bundle = self.get_dashboard_bundle(now - timedelta(days=days), now)
+            for method, section in self.BUNDLE_SECTIONS.items():
+                rows.append((method, days, computed_at, json.dumps(bundle[section], default=str)))
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS analytics_cache (
+                        method TEXT NOT NULL,
+                        days INTEGER NOT NULL,
+                        computed_at TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        PRIMARY KEY (method, days)
+                    )
+                """)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analytics_cache VALUES (?, ?, ?, ?)", rows
+                )
+        finally:
+            conn.close()
+            
+        return len(rows)
+        
+    def get_precomputed(self, method: str, days: int, max_new_notifications: int = 100,
+                        max_age: Optional[timedelta] = None,
+                        now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a precomputed result.
+        
+        A stored result covers a window that ended when it was computed, so
+        its age is how far that window lags behind the one requested.
+        
+        Args:
+            method: One of PRECOMPUTED_METHODS
+            days: Window length the result was computed for
+            max_new_notifications: Treat the result as stale once more
+                notifications than this have arrived since it was computed
+            max_age: Treat the result as stale once it is older than this;
+                defaults to a tenth of the window
+            now: Time the result is requested for; defaults to the current time
+            
+        Returns:
+            The stored result, or None if missing or stale
+        """
+        if max_age is None:
+            max_age = timedelta(days=days) * 0.1
+        now = now or datetime.now()
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            try:
+                row = conn.execute(
+                    "SELECT computed_at, payload FROM analytics_cache WHERE method = ? AND days = ?",
+                    (method, days)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # Nothing has been precomputed yet
+                return None
+            if row is None:
+                return None
+                
+            computed_at, payload = row
+            if datetime.strptime(computed_at, '%Y-%m-%d %H:%M:%S') < now - max_age:
+                return None
+                
+            new_count = conn.execute(
+                "SELECT COUNT(*) FROM notifications WHERE delivered_time > ?", (computed_at,)
+            ).fetchone()[0]
+            if new_count > max_new_notifications:
+                return None
+                
+            return json.loads(payload)
+            
+        finally:
+            conn.close()
+        
     def get_analytics_dashboard(
         self, 
         days: int = 7,
@@ -41,12 +149,13 @@ class NotificationAnalytics:
         start_date = end_date - timedelta(days=days)
         
         # Collect all analytics
-        metrics = self.get_key_metrics(start_date, end_date)
-        hourly_pattern = self.get_hourly_pattern(start_date, end_date)
+        bundle = self.get_dashboard_bundle(start_date, end_date)
+        metrics = bundle["metrics"]
+        hourly_pattern = bundle["hourly_pattern"]
         daily_trend = self.get_daily_trend(start_date, end_date)
-        app_analytics = self.get_app_analytics(start_date, end_date)
+        app_analytics = bundle["app_analytics"]
         priority_analysis = self.get_priority_analysis(start_date, end_date)
-        productivity = self.get_productivity_metrics(start_date, end_date)
+        productivity = bundle["productivity"]
         patterns = self.detect_patterns(start_date, end_date, metrics, hourly_pattern, app_analytics, productivity)
         recommendations = self.generate_recommendations(
             metrics, hourly_pattern, app_analytics, productivity, patterns
@@ -77,6 +186,230 @@ class NotificationAnalytics:
             
         return dashboard_data
         
+    def get_dashboard_bundle(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Compute key metrics, hourly pattern, app analytics and productivity in one scan.
+        
+        A single GROUP BY over (day of week, hour, app, priority) feeds all
+        four reports; only the focus-gap query needs its own pass over the
+        window. The results match the individual get_* methods. Whole hours
+        are read from the notifications_hourly rollup when it exists, so
+        only the partial hours at either end of the window touch raw rows.
+        
+        Args:
+            start_date: Start of the window
+            end_date: End of the window
+            
+        Returns:
+            Dict with "metrics", "hourly_pattern", "app_analytics" and
+            "productivity" sections
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        try:
+            start_str = start_date.strftime('%Y-%m-%d %H:%M:%S')
+            end_str = end_date.strftime('%Y-%m-%d %H:%M:%S')
+            
+            cursor.execute("PRAGMA table_info(notifications)")
+            columns = {col[1] for col in cursor.fetchall()}
+            has_level = 'priority_level' in columns
+            has_score = has_level and 'priority_score' in columns
+            has_read = 'is_read' in columns
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'notifications_hourly'")
+            has_rollup = cursor.fetchone() is not None
+            
+            # Whole hours inside the window, served from the rollup
+            first_hour = start_date.replace(minute=0, second=0, microsecond=0)
+            if first_hour < start_date.replace(microsecond=0):
+                first_hour += timedelta(hours=1)
+            last_hour = end_date.replace(minute=0, second=0, microsecond=0)
+            use_rollup = has_rollup and first_hour < last_hour
+            
+            if use_rollup:
+                first_str = first_hour.strftime('%Y-%m-%d %H:%M:%S')
+                last_str = last_hour.strftime('%Y-%m-%d %H:%M:%S')
+                raw_where = ("(delivered_time >= ? AND delivered_time < ?) OR "
+                             "(delivered_time >= ? AND delivered_time <= ?)")
+                raw_params = (start_str, first_str, last_str, end_str)
+            else:
+                raw_where = "delivered_time >= ? AND delivered_time <= ?"
+                raw_params = (start_str, end_str)
+            
+            cursor.execute(f"""
+                SELECT 
+                    CAST(strftime('%w', delivered_time) AS INTEGER) as dow,
+                    CAST(strftime('%H', delivered_time) AS INTEGER) as hour,
+                    app_identifier,
+                    {'priority_level' if has_level else 'NULL'} as level,
+                    COUNT(*) as count,
+                    {'SUM(priority_score), COUNT(priority_score)' if has_score else '0, 0'},
+                    {'COUNT(CASE WHEN is_read = 0 THEN 1 END)' if has_read else '0'} as unread
+                FROM notifications
+                WHERE {raw_where}
+                GROUP BY dow, hour, app_identifier, level
+            """, raw_params)
+            groups = cursor.fetchall()
+            
+            if use_rollup:
+                # Groups from both queries are summed below, so the same key
+                # appearing in each is fine
+                cursor.execute("""
+                    SELECT 
+                        CAST(strftime('%w', hour) AS INTEGER) as dow,
+                        CAST(strftime('%H', hour) AS INTEGER) as hr,
+                        app_identifier,
+                        priority_level,
+                        SUM(notification_count),
+                        SUM(score_sum),
+                        SUM(score_count),
+                        SUM(unread_count)
+                    FROM notifications_hourly
+                    WHERE hour >= ? AND hour < ?
+                    GROUP BY dow, hr, app_identifier, priority_level
+                    HAVING SUM(notification_count) > 0
+                """, (first_str, last_str))
+                groups.extend(cursor.fetchall())
+            
+            # Same focus-gap query as get_productivity_metrics
+            cursor.execute("""
+                SELECT gap_minutes FROM (
+                    SELECT (julianday(delivered_time) -
+                            julianday(LAG(delivered_time) OVER (ORDER BY delivered_time))) * 1440
+                           AS gap_minutes
+                    FROM notifications
+                    WHERE delivered_time >= ? AND delivered_time <= ?
+                )
+                WHERE gap_minutes > 30
+            """, (start_str, end_str))
+            focus_windows = [row[0] for row in cursor.fetchall()]
+            
+        finally:
+            conn.close()
+            
+        # Roll the groups up per hour and per app
+        total = critical = high = unread = 0
+        heatmap = defaultdict(lambda: defaultdict(int))
+        hour_counts = defaultdict(int)
+        hour_critical = defaultdict(int)
+        app_stats = {}
+        app_hours = defaultdict(lambda: defaultdict(int))
+        
+        for dow, hour, app_id, level, count, score_sum, score_count, unread_count in groups:
+            total += count
+            unread += unread_count
+            heatmap[hour][dow] += count
+            hour_counts[hour] += count
+            app_hours[app_id][hour] += count
+            
+            stats = app_stats.get(app_id)
+            if stats is None:
+                stats = app_stats[app_id] = [0, 0.0, 0, 0, 0]
+            stats[0] += count
+            stats[1] += score_sum or 0
+            stats[2] += score_count
+            stats[4] += unread_count
+            
+            if level == 'CRITICAL':
+                critical += count
+                hour_critical[hour] += count
+                stats[3] += count
+            elif level == 'HIGH':
+                high += count
+                
+        hours = sorted(hour_counts)
+        
+        # Key metrics
+        window_hours = (end_date - start_date).total_seconds() / 3600
+        # Ties go to the earliest hour (and app name), as in the SQL of the get_* methods
+        peak = min(hours, key=lambda hour: (-hour_counts[hour], hour), default=None)
+        metrics = {
+            "total_notifications": total,
+            "avg_per_hour": round(total / window_hours if window_hours > 0 else 0, 1),
+            "peak_hour": f"{peak:02d}:00" if peak is not None else "N/A",
+            "peak_hour_count": hour_counts[peak] if peak is not None else 0,
+            "critical_rate": round((critical + high) / total * 100 if total > 0 else 0, 1),
+            "unread_count": unread,
+            "unread_rate": round(unread / total * 100, 1) if total > 0 else 0,
+            "app_count": len(app_stats),
+            "days_analyzed": (end_date - start_date).days + 1
+        }
+        
+        # Hourly pattern
+        hourly_data = [{
+            "hour": hour,
+            "count": hour_counts[hour],
+            "critical_rate": round(hour_critical[hour] / hour_counts[hour] * 100, 1)
+        } for hour in hours]
+        avg_hourly = total / 24 if hourly_data else 0
+        hourly_pattern = {
+            "heatmap": dict(heatmap),
+            "hourly_breakdown": hourly_data,
+            "quiet_hours": [h["hour"] for h in hourly_data if h["count"] < avg_hourly * 0.25],
+            "busy_hours": [h["hour"] for h in hourly_data if h["count"] > avg_hourly * 1.5],
+            "avg_per_hour": round(avg_hourly, 1)
+        }
+        
+        # App analytics
+        apps = []
+        for app_id, (count, score_sum, score_count, critical_count, unread_count) in app_stats.items():
+            avg_priority = score_sum / score_count if score_count else 0
+            apps.append({
+                "app": app_id,
+                "count": count,
+                "avg_priority": round(avg_priority, 2) if avg_priority else 0,
+                "critical_count": critical_count,
+                "unread_count": unread_count,
+                "readable_name": self._humanize_app_name(app_id),
+                "percentage": round(count / total * 100, 1) if total > 0 else 0
+            })
+        apps.sort(key=lambda app: (-app["count"], app["app"]))
+        
+        app_patterns = {}
+        for app in apps[:5]:
+            counts = app_hours[app["app"]]
+            top_hours = sorted(counts, key=lambda hour: (-counts[hour], hour))[:3]
+            app_patterns[app["app"]] = [f"{hour:02d}:00" for hour in top_hours]
+            
+        app_analytics = {
+            "app_distribution": apps,
+            "top_interrupters": apps[:5],
+            "app_time_patterns": app_patterns,
+            "total_apps": len(apps)
+        }
+        
+        # Productivity
+        if focus_windows:
+            avg_focus = statistics.mean(focus_windows)
+            max_focus = max(focus_windows)
+            total_focus = sum(focus_windows)
+        else:
+            avg_focus = max_focus = total_focus = 0
+            
+        productive_hours = total_focus / 60
+        interruption_rate = total / productive_hours if productive_hours > 0 else 0
+        focus_score = self._calculate_focus_score(
+            avg_focus, max_focus, interruption_rate, len(focus_windows)
+        )
+        productivity = {
+            "avg_focus_time": round(avg_focus, 1),
+            "max_focus_time": round(max_focus, 1),
+            "total_focus_hours": round(total_focus / 60, 1),
+            "interruption_rate": round(interruption_rate, 1),
+            "focus_windows_count": len(focus_windows),
+            "best_focus_hours": [f"{hour:02d}:00" for hour in sorted(hours, key=lambda hour: (hour_counts[hour], hour))[:3]],
+            "focus_score": focus_score,
+            "focus_assessment": self._assess_focus_score(focus_score)
+        }
+        
+        return {
+            "metrics": metrics,
+            "hourly_pattern": hourly_pattern,
+            "app_analytics": app_analytics,
+            "productivity": productivity
+        }
+        
     def get_key_metrics(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Calculate key metrics for the period."""
         conn = sqlite3.connect(self.db_path)
@@ -106,7 +439,7 @@ class NotificationAnalytics:
                 FROM notifications
                 WHERE delivered_time >= ? AND delivered_time <= ?
                 GROUP BY hour
-                ORDER BY count DESC
+                ORDER BY count DESC, hour
                 LIMIT 1
             """, (start_str, end_str))
             
@@ -339,7 +672,7 @@ class NotificationAnalytics:
                     FROM notifications
                     WHERE delivered_time >= ? AND delivered_time <= ?
                     GROUP BY app_identifier
-                    ORDER BY count DESC
+                    ORDER BY count DESC, app_identifier
                 """, (start_str, end_str))
             else:
                 cursor.execute("""
@@ -352,7 +685,7 @@ class NotificationAnalytics:
                     FROM notifications
                     WHERE delivered_time >= ? AND delivered_time <= ?
                     GROUP BY app_identifier
-                    ORDER BY count DESC
+                    ORDER BY count DESC, app_identifier
                 """, (start_str, end_str))
             
             apps = []
@@ -386,7 +719,7 @@ class NotificationAnalytics:
                     WHERE delivered_time >= ? AND delivered_time <= ?
                     AND app_identifier = ?
                     GROUP BY hour
-                    ORDER BY count DESC
+                    ORDER BY count DESC, hour
                     LIMIT 3
                 """, (start_str, end_str, app_id))
                 
@@ -473,29 +806,25 @@ class NotificationAnalytics:
             start_str = start_date.strftime('%Y-%m-%d %H:%M:%S')
             end_str = end_date.strftime('%Y-%m-%d %H:%M:%S')
             
-            # Get all notification timestamps
             cursor.execute("""
-                SELECT delivered_time
-                FROM notifications
+                SELECT COUNT(*) FROM notifications
                 WHERE delivered_time >= ? AND delivered_time <= ?
-                ORDER BY delivered_time
             """, (start_str, end_str))
+            notification_count = cursor.fetchone()[0]
             
-            timestamps = []
-            for row in cursor.fetchall():
-                try:
-                    dt = datetime.strptime(row[0], '%Y-%m-%d %H:%M:%S')
-                    timestamps.append(dt)
-                except:
-                    pass
-            
-            # Calculate focus time windows
-            focus_windows = []
-            if len(timestamps) > 1:
-                for i in range(1, len(timestamps)):
-                    gap = (timestamps[i] - timestamps[i-1]).total_seconds()
-                    if gap > 1800:  # 30+ minute gap
-                        focus_windows.append(gap / 60)  # Convert to minutes
+            # Focus time windows: 30+ minute gaps between consecutive
+            # notifications, computed in SQLite so only the gaps are returned
+            cursor.execute("""
+                SELECT gap_minutes FROM (
+                    SELECT (julianday(delivered_time) -
+                            julianday(LAG(delivered_time) OVER (ORDER BY delivered_time))) * 1440
+                           AS gap_minutes
+                    FROM notifications
+                    WHERE delivered_time >= ? AND delivered_time <= ?
+                )
+                WHERE gap_minutes > 30
+            """, (start_str, end_str))
+            focus_windows = [row[0] for row in cursor.fetchall()]
                         
             # Calculate metrics
             if focus_windows:
@@ -507,7 +836,7 @@ class NotificationAnalytics:
                 
             # Calculate interruption rate (notifications per productive hour)
             productive_hours = total_focus / 60
-            interruption_rate = len(timestamps) / productive_hours if productive_hours > 0 else 0
+            interruption_rate = notification_count / productive_hours if productive_hours > 0 else 0
             
             # Find best focus times
             cursor.execute("""
@@ -517,7 +846,7 @@ class NotificationAnalytics:
                 FROM notifications
                 WHERE delivered_time >= ? AND delivered_time <= ?
                 GROUP BY hour
-                ORDER BY count
+                ORDER BY count, hour
                 LIMIT 3
             """, (start_str, end_str))
             
@@ -1024,6 +1353,37 @@ class NotificationAnalytics:
         return statistics.mean(weekday_counts) if weekday_counts else 0
 
 
+class AnalyticsPrecomputer(threading.Thread):
+    """Background thread that refreshes precomputed analytics once a night."""
+    
+    def __init__(self, analytics: NotificationAnalytics, hour: int = 3,
+                 days_options: Iterable[int] = (7, 30)):
+        super().__init__(name="analytics-precompute", daemon=True)
+        self.analytics = analytics
+        self.hour = hour
+        self.days_options = tuple(days_options)
+        self._stop_event = threading.Event()
+        
+    def seconds_until_next_run(self, now: datetime) -> float:
+        """Seconds from now until the next run at ``hour`` o'clock local time."""
+        next_run = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+        
+    def run(self):
+        while not self._stop_event.wait(self.seconds_until_next_run(datetime.now())):
+            try:
+                written = self.analytics.precompute(self.days_options)
+                logger.info(f"Precomputed {written} analytics results")
+            except Exception as e:
+                logger.error(f"Error precomputing analytics: {e}")
+                
+    def stop(self):
+        """Stop the thread before its next run."""
+        self._stop_event.set()
+
+
 # Convenience functions
 def generate_analytics_dashboard(
     days: int = 7, 
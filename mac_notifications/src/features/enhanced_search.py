@@ -8,58 +8,106 @@ regex support, date filtering, and complex boolean queries
 import re
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import json
 
+from ..database.repositories import DELIVERED_EPOCH_SQL, to_epoch
+
+# Rows fetched from the cursor at a time while streaming search results
+FETCH_CHUNK_SIZE = 200
+
+# Query vocabulary, shared by every EnhancedSearch instance
+
+# Natural language time mappings
+TIME_MAPPINGS = {
+    'today': lambda: datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+    'yesterday': lambda: (datetime.now() - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0),
+    'this week': lambda: datetime.now() - timedelta(days=datetime.now().weekday()),
+    'last week': lambda: datetime.now() - timedelta(days=datetime.now().weekday() + 7),
+    'this month': lambda: datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+    'last month': lambda: (datetime.now().replace(day=1) - timedelta(days=1)).replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+}
+
+# Natural language to SQL operator mappings
+OPERATOR_MAPPINGS = {
+    'and': 'AND',
+    'or': 'OR',
+    'not': 'NOT',
+    'but not': 'AND NOT',
+    'except': 'AND NOT',
+    'without': 'AND NOT',
+}
+
+# "last 2 hours", "past 3 days", ...
+_RELATIVE_TIME_RE = re.compile(r'(?:last|past)\s+(\d+)\s+(minute|hour|day|week)s?\b')
+
+# Other query fragments, compiled once rather than looked up per parse
+_BETWEEN_RE = re.compile(r'between\s+(.+?)\s+and\s+(.+?)(?:\s|$)')
+_EXCLUDE_TERM_RE = re.compile(r'(\w+(?:\s+\w+)?)')
+_GROUP_BY_RE = re.compile(r'group\s+by\s+\w+')
+_REGEX_LITERAL_RE = re.compile(r'/(.+?)/')
+_NUMBER_RE = re.compile(r'(\d+)')
+
+# App name aliases
+APP_ALIASES = {
+    'messages': ['com.apple.mobilesms', 'com.apple.messages'],
+    'mail': ['com.apple.mail'],
+    'outlook': ['com.microsoft.outlook'],
+    'teams': ['com.microsoft.teams', 'com.microsoft.teams2'],
+    'camera': ['com.security.batterycam'],
+    'cameras': ['com.security.batterycam'],
+    'security': ['com.security.batterycam', 'com.firewalla.firewalla'],
+    'security camera': ['com.security.batterycam'],
+    'security cameras': ['com.security.batterycam'],
+    'firewalla': ['com.firewalla.firewalla'],
+    'wallet': ['com.apple.passbook'],
+    'news': ['com.apple.news'],
+    'script': ['com.apple.scripteditor2'],
+}
+
+# "from <alias>" / "in <alias>", removed from the query once matched
+_APP_ALIAS_RES = {alias: re.compile(rf'(from|in)\s+{alias}') for alias in APP_ALIASES}
+
+# "from <alias>" suggestions keyed by every prefix of the alias, in alias order
+_APP_SUGGESTIONS_BY_PREFIX: Dict[str, List[str]] = {}
+for _alias in APP_ALIASES:
+    for _end in range(len(_alias) + 1):
+        _APP_SUGGESTIONS_BY_PREFIX.setdefault(_alias[:_end], []).append(f"from {_alias}")
+del _alias, _end
+
+# Search field weights for ranking
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'subtitle': 2.0,
+    'body': 1.0,
+    'app_identifier': 1.5,
+}
+
+PRIORITY_PATTERNS = {
+    'critical': 'CRITICAL',
+    'high priority': 'HIGH',
+    'medium priority': 'MEDIUM',
+    'low priority': 'LOW',
+    'important': 'important',
+    'urgent': 'CRITICAL',
+}
+
+EXCLUSION_PATTERNS = ('but not', 'except', 'without', 'excluding')
+
+# Common words never used as keywords
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+                        'show', 'me', 'all', 'find', 'search', 'get', 'list'})
+
 
 class EnhancedSearch:
     """Advanced search engine for notifications"""
     
     def __init__(self):
-        # Natural language time mappings
-        self.time_mappings = {
-            'today': lambda: datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
-            'yesterday': lambda: (datetime.now() - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0),
-            'this week': lambda: datetime.now() - timedelta(days=datetime.now().weekday()),
-            'last week': lambda: datetime.now() - timedelta(days=datetime.now().weekday() + 7),
-            'this month': lambda: datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0),
-            'last month': lambda: (datetime.now().replace(day=1) - timedelta(days=1)).replace(day=1, hour=0, minute=0, second=0, microsecond=0),
-        }
-        
-        # Natural language to SQL operator mappings
-        self.operator_mappings = {
-            'and': 'AND',
-            'or': 'OR',
-            'not': 'NOT',
-            'but not': 'AND NOT',
-            'except': 'AND NOT',
-            'without': 'AND NOT',
-        }
-        
-        # App name aliases
-        self.app_aliases = {
-            'messages': ['com.apple.mobilesms', 'com.apple.messages'],
-            'mail': ['com.apple.mail'],
-            'outlook': ['com.microsoft.outlook'],
-            'teams': ['com.microsoft.teams', 'com.microsoft.teams2'],
-            'camera': ['com.security.batterycam'],
-            'cameras': ['com.security.batterycam'],
-            'security': ['com.security.batterycam', 'com.firewalla.firewalla'],
-            'security camera': ['com.security.batterycam'],
-            'security cameras': ['com.security.batterycam'],
-            'firewalla': ['com.firewalla.firewalla'],
-            'wallet': ['com.apple.passbook'],
-            'news': ['com.apple.news'],
-            'script': ['com.apple.scripteditor2'],
-        }
-        
-        # Search field weights for ranking
-        self.field_weights = {
-            'title': 3.0,
-            'subtitle': 2.0,
-            'body': 1.0,
-            'app_identifier': 1.5,
-        }
+        # The vocabulary is module-level; instances only reference it
+        self.time_mappings = TIME_MAPPINGS
+        self.operator_mappings = OPERATOR_MAPPINGS
+        self.app_aliases = APP_ALIASES
+        self.field_weights = FIELD_WEIGHTS
     
     def parse_natural_language_query(self, query: str) -> Dict[str, Any]:
         """Parse natural language query into structured search parameters"""
@@ -102,37 +150,36 @@ class EnhancedSearch:
             'sort_by': 'relevance',
         }
         
-        # Extract time range
-        for time_phrase, time_func in self.time_mappings.items():
-            if time_phrase in query_lower:
-                if 'between' in query_lower and ' and ' in query_lower:
-                    # Handle "between X and Y" format
-                    match = re.search(r'between\s+(.+?)\s+and\s+(.+?)(?:\s|$)', query_lower)
-                    if match:
-                        start_str, end_str = match.groups()
-                        params['time_range'] = self._parse_time_range(start_str, end_str)
-                else:
-                    # Simple time phrase
-                    start_time = time_func()
-                    if 'last' in time_phrase:
-                        end_time = datetime.now()
+        # Extract time range; relative windows ("last 2 hours") first, so
+        # they reach SQL as a bound range instead of becoming keywords
+        relative = _RELATIVE_TIME_RE.search(query_lower)
+        if relative:
+            amount, unit = relative.groups()
+            end_time = datetime.now()
+            params['time_range'] = (end_time - timedelta(**{unit + 's': int(amount)}), end_time)
+            query_lower = query_lower[:relative.start()] + query_lower[relative.end():]
+        else:
+            for time_phrase, time_func in self.time_mappings.items():
+                if time_phrase in query_lower:
+                    if 'between' in query_lower and ' and ' in query_lower:
+                        # Handle "between X and Y" format
+                        match = _BETWEEN_RE.search(query_lower)
+                        if match:
+                            start_str, end_str = match.groups()
+                            params['time_range'] = self._parse_time_range(start_str, end_str)
                     else:
-                        end_time = start_time + timedelta(days=1 if 'today' in time_phrase else 7)
-                    params['time_range'] = (start_time, end_time)
-                query_lower = query_lower.replace(time_phrase, '')
-                break  # Only match first time phrase
+                        # Simple time phrase
+                        start_time = time_func()
+                        if 'last' in time_phrase:
+                            end_time = datetime.now()
+                        else:
+                            end_time = start_time + timedelta(days=1 if 'today' in time_phrase else 7)
+                        params['time_range'] = (start_time, end_time)
+                    query_lower = query_lower.replace(time_phrase, '')
+                    break  # Only match first time phrase
         
         # Extract priority filter
-        priority_patterns = {
-            'critical': 'CRITICAL',
-            'high priority': 'HIGH',
-            'medium priority': 'MEDIUM',
-            'low priority': 'LOW',
-            'important': 'important',
-            'urgent': 'CRITICAL',
-        }
-        
-        for pattern, priority in priority_patterns.items():
+        for pattern, priority in PRIORITY_PATTERNS.items():
             if pattern in query_lower:
                 params['priority_filter'] = priority
                 query_lower = query_lower.replace(pattern, '')
@@ -141,17 +188,16 @@ class EnhancedSearch:
         for alias, app_ids in self.app_aliases.items():
             if f'from {alias}' in query_lower or f'in {alias}' in query_lower:
                 params['apps'].extend(app_ids)
-                query_lower = re.sub(f'(from|in)\s+{alias}', '', query_lower)
+                query_lower = _APP_ALIAS_RES[alias].sub('', query_lower)
         
         # Extract exclusions
-        exclusion_patterns = ['but not', 'except', 'without', 'excluding']
-        for pattern in exclusion_patterns:
+        for pattern in EXCLUSION_PATTERNS:
             if pattern in query_lower:
                 parts = query_lower.split(pattern)
                 if len(parts) > 1:
                     exclude_part = parts[1].strip()
                     # Extract first word/phrase after exclusion
-                    exclude_match = re.match(r'(\w+(?:\s+\w+)?)', exclude_part)
+                    exclude_match = _EXCLUDE_TERM_RE.match(exclude_part)
                     if exclude_match:
                         params['exclude_keywords'].append(exclude_match.group(1))
                     query_lower = parts[0].strip()
@@ -164,7 +210,7 @@ class EnhancedSearch:
                 params['group_by'] = 'hour'
             elif 'day' in query_lower:
                 params['group_by'] = 'day'
-            query_lower = re.sub(r'group\s+by\s+\w+', '', query_lower)
+            query_lower = _GROUP_BY_RE.sub('', query_lower)
         
         # Extract sorting
         if 'sort by time' in query_lower or 'newest first' in query_lower:
@@ -173,7 +219,7 @@ class EnhancedSearch:
             params['sort_by'] = 'priority'
         
         # Extract regex pattern if present
-        regex_match = re.search(r'/(.+?)/', query)
+        regex_match = _REGEX_LITERAL_RE.search(query)
         if regex_match:
             params['regex_pattern'] = regex_match.group(1)
             query_lower = query_lower.replace(f'/{regex_match.group(1)}/', '')
@@ -181,9 +227,7 @@ class EnhancedSearch:
         # Remaining words are keywords
         keywords = query_lower.strip().split()
         # Remove common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                      'show', 'me', 'all', 'find', 'search', 'get', 'list'}
-        params['keywords'] = [word for word in keywords if word not in stop_words and len(word) > 2]
+        params['keywords'] = [word for word in keywords if word not in STOP_WORDS and len(word) > 2]
         
         return params
     
@@ -198,10 +242,10 @@ class EnhancedSearch:
             
             # Check for relative times
             if 'hour' in start_str:
-                hours = int(re.search(r'(\d+)', start_str).group(1))
+                hours = int(_NUMBER_RE.search(start_str).group(1))
                 start_dt = datetime.now() - timedelta(hours=hours)
             elif 'day' in start_str:
-                days = int(re.search(r'(\d+)', start_str).group(1))
+                days = int(_NUMBER_RE.search(start_str).group(1))
                 start_dt = datetime.now() - timedelta(days=days)
             else:
                 # Try parsing as date
@@ -235,7 +279,28 @@ class EnhancedSearch:
         
         return None
     
-    def build_sql_query(self, params: Dict[str, Any], has_priority: bool = True) -> Tuple[str, List[Any]]:
+    @staticmethod
+    def _text_condition(term: str, has_fts: bool) -> Tuple[str, List[Any]]:
+        """SQL condition (and params) matching notifications whose text contains ``term``
+        
+        Uses the trigram full-text index when there is one; it needs at
+        least three characters, so shorter terms fall back to LIKE.
+        """
+        if has_fts and len(term) >= 3:
+            phrase = '"' + term.replace('"', '""') + '"'
+            return 'id IN (SELECT rowid FROM notifications_fts WHERE notifications_fts MATCH ?)', [phrase]
+        
+        pattern = f'%{term}%'
+        return '''
+            (
+                LOWER(title) LIKE ?
+                OR LOWER(subtitle) LIKE ?
+                OR LOWER(body) LIKE ?
+            )
+        ''', [pattern] * 3
+    
+    def build_sql_query(self, params: Dict[str, Any], has_priority: bool = True,
+                        has_fts: bool = False) -> Tuple[str, List[Any]]:
         """Build SQL query from parsed parameters"""
         # Base query
         if has_priority:
@@ -261,9 +326,8 @@ class EnhancedSearch:
         # Add time range filter
         if params['time_range']:
             start_time, end_time = params['time_range']
-            query += ' AND datetime(delivered_time) BETWEEN datetime(?) AND datetime(?)'
-            sql_params.extend([start_time.strftime('%Y-%m-%d %H:%M:%S'), 
-                             end_time.strftime('%Y-%m-%d %H:%M:%S')])
+            query += f' AND {DELIVERED_EPOCH_SQL} BETWEEN ? AND ?'
+            sql_params.extend([to_epoch(start_time), to_epoch(end_time)])
         
         # Add priority filter
         if params['priority_filter'] and has_priority:
@@ -295,15 +359,9 @@ class EnhancedSearch:
                 # Standard keyword search
                 keyword_conditions = []
                 for keyword in params['keywords']:
-                    keyword_conditions.append('''
-                        (
-                            LOWER(title) LIKE ? 
-                            OR LOWER(subtitle) LIKE ?
-                            OR LOWER(body) LIKE ?
-                        )
-                    ''')
-                    keyword_pattern = f'%{keyword}%'
-                    sql_params.extend([keyword_pattern] * 3)
+                    condition, condition_params = self._text_condition(keyword, has_fts)
+                    keyword_conditions.append(condition)
+                    sql_params.extend(condition_params)
                 
                 if keyword_conditions:
                     query += ' AND (' + ' AND '.join(keyword_conditions) + ')'
@@ -311,15 +369,9 @@ class EnhancedSearch:
         # Add exclusions
         if params['exclude_keywords']:
             for exclude in params['exclude_keywords']:
-                query += '''
-                    AND NOT (
-                        LOWER(title) LIKE ? 
-                        OR LOWER(subtitle) LIKE ?
-                        OR LOWER(body) LIKE ?
-                    )
-                '''
-                exclude_pattern = f'%{exclude}%'
-                sql_params.extend([exclude_pattern] * 3)
+                condition, condition_params = self._text_condition(exclude, has_fts)
+                query += f' AND NOT {condition}'
+                sql_params.extend(condition_params)
         
         # Add sorting
         if params['sort_by'] == 'time':
@@ -332,8 +384,8 @@ class EnhancedSearch:
         
         return query, sql_params
     
-    def search(self, query: str, conn: sqlite3.Connection, limit: int = 50) -> Dict[str, Any]:
-        """Execute a natural language search query"""
+    def _execute(self, query: str, conn: sqlite3.Connection, limit: int) -> Tuple[Dict[str, Any], bool, sqlite3.Cursor]:
+        """Parse a query and execute it, returning (params, has_priority, cursor)"""
         # Parse the query
         params = self.parse_natural_language_query(query)
         
@@ -343,19 +395,34 @@ class EnhancedSearch:
         columns = [col[1] for col in cursor.fetchall()]
         has_priority = 'priority_score' in columns
         
+        # Use the full-text index for keywords if the database has one
+        has_fts = False
+        if params['keywords'] or params['exclude_keywords']:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notifications_fts'")
+            has_fts = cursor.fetchone() is not None
+        
         # Build SQL query
-        sql_query, sql_params = self.build_sql_query(params, has_priority)
+        sql_query, sql_params = self.build_sql_query(params, has_priority, has_fts)
         sql_query += ' LIMIT ?'
         sql_params.append(limit)
         
         # Execute query
         cursor.execute(sql_query, sql_params)
+        return params, has_priority, cursor
+    
+    @staticmethod
+    def _iter_rows(cursor: sqlite3.Cursor) -> Iterator[Tuple]:
+        """Stream result rows in FETCH_CHUNK_SIZE chunks instead of fetchall()"""
+        while True:
+            chunk = cursor.fetchmany(FETCH_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield from chunk
+    
+    def _iter_results(self, cursor: sqlite3.Cursor, has_priority: bool) -> Iterator[Dict[str, Any]]:
+        """Format result rows as notification dicts while they are fetched"""
         columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        # Format results
-        notifications = []
-        for row in rows:
+        for row in self._iter_rows(cursor):
             notif = dict(zip(columns, row))
             formatted_notif = {
                 "id": f"notif_{notif['rec_id']}",
@@ -374,7 +441,14 @@ class EnhancedSearch:
                 formatted_notif['priority_level'] = notif.get('priority_level', 'UNKNOWN')
                 formatted_notif['priority_factors'] = json.loads(notif.get('priority_factors', '[]'))
             
-            notifications.append(formatted_notif)
+            yield formatted_notif
+    
+    def search(self, query: str, conn: sqlite3.Connection, limit: int = 50) -> Dict[str, Any]:
+        """Execute a natural language search query"""
+        params, has_priority, cursor = self._execute(query, conn, limit)
+        
+        # Format results
+        notifications = list(self._iter_results(cursor, has_priority))
         
         # Handle grouping if requested
         if params['group_by']:
@@ -394,6 +468,17 @@ class EnhancedSearch:
             'notifications': notifications
         }
     
+    def search_ids(self, query: str, conn: sqlite3.Connection, limit: int = 50) -> List[int]:
+        """Execute a natural language search query and return only rec_ids
+        
+        Rows are streamed and never formatted, so large selections (e.g. for
+        batch actions) do not build a full list of notification dicts.
+        """
+        _, _, cursor = self._execute(query, conn, limit)
+        columns = [desc[0] for desc in cursor.description]
+        rec_id_index = columns.index('rec_id')
+        return [row[rec_id_index] for row in self._iter_rows(cursor)]
+    
     def _serialize_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Serialize parameters for JSON output"""
         serialized = params.copy()
@@ -460,23 +545,22 @@ class EnhancedSearch:
     def get_search_suggestions(self, partial_query: str, conn: sqlite3.Connection) -> List[str]:
         """Get search suggestions based on partial query"""
         suggestions = []
+        partial_lower = partial_query.lower()
         
         # Add time-based suggestions
-        if 'tod' in partial_query.lower():
+        if 'tod' in partial_lower:
             suggestions.append(partial_query + 'ay')
-        elif 'yest' in partial_query.lower():
+        elif 'yest' in partial_lower:
             suggestions.append(partial_query + 'erday')
         
         # Add priority suggestions
-        if 'crit' in partial_query.lower():
+        if 'crit' in partial_lower:
             suggestions.append(partial_query + 'ical')
-        elif 'imp' in partial_query.lower():
+        elif 'imp' in partial_lower:
             suggestions.append(partial_query + 'ortant')
         
         # Add app suggestions
-        for alias in self.app_aliases:
-            if alias.startswith(partial_query.lower()):
-                suggestions.append(f"from {alias}")
+        suggestions.extend(_APP_SUGGESTIONS_BY_PREFIX.get(partial_lower, ()))
         
         return suggestions[:5]  # Limit to 5 suggestions
 
@@ -12,6 +12,11 @@ import json
 from difflib import SequenceMatcher
 
 
+def _parse_time(value: str) -> datetime:
+    """Parse a delivered_time, stored ("YYYY-MM-DD HH:MM:SS") or ISO ("...T...")"""
+    return datetime.fromisoformat(value.replace(' ', 'T'))
+
+
 class NotificationGrouper:
     """Groups related notifications intelligently"""
     
@@ -111,10 +116,18 @@ class NotificationGrouper:
         return '|'.join(parts)
     
     def group_notifications(self, notifications: List[Dict[str, Any]], 
-                          time_window_minutes: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
-        """Group notifications by similarity and time windows"""
+                          time_window_minutes: Optional[int] = None,
+                          min_group_size: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Group notifications by similarity and time windows
+        
+        Arguments left as None fall back to self.config. Pass them per call
+        rather than editing self.config when the grouper is shared between
+        threads.
+        """
         if time_window_minutes is None:
             time_window_minutes = self.config['time_window_minutes']
+        if min_group_size is None:
+            min_group_size = self.config['min_group_size']
         
         # Sort by time
         sorted_notifs = sorted(notifications, 
@@ -135,10 +148,10 @@ class NotificationGrouper:
             group = groups[group_key]
             
             # Check time window
-            notif_time = datetime.strptime(notif['delivered_time'], '%Y-%m-%d %H:%M:%S')
+            notif_time = _parse_time(notif['delivered_time'])
             
             if group['notifications']:
-                last_time = datetime.strptime(group['last_time'], '%Y-%m-%d %H:%M:%S')
+                last_time = _parse_time(group['last_time'])
                 time_diff = (notif_time - last_time).total_seconds() / 60
                 
                 # Create new group if outside time window
@@ -170,7 +183,7 @@ class NotificationGrouper:
         # Generate summaries and filter small groups
         final_groups = {}
         for key, group in groups.items():
-            if group['count'] >= self.config['min_group_size']:
+            if group['count'] >= min_group_size:
                 group['summary'] = self.generate_group_summary(group)
                 final_groups[key] = group
         
@@ -183,8 +196,8 @@ class NotificationGrouper:
         notifications = group['notifications']
         
         # Time range
-        first_time = datetime.strptime(group['first_time'], '%Y-%m-%d %H:%M:%S')
-        last_time = datetime.strptime(group['last_time'], '%Y-%m-%d %H:%M:%S')
+        first_time = _parse_time(group['first_time'])
+        last_time = _parse_time(group['last_time'])
         time_range = f"{first_time.strftime('%-I:%M %p')} - {last_time.strftime('%-I:%M %p')}"
         
         if group_type == 'security_camera':
@@ -230,8 +243,8 @@ class NotificationGrouper:
         
         # Calculate time span
         if group['first_time'] and group['last_time']:
-            first = datetime.strptime(group['first_time'], '%Y-%m-%d %H:%M:%S')
-            last = datetime.strptime(group['last_time'], '%Y-%m-%d %H:%M:%S')
+            first = _parse_time(group['first_time'])
+            last = _parse_time(group['last_time'])
             stats['time_span_minutes'] = int((last - first).total_seconds() / 60)
         
         # Analyze notifications
@@ -283,10 +296,7 @@ def group_notifications(notifications: List[Dict[str, Any]],
                        min_group_size: int = 2) -> Dict[str, Dict[str, Any]]:
     """Group notifications with sensible defaults"""
     grouper = NotificationGrouper()
-    grouper.config['time_window_minutes'] = time_window_minutes
-    grouper.config['min_group_size'] = min_group_size
-    
-    return grouper.group_notifications(notifications, time_window_minutes)
+    return grouper.group_notifications(notifications, time_window_minutes, min_group_size)
 
 
 def generate_grouping_report(groups: Dict[str, Dict[str, Any]]) -> str:
@@ -4,31 +4,54 @@ Priority Scoring Module
 Intelligent priority scoring for notifications based on content, sender, and context
 """
 
+import bisect
+import functools
 import re
 from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
 
+# Dollar amounts ("$1,500.00") and clock times ("10:30 am") in notification text
+_MONEY_RE = re.compile(r'\$[\d,]+\.?\d*')
+_CLOCK_TIME_RE = re.compile(r'\b\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)?\b')
+
+# Priority levels by minimum score (Settings.PRIORITY_LEVELS): a score of at
+# least PRIORITY_THRESHOLDS[i] ranks at PRIORITY_LEVELS[i + 1] or higher
+PRIORITY_THRESHOLDS = (5, 10, 15)
+PRIORITY_LEVELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_delivered_time(value: str) -> datetime:
+    """Parse a stored delivered_time; timestamps repeat within a batch, so cache them"""
+    return datetime.fromisoformat(value.replace(' ', 'T'))
+
+
 @dataclass
 class ScoringRule:
     """Represents a scoring rule with keywords and weights"""
     keywords: Dict[str, float]
     category: str
+    _ranked: List[Tuple[str, float]] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Highest score first; the sort is stable, so equal scores keep
+        # their definition order and the first of them still wins
+        self._ranked = sorted(
+            ((keyword, score) for keyword, score in self.keywords.items() if score > 0),
+            key=lambda item: item[1], reverse=True
+        )
     
     def evaluate(self, text: str) -> Tuple[float, Optional[str]]:
         """Evaluate text against keywords and return score and matched keyword"""
-        max_score = 0
-        matched_keyword = None
-        
-        for keyword, score in self.keywords.items():
+        # The first keyword found is the best one, so stop scanning there
+        for keyword, score in self._ranked:
             if keyword in text:
-                if score > max_score:
-                    max_score = score
-                    matched_keyword = keyword
+                return score, keyword
         
-        return max_score, matched_keyword
+        return 0, None
 
 
 class PriorityScorer:
@@ -170,14 +193,28 @@ class PriorityScorer:
         # Time-based scoring
         self.time_decay_hours = 24  # Priority decreases over time
         self.recent_boost_hours = 1  # Boost for very recent notifications
+        
+        # Repeated alerts share their keyword, amount and date evaluation
+        # across calls; app and time factors are applied afterwards, uncached.
+        # Call self._evaluate_text.cache_clear() after changing self.rules.
+        self._evaluate_text = functools.lru_cache(maxsize=8192)(self._evaluate_text)
     
-    def calculate_priority(self, notification: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate priority score for a notification"""
-        score = 0.0
-        factors = []
+    def calculate_priority(self, notification: Dict[str, Any],
+                           now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Calculate priority score for a notification
         
-        # Extract text content
+        Args:
+            notification: Notification dict
+            now: Reference time for age-based factors; defaults to the
+                current time (score_notifications passes one per batch)
+        """
         text = self._extract_text(notification).lower()
+        return self._score(notification, text, self._evaluate_text(text), now or datetime.now())
+    
+    def _evaluate_text(self, text: str) -> Tuple[float, Tuple[str, ...]]:
+        """Score the parts of the priority that depend only on the (lowercased) text"""
+        score = 0.0
+        factors = []
         
         # 1. Evaluate all rules
         category_scores = {}
@@ -203,6 +240,14 @@ class PriorityScorer:
             score += date_score
             factors.append(date_factor)
         
+        return score, tuple(factors)
+    
+    def _score(self, notification: Dict[str, Any], text: str,
+               text_score: Tuple[float, Tuple[str, ...]], now: datetime) -> Dict[str, Any]:
+        """Finish a priority from its text score with the app, time and special factors"""
+        score, factors = text_score[0], list(text_score[1])
+        delivered_time = self._delivered_time(notification)
+        
         # 4. Apply app weight
         app_id = notification.get('app_identifier', '')
         app_weight = self.app_weights.get(app_id, self.app_weights['default'])
@@ -211,13 +256,15 @@ class PriorityScorer:
             factors.append(f"app_weight:{app_id}(x{app_weight})")
         
         # 5. Time-based adjustments
-        time_score, time_factor = self._evaluate_time_factors(notification)
+        time_score, time_factor = self._evaluate_time_factors(delivered_time, now)
         if time_score != 1.0:
             score *= time_score
             factors.append(time_factor)
         
         # 6. Special patterns
-        special_score, special_factors = self._evaluate_special_patterns(notification, text)
+        special_score, special_factors = self._evaluate_special_patterns(
+            notification, text, delivered_time
+        )
         if special_score > 0:
             score += special_score
             factors.extend(special_factors)
@@ -225,27 +272,17 @@ class PriorityScorer:
         # Round score
         score = round(score, 2)
         
-        # Determine priority level
-        if score >= 15:
-            priority_level = 'CRITICAL'
-        elif score >= 10:
-            priority_level = 'HIGH'
-        elif score >= 5:
-            priority_level = 'MEDIUM'
-        else:
-            priority_level = 'LOW'
-        
         return {
             'score': score,
-            'level': priority_level,
+            'level': PRIORITY_LEVELS[bisect.bisect_right(PRIORITY_THRESHOLDS, score)],
             'factors': factors
         }
     
     def _extract_text(self, notification: Dict[str, Any]) -> str:
         """Extract all text content from notification"""
         text_parts = []
-        for field in ['title', 'subtitle', 'body', 'informative_text']:
-            value = notification.get(field, '')
+        for key in ['title', 'subtitle', 'body', 'informative_text']:
+            value = notification.get(key, '')
             if isinstance(value, str):
                 text_parts.append(value)
             elif isinstance(value, (list, tuple)):
@@ -257,8 +294,7 @@ class PriorityScorer:
     
     def _evaluate_monetary_amounts(self, text: str) -> Tuple[float, str]:
         """Evaluate monetary amounts in text"""
-        money_pattern = r'\$[\d,]+\.?\d*'
-        amounts = re.findall(money_pattern, text)
+        amounts = _MONEY_RE.findall(text)
         
         if not amounts:
             return 0, ''
@@ -293,22 +329,29 @@ class PriorityScorer:
             return 5, "date:tonight(+5)"
         
         # Check for specific times
-        time_pattern = r'\b\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)?\b'
-        if re.search(time_pattern, text):
+        if _CLOCK_TIME_RE.search(text):
             return 3, "specific_time(+3)"
         
         return 0, ''
     
-    def _evaluate_time_factors(self, notification: Dict[str, Any]) -> Tuple[float, str]:
+    def _delivered_time(self, notification: Dict[str, Any]) -> Optional[datetime]:
+        """The notification's delivered_time as a datetime, or None if it can't be parsed"""
+        delivered = notification.get('delivered_time', '')
+        if isinstance(delivered, datetime):
+            return delivered
+        try:
+            return _parse_delivered_time(delivered)
+        except Exception as e:
+            self.logger.debug(f"Error parsing delivered time: {e}")
+            return None
+    
+    def _evaluate_time_factors(self, delivered_time: Optional[datetime], now: datetime) -> Tuple[float, str]:
         """Evaluate time-based factors"""
+        if delivered_time is None:
+            return 1.0, ''
+        
         try:
-            delivered_str = notification.get('delivered_time', '')
-            if isinstance(delivered_str, datetime):
-                delivered_time = delivered_str
-            else:
-                delivered_time = datetime.fromisoformat(delivered_str.replace(' ', 'T'))
-            
-            hours_old = (datetime.now() - delivered_time).total_seconds() / 3600
+            hours_old = (now - delivered_time).total_seconds() / 3600
             
             # Boost very recent notifications
             if hours_old < self.recent_boost_hours:
@@ -327,26 +370,19 @@ class PriorityScorer:
             self.logger.debug(f"Error evaluating time factors: {e}")
             return 1.0, ''
     
-    def _evaluate_special_patterns(self, notification: Dict[str, Any], text: str) -> Tuple[float, List[str]]:
+    def _evaluate_special_patterns(self, notification: Dict[str, Any], text: str,
+                                   delivered_time: Optional[datetime]) -> Tuple[float, List[str]]:
         """Evaluate special patterns and conditions"""
         score = 0
         factors = []
         
         # Security alerts at night
         if notification.get('app_identifier') == 'com.security.batterycam':
-            if 'stranger' in text or 'motion' in text:
-                try:
-                    delivered_str = notification.get('delivered_time', '')
-                    if isinstance(delivered_str, datetime):
-                        hour = delivered_str.hour
-                    else:
-                        hour = datetime.fromisoformat(delivered_str.replace(' ', 'T')).hour
-                    
-                    if hour < 6 or hour > 22:  # Night time
-                        score += 5
-                        factors.append("security_night(+5)")
-                except:
-                    pass
+            if ('stranger' in text or 'motion' in text) and delivered_time is not None:
+                hour = delivered_time.hour
+                if hour < 6 or hour > 22:  # Night time
+                    score += 5
+                    factors.append("security_night(+5)")
         
         # Multiple exclamation marks or all caps
         if '!!!' in text or text.isupper():
@@ -363,9 +399,10 @@ class PriorityScorer:
     def score_notifications(self, notifications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Score a list of notifications and sort by priority"""
         scored = []
+        now = datetime.now()
         
         for notif in notifications:
-            priority_info = self.calculate_priority(notif)
+            priority_info = self.calculate_priority(notif, now)
             notif_copy = notif.copy()
             notif_copy['priority_score'] = priority_info['score']
             notif_copy['priority_level'] = priority_info['level']
@@ -379,13 +416,23 @@ class PriorityScorer:
 
 
 # Convenience functions for backward compatibility
+@functools.lru_cache(maxsize=None)
+def _default_scorer() -> PriorityScorer:
+    """Scorer shared by the convenience functions; it holds no per-call state"""
+    return PriorityScorer()
+
+
 def calculate_notification_priority(notification: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate priority for a single notification"""
-    scorer = PriorityScorer()
-    return scorer.calculate_priority(notification)
+    return _default_scorer().calculate_priority(notification)
+
+
+def calculate_priority_score(notification: Dict[str, Any]) -> Tuple[float, str, List[str]]:
+    """Calculate priority for a single notification as (score, level, factors)"""
+    result = _default_scorer().calculate_priority(notification)
+    return result['score'], result['level'], result['factors']
 
 
 def add_priority_to_notifications(notifications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Add priority scoring to a list of notifications"""
-    scorer = PriorityScorer()
-    return scorer.score_notifications(notifications)
\ No newline at end of file
+    return _default_scorer().score_notifications(notifications)
\ No newline at end of file
@@ -6,44 +6,84 @@ Provides standardized templates for different notification types based on priori
 
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from html import escape
+import functools
+import json
 import re
 import logging
 
 
+# Category for each factor prefix the priority scorer emits
+# ("financial:payment(+5)", "high_amount:$1500.0(+8)", ...)
+FACTOR_CATEGORIES = {
+    'financial': 'financial',
+    'amount': 'financial',
+    'high_amount': 'financial',
+    'medium_amount': 'financial',
+    'security': 'security',
+    'medical': 'medical',
+    'work': 'work',
+    'urgency': 'urgency',
+    'communication': 'communication',
+}
+
+# Emoji for each category
+CATEGORY_ICONS = {
+    'financial': '💳',
+    'security': '🔐',
+    'medical': '⚕️',
+    'work': '💼',
+    'urgency': '🚨',
+    'communication': '💬',
+    'general': '📬'
+}
+
+# ANSI color codes for terminal output
+PRIORITY_COLORS = {
+    'CRITICAL': '\033[91m',  # Red
+    'HIGH': '\033[93m',      # Yellow
+    'MEDIUM': '\033[94m',    # Blue
+    'LOW': '\033[92m',       # Green
+    'UNKNOWN': '\033[90m',   # Gray
+    'RESET': '\033[0m'       # Reset
+}
+
+# HTML color codes
+HTML_COLORS = {
+    'CRITICAL': '#dc3545',
+    'HIGH': '#ffc107',
+    'MEDIUM': '#17a2b8',
+    'LOW': '#28a745',
+    'UNKNOWN': '#6c757d'
+}
+
+# Priority indicators for markdown output
+PRIORITY_MARKERS = {
+    'CRITICAL': '🔴',
+    'HIGH': '🟡',
+    'MEDIUM': '🔵',
+    'LOW': '🟢',
+    'UNKNOWN': '⚪'
+}
+
+
 class NotificationTemplates:
     """Format notifications using category-specific templates"""
     
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
         
-        # Define emoji and color codes for different categories
-        self.category_icons = {
-            'financial': '💳',
-            'security': '🔐',
-            'medical': '⚕️',
-            'work': '💼',
-            'urgency': '🚨',
-            'communication': '💬',
-            'general': '📬'
-        }
-        
-        # ANSI color codes for terminal output
-        self.priority_colors = {
-            'CRITICAL': '\033[91m',  # Red
-            'HIGH': '\033[93m',      # Yellow
-            'MEDIUM': '\033[94m',    # Blue
-            'LOW': '\033[92m',       # Green
-            'UNKNOWN': '\033[90m',   # Gray
-            'RESET': '\033[0m'       # Reset
-        }
+        # Shared module-level tables; treat them as read-only
+        self.category_icons = CATEGORY_ICONS
+        self.priority_colors = PRIORITY_COLORS
+        self.html_colors = HTML_COLORS
         
-        # HTML color codes
-        self.html_colors = {
-            'CRITICAL': '#dc3545',
-            'HIGH': '#ffc107',
-            'MEDIUM': '#17a2b8',
-            'LOW': '#28a745',
-            'UNKNOWN': '#6c757d'
+        # format_type -> formatter(notification, use_color); only the
+        # terminal output is colored
+        self._formatters = {
+            'terminal': self._format_terminal,
+            'html': lambda notification, use_color: self._format_html(notification),
+            'markdown': lambda notification, use_color: self._format_markdown(notification),
         }
     
     def format_notification(self, notification: Dict[str, Any], 
@@ -57,14 +97,10 @@ class NotificationTemplates:
             use_color: Whether to include ANSI color codes
             format_type: 'terminal', 'html', or 'markdown'
         """
-        if format_type == 'terminal':
-            return self._format_terminal(notification, use_color)
-        elif format_type == 'html':
-            return self._format_html(notification)
-        elif format_type == 'markdown':
-            return self._format_markdown(notification)
-        else:
+        formatter = self._formatters.get(format_type)
+        if formatter is None:
             return self._format_terminal(notification, False)
+        return formatter(notification, use_color)
     
     def _determine_category(self, notification: Dict[str, Any]) -> str:
         """Determine notification category from priority factors"""
@@ -73,26 +109,17 @@ class NotificationTemplates:
         # Parse factors as strings if they're JSON
         if factors and isinstance(factors[0], str):
             try:
-                import json
                 factors = json.loads(factors[0]) if factors[0].startswith('[') else factors
             except:
                 pass
         
-        # Check factors for category keywords
+        # The first factor with a category prefix decides
         for factor in factors:
-            factor_str = str(factor).lower()
-            if 'financial:' in factor_str or 'amount:' in factor_str:
-                return 'financial'
-            elif 'security:' in factor_str:
-                return 'security'
-            elif 'medical:' in factor_str:
-                return 'medical'
-            elif 'work:' in factor_str:
-                return 'work'
-            elif 'urgency:' in factor_str:
-                return 'urgency'
-            elif 'communication:' in factor_str:
-                return 'communication'
+            prefix, colon, _ = str(factor).partition(':')
+            if colon:
+                category = FACTOR_CATEGORIES.get(prefix.lower())
+                if category:
+                    return category
         
         # Check app identifier
         app_id = notification.get('app_identifier', '').lower()
@@ -114,15 +141,26 @@ class NotificationTemplates:
             if isinstance(time_str, datetime):
                 dt = time_str
             else:
-                # Try different formats
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f']:
+                # Stored timestamps are "YYYY-MM-DD HH:MM:SS"; fromisoformat
+                # parses those far faster than strptime
+                head = time_str.split('.')[0] if isinstance(time_str, str) else None
+                dt = None
+                if head is not None and len(head) == 19 and head[10] in ' T':
                     try:
-                        dt = datetime.strptime(time_str.split('.')[0], fmt.split('.')[0])
-                        break
-                    except:
-                        continue
-                else:
-                    return time_str
+                        dt = datetime.fromisoformat(head)
+                    except ValueError:
+                        pass
+                
+                # Try different formats
+                if dt is None:
+                    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f']:
+                        try:
+                            dt = datetime.strptime(head, fmt.split('.')[0])
+                            break
+                        except:
+                            continue
+                    else:
+                        return time_str
             
             now = datetime.now()
             
@@ -223,7 +261,6 @@ From: {app} | Time: {time}
         app = notification.get('app_identifier', '').split('.')[-1]
         
         # Escape HTML
-        from html import escape
         title = escape(str(title))
         body = escape(str(body))
         subtitle = escape(str(subtitle))
@@ -265,14 +302,7 @@ From: {app} | Time: {time}
         app = notification.get('app_identifier', '').split('.')[-1]
         
         # Priority indicator
-        priority_markers = {
-            'CRITICAL': '🔴',
-            'HIGH': '🟡',
-            'MEDIUM': '🔵',
-            'LOW': '🟢',
-            'UNKNOWN': '⚪'
-        }
-        marker = priority_markers.get(priority_level, '⚪')
+        marker = PRIORITY_MARKERS.get(priority_level, '⚪')
         
         md = f"""### {marker} {icon} {title}
 
@@ -304,7 +334,10 @@ From: {app} | Time: {time}
             return '\n\n'.join(output)
         
         elif format_type == 'html':
-            html = """<!DOCTYPE html>
+            # Built as a list and joined once rather than grown with +=; the
+            # header is not run through str.format, whose fields would clash
+            # with the CSS braces
+            parts = ["""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -339,42 +372,42 @@ From: {app} | Time: {time}
     <div class="container">
         <h1>📬 Notifications</h1>
         <div class="stats">
-            Total: {count} notifications
+            Total: """, str(len(notifications)), """ notifications
         </div>
-""".format(count=len(notifications))
-            
-            for notif in notifications:
-                html += self.format_notification(notif, False, format_type)
-            
-            html += """
+"""]
+            parts.extend(self.format_notification(notif, False, format_type) for notif in notifications)
+            parts.append("""
     </div>
 </body>
 </html>
-"""
-            return html
+""")
+            return ''.join(parts)
         
         elif format_type == 'markdown':
-            md = f"# 📬 Notifications\n\n**Total:** {len(notifications)} notifications\n\n"
-            for notif in notifications:
-                md += self.format_notification(notif, False, format_type)
-            return md
+            parts = [f"# 📬 Notifications\n\n**Total:** {len(notifications)} notifications\n\n"]
+            parts.extend(self.format_notification(notif, False, format_type) for notif in notifications)
+            return ''.join(parts)
         
         else:
             return self.format_notification_list(notifications, 'terminal', False)
 
 
 # Convenience functions for backward compatibility
+@functools.lru_cache(maxsize=None)
+def _default_templates() -> NotificationTemplates:
+    """Formatter shared by the convenience functions; it holds no per-call state"""
+    return NotificationTemplates()
+
+
 def format_notification(notification: Dict[str, Any], 
                        use_color: bool = True,
                        format_type: str = 'terminal') -> str:
     """Format a single notification"""
-    templates = NotificationTemplates()
-    return templates.format_notification(notification, use_color, format_type)
+    return _default_templates().format_notification(notification, use_color, format_type)
 
 
 def format_notification_list(notifications: List[Dict[str, Any]],
                            format_type: str = 'terminal',
                            use_color: bool = True) -> str:
     """Format a list of notifications"""
-    templates = NotificationTemplates()
-    return templates.format_notification_list(notifications, format_type, use_color)
\ No newline at end of file
+    return _default_templates().format_notification_list(notifications, format_type, use_color)
\ No newline at end of file
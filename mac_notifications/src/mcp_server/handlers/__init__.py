@@ -1,15 +1,20 @@
 """
 MCP Server Handlers
 
-Async handler functions for all MCP server tools.
+Handler functions for all MCP server tools. Handlers that only do
+synchronous work are plain functions; the rest are coroutines.
 """
 
+import asyncio
+import functools
 import mcp.types as types
 from .core import CORE_HANDLERS
 from .search import SEARCH_HANDLERS
 from .batch import BATCH_HANDLERS
 from .analytics import ANALYTICS_HANDLERS
-from .summary import SUMMARY_HANDLERS
+from .summary import SUMMARY_HANDLERS, NO_ARGUMENT_SUMMARY_TOOLS
+from .common import run_blocking
+from ..tools import TOOL_DEFINITIONS, TOOL_MAP
 
 
 # Combine all handlers
@@ -21,6 +26,29 @@ ALL_HANDLERS = {
     **SUMMARY_HANDLERS
 }
 
+# Tools whose handlers must be awaited
+ASYNC_HANDLERS = frozenset(
+    name for name, handler in ALL_HANDLERS.items()
+    if asyncio.iscoroutinefunction(handler)
+)
+
+# Tools whose handlers never read their arguments
+NO_ARGUMENT_TOOLS = NO_ARGUMENT_SUMMARY_TOOLS
+
+# Single-lookup dispatch table: tool name -> (handler, is_async, takes_arguments)
+DISPATCH_TABLE = {
+    name: (handler, name in ASYNC_HANDLERS, name not in NO_ARGUMENT_TOOLS)
+    for name, handler in ALL_HANDLERS.items()
+}
+
+# Every advertised tool needs a handler and every handler a tool definition
+if DISPATCH_TABLE.keys() != TOOL_MAP.keys():
+    raise RuntimeError(
+        "Tool definitions and handlers are out of sync: "
+        f"no handler for {sorted(TOOL_MAP.keys() - DISPATCH_TABLE.keys())}, "
+        f"no definition for {sorted(DISPATCH_TABLE.keys() - TOOL_MAP.keys())}"
+    )
+
 
 def register_all_handlers(server, notification_server):
     """Register all handlers with the MCP server
@@ -30,17 +58,28 @@ def register_all_handlers(server, notification_server):
         notification_server: The NotificationMCPServer instance
     """
     
+    # Bind the notification server into every handler once, up front
+    bound_handlers = {
+        name: (functools.partial(handler, notification_server), is_async, takes_arguments)
+        for name, (handler, is_async, takes_arguments) in DISPATCH_TABLE.items()
+    }
+    
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
         """Handle tool calls"""
-        if name in ALL_HANDLERS:
-            handler = ALL_HANDLERS[name]
-            return await handler(notification_server, arguments)
-        else:
+        entry = bound_handlers.get(name)
+        if entry is None:
             return [types.TextContent(type="text", text=f"❌ Unknown tool: {name}")]
+
+        handler, is_async, takes_arguments = entry
+        if not takes_arguments:
+            arguments = None
+        if is_async:
+            return await handler(arguments)
+        # Sync handlers still hit SQLite, so keep them off the event loop
+        return await run_blocking(handler, arguments)
     
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
-        """List available tools"""
-        from ..tools import TOOL_DEFINITIONS
+        """List available tools (the same prebuilt list on every call)"""
         return TOOL_DEFINITIONS
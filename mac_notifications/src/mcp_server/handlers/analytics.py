@@ -2,12 +2,19 @@
 Analytics handlers for MCP server
 """
 
-import json
 from typing import List
 import mcp.types as types
 
+from ...config.settings import Settings
+from .common import cached_handler, make_handler, text_response
 
-async def handle_get_analytics_dashboard(server, arguments: dict) -> List[types.TextContent]:
+# Analytics results are memoized per time bucket, so their encoded
+# responses can be reused for longer than other read tools
+_cache_response = cached_handler(ttl=Settings.ANALYTICS_RESPONSE_CACHE_TTL)
+
+
+@_cache_response
+def handle_get_analytics_dashboard(server, arguments: dict) -> List[types.TextContent]:
     """Generate analytics dashboard"""
     days = arguments.get("days", 7)
     output_format = arguments.get("output_format", "html")
@@ -19,35 +26,18 @@ async def handle_get_analytics_dashboard(server, arguments: dict) -> List[types.
     elif output_format == "text" and "text" in result:
         return [types.TextContent(type="text", text=result["text"])]
     else:
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-
-async def handle_get_notification_metrics(server, arguments: dict) -> List[types.TextContent]:
-    """Get key notification metrics"""
-    days = arguments.get("days", 7)
-    result = server.get_notification_metrics(days)
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_response(result)
 
 
-async def handle_get_hourly_heatmap(server, arguments: dict) -> List[types.TextContent]:
-    """Get hourly notification heatmap"""
-    days = arguments.get("days", 7)
-    result = server.get_hourly_heatmap(days)
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+handle_get_notification_metrics = _cache_response(make_handler("get_notification_metrics", {"days": 7}))
 
+handle_get_hourly_heatmap = _cache_response(make_handler("get_hourly_heatmap", {"days": 7}))
 
-async def handle_get_app_analytics(server, arguments: dict) -> List[types.TextContent]:
-    """Get app-specific analytics"""
-    days = arguments.get("days", 7)
-    result = server.get_app_analytics(days)
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+handle_get_app_analytics = _cache_response(make_handler("get_app_analytics", {"days": 7}))
 
+handle_get_productivity_report = _cache_response(make_handler("get_productivity_report", {"days": 7}))
 
-async def handle_get_productivity_report(server, arguments: dict) -> List[types.TextContent]:
-    """Get productivity metrics"""
-    days = arguments.get("days", 7)
-    result = server.get_productivity_report(days)
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+handle_get_dashboard_bundle = _cache_response(make_handler("get_dashboard_bundle", {"days": 7}))
 
 
 # Export handlers
@@ -57,4 +47,5 @@ ANALYTICS_HANDLERS = {
     "get_hourly_heatmap": handle_get_hourly_heatmap,
     "get_app_analytics": handle_get_app_analytics,
     "get_productivity_report": handle_get_productivity_report,
+    "get_dashboard_bundle": handle_get_dashboard_bundle,
 }
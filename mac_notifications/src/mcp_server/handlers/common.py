@@ -0,0 +1,172 @@
+"""
+Shared helpers for MCP server handlers
+"""
+
+import asyncio
+import functools
+import json
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import mcp.types as types
+
+from ...config.settings import Settings
+from ...utils.cache import TTLCache
+
+
+# Output formats rendered as text rather than JSON
+FORMATTED_TYPES = frozenset({"terminal", "html", "markdown"})
+
+# Pre-rendered responses of idempotent read tools, keyed on (handler, server, args)
+_RESPONSE_CACHE = TTLCache(maxsize=Settings.RESPONSE_CACHE_SIZE, ttl=Settings.RESPONSE_CACHE_TTL)
+
+# A top-level "error" key with a value in text_response output (indent=2)
+_ERROR_KEY_RE = re.compile(r'^  "error": (?!null|false|"")', re.M)
+
+
+def _is_error_response(response: List[types.TextContent]) -> bool:
+    """Whether a handler response is a JSON payload reporting an error"""
+    return any(
+        content.text.startswith("{") and _ERROR_KEY_RE.search(content.text)
+        for content in response
+    )
+
+
+def cached_handler(ttl: float = Settings.RESPONSE_CACHE_TTL) -> Callable:
+    """Cache the TextContent list returned by an idempotent read handler
+
+    Repeated calls with identical arguments within ``ttl`` seconds skip both
+    the underlying query and JSON serialization. Calls whose arguments are
+    not hashable fall through to the wrapped handler uncached, and error
+    responses are never stored, so a transient failure is not replayed.
+
+    Args:
+        ttl: Lifetime of a cached response in seconds
+    """
+    def decorator(handler: Callable) -> Callable:
+        def make_key(server, arguments):
+            try:
+                key = (handler, id(server), tuple(sorted((arguments or {}).items())))
+                hash(key)
+            except TypeError:
+                return None
+            return key
+
+        if asyncio.iscoroutinefunction(handler):
+            @functools.wraps(handler)
+            async def async_wrapper(server, arguments: dict):
+                key = make_key(server, arguments)
+                if key is None:
+                    return await handler(server, arguments)
+
+                cached = _RESPONSE_CACHE.get(key)
+                if cached is not None:
+                    return cached
+
+                response = await handler(server, arguments)
+                if not _is_error_response(response):
+                    _RESPONSE_CACHE.set(key, response, ttl)
+                return response
+            return async_wrapper
+
+        @functools.wraps(handler)
+        def wrapper(server, arguments: dict):
+            key = make_key(server, arguments)
+            if key is None:
+                return handler(server, arguments)
+
+            cached = _RESPONSE_CACHE.get(key)
+            if cached is not None:
+                return cached
+
+            response = handler(server, arguments)
+            if not _is_error_response(response):
+                _RESPONSE_CACHE.set(key, response, ttl)
+            return response
+        return wrapper
+    return decorator
+
+
+async def run_blocking(func: Callable, *args) -> Any:
+    """Run a blocking server call in the default executor
+
+    Keeps SQLite queries and filesystem work off the event loop so other
+    MCP requests can be served concurrently. Equivalent to asyncio.to_thread,
+    which is not available on Python 3.8.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+def clear_response_cache():
+    """Drop all cached handler responses (e.g. after a write operation)"""
+    _RESPONSE_CACHE.clear()
+
+
+class DateTimeEncoder(json.JSONEncoder):
+    """JSON encoder that renders datetime objects as readable timestamps
+
+    With ``epoch=True`` datetimes are emitted as integer Unix timestamps
+    instead, which avoids a strftime call per value.
+    """
+
+    def __init__(self, *args, epoch: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.epoch = epoch
+
+    def default(self, obj, _strftime=datetime.strftime):
+        # Exact-type check first; it is a pointer comparison on the hot path
+        if obj.__class__ is datetime or isinstance(obj, datetime):
+            if self.epoch:
+                return int(obj.timestamp())
+            return _strftime(obj, '%Y-%m-%d %H:%M:%S')
+        return super().default(obj)
+
+
+def text_response(result: Any, _tc=types.TextContent, _dumps=json.dumps) -> List[types.TextContent]:
+    """Wrap a result dict as an indented JSON TextContent response"""
+    return [_tc(type="text", text=_dumps(result, indent=2))]
+
+
+def encode_json(result: Any, _dumps=json.dumps) -> str:
+    """Encode a result that may contain datetimes as indented JSON"""
+    return _dumps(result, indent=2, cls=DateTimeEncoder, epoch=Settings.JSON_EPOCH_DATETIMES)
+
+
+def make_handler(method: str, defaults: Optional[Dict[str, Any]] = None,
+                 invalidates_cache: bool = False, required: Optional[str] = None) -> Callable:
+    """Build a handler that forwards tool arguments to one server method
+
+    Most tools only read a few arguments, call a single NotificationMCPServer
+    method and return its result as JSON; they all share this one body.
+
+    Args:
+        method: Name of the server method to call
+        defaults: Tool arguments passed to the method as keywords, with defaults
+        invalidates_cache: Clear cached read responses unless ``dry_run`` is set
+        required: Argument that must be non-empty; if it is missing the handler
+            returns a prebuilt error response without calling the server
+
+    Returns:
+        Synchronous handler taking (server, arguments)
+    """
+    items = tuple((defaults or {}).items())
+    missing_response = None
+    if required:
+        missing_response = text_response({
+            "error": "Missing argument",
+            "message": f"'{required}' is required"
+        })
+
+    def handler(server, arguments: dict) -> List[types.TextContent]:
+        if required and not arguments.get(required):
+            return missing_response
+        kwargs = {key: arguments.get(key, default) for key, default in items}
+        result = getattr(server, method)(**kwargs)
+        if invalidates_cache and not kwargs.get("dry_run"):
+            clear_response_cache()
+        return text_response(result)
+
+    handler.__name__ = handler.__qualname__ = f"handle_{method}"
+    return handler
@@ -2,31 +2,21 @@
 Core MCP handlers for basic notification operations
 """
 
-import json
 import subprocess
 from typing import List
 import mcp.types as types
 
+from .common import FORMATTED_TYPES, make_handler, text_response
 
-async def handle_start_notification_monitoring(server, arguments: dict) -> List[types.TextContent]:
-    """Start the notification daemon"""
-    result = server.start_daemon()
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
 
+handle_start_notification_monitoring = make_handler("start_daemon")
 
-async def handle_stop_notification_monitoring(server, arguments: dict) -> List[types.TextContent]:
-    """Stop the notification daemon"""
-    result = server.stop_daemon()
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+handle_stop_notification_monitoring = make_handler("stop_daemon")
 
+handle_check_daemon_status = make_handler("_check_daemon_status")
 
-async def handle_check_daemon_status(server, arguments: dict) -> List[types.TextContent]:
-    """Check daemon status"""
-    status = server._check_daemon_status()
-    return [types.TextContent(type="text", text=json.dumps(status, indent=2))]
 
-
-async def handle_get_recent_notifications(server, arguments: dict) -> List[types.TextContent]:
+def handle_get_recent_notifications(server, arguments: dict) -> List[types.TextContent]:
     """Get recent notifications"""
     limit = arguments.get("limit", 10)
     priority_filter = arguments.get("priority_filter", None)
@@ -34,34 +24,31 @@ async def handle_get_recent_notifications(server, arguments: dict) -> List[types
     sort_by = arguments.get("sort_by", "priority")
     
     # For terminal format, get the formatted output
-    if format_type in ["terminal", "html", "markdown"]:
+    if format_type in FORMATTED_TYPES:
         formatted = server.get_formatted_notifications(limit, priority_filter, format_type, sort_by)
         return [types.TextContent(type="text", text=formatted)]
     else:
         # Return raw JSON data
         result = server.get_recent_notifications(limit, priority_filter, use_templates=False, sort_by=sort_by)
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_response(result)
 
 
-async def handle_get_priority_notifications(server, arguments: dict) -> List[types.TextContent]:
+def handle_get_priority_notifications(server, arguments: dict) -> List[types.TextContent]:
     """Get high priority notifications"""
     format_type = arguments.get("format", "terminal")
     
-    if format_type in ["terminal", "html", "markdown"]:
+    if format_type in FORMATTED_TYPES:
         formatted = server.get_formatted_notifications(20, "important", format_type)
         return [types.TextContent(type="text", text=formatted)]
     else:
         result = server.get_priority_notifications(format_type="json")
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_response(result)
 
 
-async def handle_get_notification_stats(server, arguments: dict) -> List[types.TextContent]:
-    """Get notification statistics"""
-    result = server.get_statistics()
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+handle_get_notification_stats = make_handler("get_statistics")
 
 
-async def handle_create_test_notification(server, arguments: dict) -> List[types.TextContent]:
+def handle_create_test_notification(server, arguments: dict) -> List[types.TextContent]:
     """Create a test notification using AppleScript"""
     title = arguments.get("title", "Test Notification")
     subtitle = arguments.get("subtitle", "MCP Server Test")
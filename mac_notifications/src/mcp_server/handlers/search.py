@@ -2,24 +2,21 @@
 Search and filtering handlers for MCP server
 """
 
-import json
 from typing import List
-from datetime import datetime
 import mcp.types as types
 
+from .common import (
+    FORMATTED_TYPES, cached_handler, encode_json, make_handler, run_blocking
+)
 
-async def handle_get_notifications_by_keyword(server, arguments: dict) -> List[types.TextContent]:
-    """Search notifications by keyword"""
-    keyword = arguments.get("keyword", "")
-    result = server.search_notifications(keyword=keyword)
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
 
+handle_get_notifications_by_keyword = cached_handler()(
+    make_handler("search_notifications", {"keyword": ""}, required="keyword")
+)
 
-async def handle_search_notifications_by_app(server, arguments: dict) -> List[types.TextContent]:
-    """Search notifications by app"""
-    app = arguments.get("app", "")
-    result = server.search_notifications(app=app)
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+handle_search_notifications_by_app = cached_handler()(
+    make_handler("search_notifications", {"app": ""}, required="app")
+)
 
 
 async def handle_enhanced_search(server, arguments: dict) -> List[types.TextContent]:
@@ -28,19 +25,12 @@ async def handle_enhanced_search(server, arguments: dict) -> List[types.TextCont
     limit = arguments.get("limit", 50)
     format_type = arguments.get("format", "terminal")
     
-    result = server.enhanced_search(query, limit, format_type)
+    result = await run_blocking(server.enhanced_search, query, limit, format_type)
     
-    if format_type in ["terminal", "html", "markdown"] and 'formatted_output' in result:
+    if format_type in FORMATTED_TYPES and 'formatted_output' in result:
         return [types.TextContent(type="text", text=result['formatted_output'])]
     else:
-        # Custom JSON encoder to handle datetime objects
-        class DateTimeEncoder(json.JSONEncoder):
-            def default(self, obj):
-                if isinstance(obj, datetime):
-                    return obj.strftime('%Y-%m-%d %H:%M:%S')
-                return super(DateTimeEncoder, self).default(obj)
-        
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2, cls=DateTimeEncoder))]
+        return [types.TextContent(type="text", text=encode_json(result))]
 
 
 async def handle_get_grouped_notifications(server, arguments: dict) -> List[types.TextContent]:
@@ -50,16 +40,10 @@ async def handle_get_grouped_notifications(server, arguments: dict) -> List[type
     min_group_size = arguments.get("min_group_size", 2)
     format_type = arguments.get("format", "terminal")
     
-    result = server.get_grouped_notifications(hours, time_window, min_group_size, format_type)
-    
-    # Custom JSON encoder to handle datetime objects
-    class DateTimeEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, datetime):
-                return obj.strftime('%Y-%m-%d %H:%M:%S')
-            return super(DateTimeEncoder, self).default(obj)
-    
-    return [types.TextContent(type="text", text=json.dumps(result, indent=2, cls=DateTimeEncoder))]
+    result = await run_blocking(
+        server.get_grouped_notifications, hours, time_window, min_group_size, format_type
+    )
+    return [types.TextContent(type="text", text=encode_json(result))]
 
 
 # Export handlers
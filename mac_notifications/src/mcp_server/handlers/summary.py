@@ -2,10 +2,11 @@
 Smart summary handlers for MCP server
 """
 
-import json
-from typing import List
+from typing import List, Optional
 import mcp.types as types
 
+from .common import cached_handler, run_blocking, text_response
+
 
 async def handle_get_smart_summary(server, arguments: dict) -> List[types.TextContent]:
     """Generate a smart summary of notifications"""
@@ -13,54 +14,61 @@ async def handle_get_smart_summary(server, arguments: dict) -> List[types.TextCo
     detail_level = arguments.get("detail_level", "standard")
     focus_apps = arguments.get("focus_apps", None)
     
-    result = server.get_smart_summary(time_range, detail_level, focus_apps)
+    result = await run_blocking(server.get_smart_summary, time_range, detail_level, focus_apps)
     
     # Return just the summary text for better readability
     if "summary" in result and not result.get("error"):
         output = result["summary"]
         if result.get("recommendations"):
-            output += "\n\n**Recommendations:**"
-            for rec in result["recommendations"]:
-                output += f"\n• {rec}"
+            output += "\n\n**Recommendations:**\n• " + "\n• ".join(map(str, result["recommendations"]))
         return [types.TextContent(type="text", text=output)]
     else:
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_response(result)
 
 
-async def handle_get_hourly_digest(server, arguments: dict) -> List[types.TextContent]:
+@cached_handler()
+def handle_get_hourly_digest(server, arguments: Optional[dict] = None) -> List[types.TextContent]:
     """Get a quick hourly digest"""
     result = server.get_hourly_digest()
     
-    if "summary" in result and not result.get("error"):
-        return [types.TextContent(type="text", text=result["summary"])]
-    else:
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+    # Plain summary text needs no JSON encoding
+    text = result.get("summary")
+    if text and not result.get("error"):
+        return [types.TextContent(type="text", text=text)]
+    return text_response(result)
 
 
-async def handle_get_daily_digest(server, arguments: dict) -> List[types.TextContent]:
+def handle_get_daily_digest(server, arguments: Optional[dict] = None) -> List[types.TextContent]:
     """Get comprehensive daily digest"""
     result = server.get_daily_digest()
     
     if "summary" in result and not result.get("error"):
         output = result["summary"]
         if result.get("patterns"):
-            output += "\n\n**Patterns & Insights:**"
-            for pattern in result["patterns"]:
-                output += f"\n• {pattern}"
+            output += "\n\n**Patterns & Insights:**\n• " + "\n• ".join(map(str, result["patterns"]))
         return [types.TextContent(type="text", text=output)]
     else:
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_response(result)
 
 
-async def handle_get_executive_brief(server, arguments: dict) -> List[types.TextContent]:
+@cached_handler()
+def handle_get_executive_brief(server, arguments: Optional[dict] = None) -> List[types.TextContent]:
     """Get ultra-brief executive summary"""
     result = server.get_executive_brief()
     
-    if "summary" in result and not result.get("error"):
-        return [types.TextContent(type="text", text=result["summary"])]
-    else:
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+    # Plain summary text needs no JSON encoding
+    text = result.get("summary")
+    if text and not result.get("error"):
+        return [types.TextContent(type="text", text=text)]
+    return text_response(result)
+
 
+# Digest tools take no arguments; the dispatcher passes None to them
+NO_ARGUMENT_SUMMARY_TOOLS = frozenset({
+    "get_hourly_digest",
+    "get_daily_digest",
+    "get_executive_brief",
+})
 
 # Export handlers
 SUMMARY_HANDLERS = {
@@ -3,19 +3,22 @@
 Main MCP Server implementation for Mac Notifications
 """
 
-import json
+import copy
+import functools
 import logging
-import sqlite3
 import os
-from datetime import datetime
+import re
+import signal
+import threading
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import subprocess
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 # MCP imports
 from mcp.server import Server
-import mcp.server.stdio
 import mcp.types as types
 
 # Import configuration
@@ -24,7 +27,11 @@ from ..config.settings import Settings
 # Import database models and repositories
 from ..database.models import Notification
 from ..database.connection import get_db_connection
-from ..database.repositories import NotificationRepository, DaemonMetadataRepository
+from ..database.pool import SQLiteConnectionPool
+
+# Import utilities
+from ..utils.cache import TTLCache
+from ..database.repositories import NotificationRepository, DaemonMetadataRepository, to_epoch
 
 # Import features
 from ..features.templates import NotificationTemplates
@@ -33,12 +40,35 @@ from ..features.enhanced_search import EnhancedSearch
 from ..features.grouping import NotificationGrouper
 from ..features.batch_actions import BatchActions
 from ..features.smart_summaries import SmartSummaryGenerator
-from ..features.analytics import NotificationAnalytics
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# "older_than" batch selection, e.g. "7d", "24h", "2w", "1m"
+_OLDER_THAN_RE = re.compile(r'(\d+)([hdwm])')
+_UNIT_DAYS = {'h': 1 / 24, 'd': 1, 'w': 7, 'm': 30}
+
+# Script names identifying daemon processes (current and legacy); pgrep
+# takes a POSIX ERE, which has no non-capturing groups
+_DAEMON_CMDLINE_RE = re.compile(r'notification_daemon(?:_v2)?\.py')
+_DAEMON_PGREP_PATTERN = r'notification_daemon(_v2)?\.py'
+
+# Priority levels accepted by batch_update_priority, as stored in the database
+_PRIORITY_TO_NUM = {'CRITICAL': 1, 'HIGH': 2, 'MEDIUM': 3, 'LOW': 4}
+
+# Seconds a smart summary stays fresh, by time range; longer windows change slower
+_SUMMARY_CACHE_TTLS = {'1h': 60, '4h': 240, '24h': 900}
+
+
+def _request_scoped(method):
+    """Run a public server method inside a request clock scope"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._request_scope():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class NotificationMCPServer:
     """MCP Server for accessing notifications from the daemon database"""
@@ -57,6 +87,23 @@ class NotificationMCPServer:
         self.db_connection = get_db_connection(self.db_path)
         self.notification_repo = NotificationRepository(self.db_connection)
         self.metadata_repo = DaemonMetadataRepository(self.db_connection)
+        self._pool = SQLiteConnectionPool(self.db_path, min_size=2, max_size=10)
+        
+        # Daemon status is polled by nearly every tool; keep it for a moment
+        self._status_cache = TTLCache(maxsize=1, ttl=self.settings.DAEMON_STATUS_CACHE_TTL)
+        
+        # Batch selections resolved to notification IDs
+        self._selection_cache = TTLCache(maxsize=64, ttl=self.settings.BATCH_SELECTION_CACHE_TTL)
+        
+        # Per-thread "now" shared by all helpers serving one request
+        self._request_clock = threading.local()
+        
+        # Smart summaries, keyed by (time_range, detail_level, focus_apps)
+        self._summary_cache = TTLCache(maxsize=32, ttl=60)
+        
+        # Analytics results per (method, window); windows end on bucket boundaries
+        self._analytics_bucket = self.settings.ANALYTICS_BUCKET_MINUTES * 60
+        self._analytics_cache = TTLCache(maxsize=32, ttl=self._analytics_bucket)
         
         # Initialize feature components
         self.templates = NotificationTemplates()
@@ -65,16 +112,79 @@ class NotificationMCPServer:
         self.grouper = NotificationGrouper()
         self.batch_actions = BatchActions(self.db_path)
         self.summary_generator = SmartSummaryGenerator(self.db_path)
-        self.analytics = NotificationAnalytics(self.db_path)
+        self._precomputer = None
+    
+    @functools.cached_property
+    def analytics(self):
+        """Analytics engine, imported and built on first use
+        
+        Only the analytics tools and the precompute thread need it, so
+        server startup does not pay for loading the module.
+        """
+        from ..features.analytics import NotificationAnalytics
+        return NotificationAnalytics(self.db_path)
+        
+    def _get_connection(self):
+        """Borrow a pooled database connection (row factory set)
+        
+        Use as a context manager; the connection returns to the pool on exit.
+        """
+        return self._pool.get_connection()
+    
+    @contextmanager
+    def _read_transaction(self):
+        """Borrow a pooled connection wrapped in one deferred read transaction
+        
+        Repository reads passed this connection share a single snapshot and
+        a single schema/WAL check instead of opening a connection each.
+        """
+        with self._get_connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.execute("COMMIT")
+    
+    @contextmanager
+    def _request_scope(self):
+        """Fix the current time for the duration of one request
         
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        Handlers run concurrently in executor threads, so the clock is kept
+        per thread. Nested scopes reuse the outermost request's time.
+        """
+        clock = self._request_clock
+        if getattr(clock, "now", None) is not None:
+            yield
+            return
+        clock.now = datetime.now()
+        try:
+            yield
+        finally:
+            clock.now = None
+    
+    def _now(self) -> datetime:
+        """Current request's time, or the wall clock outside a request scope"""
+        return getattr(self._request_clock, "now", None) or datetime.now()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool metrics (open, idle, active, waits)"""
+        return self._pool.get_stats()
     
     def _check_daemon_status(self) -> Dict[str, Any]:
-        """Check if the daemon database exists and get its status"""
+        """Check if the daemon database exists and get its status
+        
+        The result is cached for DAEMON_STATUS_CACHE_TTL seconds so that the
+        several checks made while serving one request cost a single lookup.
+        """
+        status = self._status_cache.get("status")
+        if status is None:
+            status = self._read_daemon_status()
+            self._status_cache.set("status", status)
+        return status
+    
+    def _read_daemon_status(self) -> Dict[str, Any]:
+        """Read the daemon status from the database, bypassing the cache"""
         if not os.path.exists(self.db_path):
             return {
                 "database_exists": False,
@@ -94,7 +204,7 @@ class NotificationMCPServer:
                 }
             
             last_update = datetime.fromisoformat(last_update_str)
-            time_since_update = (datetime.now() - last_update).total_seconds()
+            time_since_update = (self._now() - last_update).total_seconds()
             
             # Consider daemon running if updated within configured interval
             daemon_running = time_since_update < self.settings.DAEMON_UPDATE_INTERVAL
@@ -115,6 +225,7 @@ class NotificationMCPServer:
                 "message": "Error checking daemon status"
             }
     
+    @_request_scoped
     def get_recent_notifications(self, limit: int = 10, priority_filter: Optional[str] = None, 
                                format_type: str = 'terminal', use_templates: bool = True,
                                sort_by: str = 'priority') -> Dict[str, Any]:
@@ -129,33 +240,19 @@ class NotificationMCPServer:
             }
         
         try:
-            # Get notifications using repository
-            if priority_filter == 'important':
-                notifications = self.notification_repo.get_important(limit)
-            elif priority_filter:
-                notifications = self.notification_repo.get_by_priority(priority_filter, limit)
-            else:
-                notifications = self.notification_repo.get_recent(limit)
-            
-            # Convert to MCP format
-            mcp_notifications = []
-            formatted_notifications = []
-            
-            for notification in notifications:
-                mcp_notif = notification.to_mcp_format()
-                mcp_notifications.append(mcp_notif)
+            # Get notifications and statistics from one read transaction
+            with self._read_transaction() as conn:
+                if priority_filter == 'important':
+                    notifications = self.notification_repo.get_important(limit, conn=conn)
+                elif priority_filter:
+                    notifications = self.notification_repo.get_by_priority(priority_filter, limit, conn=conn)
+                else:
+                    notifications = self.notification_repo.get_recent(limit, conn=conn)
                 
-                # Format using templates if requested
-                if use_templates:
-                    template_output = self.templates.format_notification(
-                        mcp_notif, 
-                        use_color=False,  # No color in JSON responses
-                        format_type=format_type
-                    )
-                    formatted_notifications.append(template_output)
+                stats = self.notification_repo.get_statistics(conn=conn)
             
-            # Get statistics
-            stats = self.notification_repo.get_statistics()
+            # Convert to MCP format
+            mcp_notifications = [n.to_mcp_format() for n in notifications]
             
             result = {
                 "total_stored": stats.get('total', 0),
@@ -164,8 +261,17 @@ class NotificationMCPServer:
                 "daemon_status": status
             }
             
-            if formatted_notifications:
-                result["formatted_output"] = "\n\n".join(formatted_notifications)
+            # Format using templates if requested, joining rendered items directly;
+            # JSON callers only read the structured notifications
+            if use_templates and format_type != 'json' and mcp_notifications:
+                result["formatted_output"] = "\n\n".join(
+                    self.templates.format_notification(
+                        mcp_notif, 
+                        use_color=False,  # No color in JSON responses
+                        format_type=format_type
+                    )
+                    for mcp_notif in mcp_notifications
+                )
             
             if 'by_priority' in stats:
                 result["priority_breakdown"] = stats['by_priority']
@@ -179,15 +285,18 @@ class NotificationMCPServer:
                 "daemon_status": status
             }
     
+    @_request_scoped
     def get_priority_notifications(self, format_type: str = 'terminal') -> Dict[str, Any]:
         """Get high priority notifications with formatting"""
         return self.get_recent_notifications(limit=20, priority_filter='important', 
                                            format_type=format_type, use_templates=True)
     
+    @_request_scoped
     def get_formatted_notifications(self, limit: int = 10, priority_filter: str = None,
                                   format_type: str = 'terminal', sort_by: str = 'priority') -> str:
         """Get notifications formatted as HTML, Markdown, or Terminal output"""
-        result = self.get_recent_notifications(limit, priority_filter, format_type, use_templates=True, sort_by=sort_by)
+        # The list is re-rendered below, so skip per-notification templating
+        result = self.get_recent_notifications(limit, priority_filter, format_type, use_templates=False, sort_by=sort_by)
         
         if 'error' in result:
             return f"Error: {result['error']}"
@@ -201,6 +310,7 @@ class NotificationMCPServer:
         else:
             return self.templates.format_notification_list(notifications, format_type='terminal', use_color=True)
     
+    @_request_scoped
     def search_notifications(self, keyword: str = None, app: str = None) -> Dict[str, Any]:
         """Search notifications by keyword or app"""
         status = self._check_daemon_status()
@@ -214,10 +324,10 @@ class NotificationMCPServer:
         
         try:
             # Use repository for search
-            notifications = self.notification_repo.search(keyword, app)
+            rows = self.notification_repo.search(keyword, app, raw=True)
             
-            # Convert to MCP format
-            mcp_notifications = [n.to_mcp_format() for n in notifications]
+            # Convert rows straight to MCP format
+            mcp_notifications = Notification.rows_to_mcp(rows)
             
             result = {
                 "total_found": len(mcp_notifications),
@@ -239,6 +349,7 @@ class NotificationMCPServer:
                 "daemon_status": status
             }
     
+    @_request_scoped
     def get_statistics(self) -> Dict[str, Any]:
         """Get notification statistics including priority breakdown"""
         status = self._check_daemon_status()
@@ -251,11 +362,13 @@ class NotificationMCPServer:
             }
         
         try:
-            # Get statistics from repository
-            stats = self.notification_repo.get_statistics()
-            
-            # Get metadata
-            metadata = self.metadata_repo.get_all()
+            # Statistics, metadata and top notifications from one read transaction
+            with self._read_transaction() as conn:
+                stats = self.notification_repo.get_statistics(conn=conn)
+                metadata = self.metadata_repo.get_all(conn=conn)
+                top_notifications = self.notification_repo.get_top_by_priorities(
+                    ['CRITICAL', 'HIGH'], limit=10, conn=conn
+                )
             
             result = {
                 "total": stats.get('total', 0),
@@ -271,19 +384,17 @@ class NotificationMCPServer:
             if 'by_priority' in stats:
                 result["priority_breakdown"] = stats['by_priority']
             
-            # Get top priority notifications using repository
-            high_priority = self.notification_repo.get_by_priority('HIGH', limit=10)
-            critical = self.notification_repo.get_by_priority('CRITICAL', limit=10)
-            
-            top_priority = []
-            for notif in (critical + high_priority)[:10]:
-                top_priority.append({
+            # Top priority notifications, already limited to 10 by the query
+            top_priority = [
+                {
                     'app': notif.app_identifier,
                     'title': notif.title or 'No title',
                     'score': notif.priority_score,
                     'level': notif.priority_level,
                     'time': notif.delivered_time
-                })
+                }
+                for notif in top_notifications
+            ]
             
             if top_priority:
                 result["top_priority_notifications"] = top_priority
@@ -299,6 +410,7 @@ class NotificationMCPServer:
     
     def start_daemon(self) -> Dict[str, Any]:
         """Start the notification daemon as a subprocess"""
+        self._status_cache.clear()
         try:
             # Check if daemon is already running
             status = self._check_daemon_status()
@@ -322,30 +434,36 @@ class NotificationMCPServer:
             # Start the daemon with the new module
             daemon_path = Path(__file__).parent.parent / "daemon" / "notification_daemon.py"
             
-            self.daemon_process = subprocess.Popen(
-                [sys.executable, str(daemon_path), "--db", self.db_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            # Send output to log files; a chatty daemon could otherwise fill
+            # an unread pipe and block
+            log_dir = os.path.join(os.path.dirname(self.db_path), "logs")
+            os.makedirs(log_dir, exist_ok=True)
+            out_log = os.path.join(log_dir, "daemon.out.log")
+            err_log = os.path.join(log_dir, "daemon.err.log")
             
-            # Wait a moment for it to start
-            import time
-            time.sleep(2)
+            # close_fds=False lets CPython launch via posix_spawn instead of
+            # fork+exec; our descriptors are non-inheritable (PEP 446) anyway
+            with open(out_log, "wb") as stdout, open(err_log, "wb") as stderr:
+                self.daemon_process = subprocess.Popen(
+                    [sys.executable, str(daemon_path), "--db", self.db_path],
+                    stdout=stdout,
+                    stderr=stderr,
+                    close_fds=False
+                )
             
             # Check if it's running
-            if self.daemon_process.poll() is None:
+            if self._wait_for_daemon_start(self.daemon_process):
                 return {
                     "success": True,
                     "message": "Daemon started successfully",
                     "pid": self.daemon_process.pid
                 }
             else:
-                stdout, stderr = self.daemon_process.communicate()
                 return {
                     "success": False,
                     "message": "Daemon failed to start",
-                    "stdout": stdout.decode(),
-                    "stderr": stderr.decode()
+                    "stdout": self._read_log_tail(out_log),
+                    "stderr": self._read_log_tail(err_log)
                 }
                 
         except Exception as e:
@@ -354,8 +472,48 @@ class NotificationMCPServer:
                 "message": f"Error starting daemon: {str(e)}"
             }
     
+    @staticmethod
+    def _read_log_tail(path: str, size: int = 4096) -> str:
+        """Read at most the last ``size`` bytes of a log file"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return ""
+        try:
+            if os.fstat(fd).st_size > size:
+                os.lseek(fd, -size, os.SEEK_END)
+            return os.read(fd, size).decode(errors="replace")
+        finally:
+            os.close(fd)
+    
+    def _wait_for_daemon_start(self, process: subprocess.Popen, timeout: float = 2.0) -> bool:
+        """Wait until a freshly launched daemon is up, polling with backoff
+        
+        Returns as soon as the daemon has written its PID file, instead of
+        always sleeping for the full timeout.
+        
+        Returns:
+            bool: True if the process is running, False if it exited
+        """
+        import time
+        deadline = time.monotonic() + timeout
+        delay = 0.025
+        
+        while True:
+            if process.poll() is not None:
+                return False
+            if self._read_daemon_pid_file() == process.pid:
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return process.poll() is None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.4)
+    
     def stop_daemon(self) -> Dict[str, Any]:
         """Stop the notification daemon"""
+        self._status_cache.clear()
         try:
             if self.daemon_process and self.daemon_process.poll() is None:
                 self.daemon_process.terminate()
@@ -377,46 +535,169 @@ class NotificationMCPServer:
     
     def _kill_existing_daemons(self):
         """Kill any existing daemon processes"""
-        try:
-            import psutil
-            killed_count = 0
-            daemon_names = ['notification_daemon.py', 'notification_daemon_v2.py']
-            
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline')
-                    if cmdline and any(daemon_name in ' '.join(cmdline) for daemon_name in daemon_names):
-                        pid = proc.info['pid']
-                        logger.info(f"Found existing daemon process PID {pid}, terminating...")
-                        proc.terminate()
-                        try:
-                            proc.wait(timeout=5)
-                        except psutil.TimeoutExpired:
-                            logger.warning(f"Force killing PID {pid}")
-                            proc.kill()
-                            proc.wait()
-                        killed_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-                    
-            if killed_count > 0:
-                logger.info(f"Killed {killed_count} existing daemon process(es)")
-                # Wait for database lock to release
-                import time
-                time.sleep(2)
-                
-        except ImportError:
-            logger.warning("psutil not available, cannot check for existing daemons")
-            # Try to kill using the stored process if available
+        pids = self._find_daemon_pids()
+        
+        if pids is None:
+            # No way to look up processes; at least stop the one we started
             if self.daemon_process:
                 try:
                     self.daemon_process.terminate()
                     self.daemon_process.wait(timeout=5)
                 except:
                     pass
+            return
+        
+        killed_count = 0
+        for pid in pids:
+            logger.info(f"Found existing daemon process PID {pid}, terminating...")
+            if self._terminate_pid(pid):
+                killed_count += 1
+        
+        if killed_count > 0:
+            logger.info(f"Killed {killed_count} existing daemon process(es)")
+            # Wait for database lock to release
+            import time
+            time.sleep(2)
+    
+    def _find_daemon_pids(self) -> Optional[List[int]]:
+        """Find running daemon processes, cheapest method first
+        
+        1. The PID file the daemon writes next to the database
+        2. A single native ``pgrep -f`` scan
+        3. A psutil scan over all processes
+        
+        Returns:
+            List of daemon PIDs, or None if no lookup method is available
+        """
+        own_pid = os.getpid()
+        
+        pid = self._read_daemon_pid_file()
+        if pid is not None and pid != own_pid and self._is_daemon_pid(pid):
+            return [pid]
+        
+        try:
+            result = subprocess.run(
+                ['pgrep', '-f', _DAEMON_PGREP_PATTERN],
+                capture_output=True, text=True, timeout=5
+            )
+            # pgrep exits 1 when nothing matched
+            if result.returncode in (0, 1):
+                return [int(p) for p in result.stdout.split() if int(p) != own_pid]
+        except (OSError, subprocess.SubprocessError, ValueError):
+            pass
+        
+        try:
+            import psutil
+        except ImportError:
+            logger.warning("Neither pgrep nor psutil available, cannot check for existing daemons")
+            return None
+        
+        pids = []
+        for proc in psutil.process_iter(['pid', 'cmdline']):
+            try:
+                cmdline = proc.info.get('cmdline')
+                if cmdline and proc.info['pid'] != own_pid and any(
+                    _DAEMON_CMDLINE_RE.search(arg) for arg in cmdline
+                ):
+                    pids.append(proc.info['pid'])
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return pids
+    
+    def _read_daemon_pid_file(self) -> Optional[int]:
+        """Read the daemon PID file, returning None if missing or invalid"""
+        pid_file = os.path.join(os.path.dirname(self.db_path), "notification_daemon.pid")
+        try:
+            with open(pid_file) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _is_daemon_pid(pid: int) -> bool:
+        """Check that a PID is alive and still belongs to the daemon
+        
+        Guards against a stale PID file whose PID was reused by another process.
+        """
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        
+        try:
+            result = subprocess.run(
+                ['ps', '-o', 'command=', '-p', str(pid)],
+                capture_output=True, text=True, timeout=5
+            )
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return _DAEMON_CMDLINE_RE.search(result.stdout) is not None
+    
+    @staticmethod
+    def _terminate_pid(pid: int, timeout: float = 5.0) -> bool:
+        """Send SIGTERM, escalating to SIGKILL if the process outlives timeout
+        
+        Returns:
+            bool: True if a signal was delivered
+        """
+        import time
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            logger.warning(f"Not permitted to terminate PID {pid}")
+            return False
+        
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                # Reap it if it is our own child, otherwise it lingers as a zombie
+                if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                    return True
+            except ChildProcessError:
+                pass
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+            time.sleep(0.1)
+        
+        logger.warning(f"Force killing PID {pid}")
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        return True
     
     def _get_notification_ids_for_batch(self, selection_type: str, selection_value: Any) -> List[int]:
-        """Get notification IDs based on selection criteria"""
+        """Get notification IDs based on selection criteria
+        
+        Resolved selections are cached briefly so a workflow that previews a
+        selection and then acts on it (or runs several actions on it) only
+        queries once. Actions that can drop IDs from a selection clear it.
+        """
+        if selection_type == "ids":
+            return self._resolve_notification_ids(selection_type, selection_value)
+        
+        try:
+            key = (selection_type, tuple(selection_value) if isinstance(selection_value, list) else selection_value)
+            hash(key)
+        except TypeError:
+            return self._resolve_notification_ids(selection_type, selection_value)
+        
+        ids = self._selection_cache.get(key)
+        if ids is None:
+            ids = self._resolve_notification_ids(selection_type, selection_value)
+            if ids is not None:
+                self._selection_cache.set(key, tuple(ids))
+            return ids
+        return list(ids)
+    
+    def _resolve_notification_ids(self, selection_type: str, selection_value: Any) -> List[int]:
+        """Resolve selection criteria to notification IDs (uncached)"""
         if selection_type == "ids":
             # Direct list of IDs
             return selection_value if isinstance(selection_value, list) else [selection_value]
@@ -435,33 +716,22 @@ class NotificationMCPServer:
         
         elif selection_type == "older_than":
             # Parse time string (e.g., "7d", "24h")
-            import re
-            match = re.match(r'(\d+)([hdwm])', selection_value.lower())
+            match = _OLDER_THAN_RE.match(selection_value.lower())
             if match:
                 value, unit = match.groups()
-                value = int(value)
-                if unit == 'h':
-                    days = value / 24
-                elif unit == 'd':
-                    days = value
-                elif unit == 'w':
-                    days = value * 7
-                elif unit == 'm':
-                    days = value * 30
-                else:
-                    days = 7  # Default
-                return self.batch_actions.select_by_time_range(older_than_days=int(days))
+                days = int(int(value) * _UNIT_DAYS[unit])
+                return self.batch_actions.select_by_time_range(older_than_days=days)
         
         elif selection_type == "search":
             # Use enhanced search to get IDs
             with self._get_connection() as conn:
-                search_results = self.search_engine.search(selection_value, conn, limit=1000)
-                return [n.get('rec_id', n.get('id')) for n in search_results.get('notifications', [])]
+                return self.search_engine.search_ids(selection_value, conn, limit=1000)
         
         else:
             raise ValueError(f"Unknown selection type: {selection_type}")
     
     # Placeholder methods for features to be migrated
+    @_request_scoped
     def enhanced_search(self, query: str, limit: int = 50, format_type: str = 'terminal') -> Dict[str, Any]:
         """Execute enhanced natural language search"""
         status = self._check_daemon_status()
@@ -499,6 +769,7 @@ class NotificationMCPServer:
                 "daemon_status": status
             }
     
+    @_request_scoped
     def get_grouped_notifications(self, hours: int = 4, time_window: int = 30, 
                                  min_group_size: int = 2, format_type: str = 'terminal') -> Dict[str, Any]:
         """Get notifications grouped by similarity"""
@@ -513,18 +784,15 @@ class NotificationMCPServer:
         
         try:
             # Get recent notifications
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            notifications = self.notification_repo.get_since(cutoff_time.strftime('%Y-%m-%d %H:%M:%S'))
-            
-            # Convert to dict format for grouper
-            notif_dicts = [n.to_mcp_format() for n in notifications]
+            cutoff_time = self._now() - timedelta(hours=hours)
+            rows = self.notification_repo.get_since_epoch(to_epoch(cutoff_time), raw=True)
             
-            # Configure grouper
-            self.grouper.config['time_window_minutes'] = time_window
-            self.grouper.config['min_group_size'] = min_group_size
+            # Convert rows straight to dict format for grouper
+            notif_dicts = Notification.rows_to_mcp(rows)
             
-            # Group notifications
-            groups = self.grouper.group_notifications(notif_dicts, time_window)
+            # Group notifications; the settings are per call because the
+            # shared grouper may be used by several executor threads at once
+            groups = self.grouper.group_notifications(notif_dicts, time_window, min_group_size)
             
             result = {
                 "total_notifications": len(notif_dicts),
@@ -548,8 +816,11 @@ class NotificationMCPServer:
                 "daemon_status": status
             }
     
+    @_request_scoped
     def batch_mark_read(self, selection_type: str, selection_value: Any, dry_run: bool = False) -> Dict[str, Any]:
         """Mark notifications as read in batch"""
+        status = self._check_daemon_status()
+        
         try:
             # Get notification IDs based on selection
             notification_ids = self._get_notification_ids_for_batch(selection_type, selection_value)
@@ -563,7 +834,7 @@ class NotificationMCPServer:
             
             # Use batch actions
             result = self.batch_actions.mark_as_read(notification_ids, dry_run)
-            result["daemon_status"] = self._check_daemon_status()
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
@@ -571,11 +842,14 @@ class NotificationMCPServer:
             return {
                 "success": False,
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def batch_mark_unread(self, selection_type: str, selection_value: Any, dry_run: bool = False) -> Dict[str, Any]:
         """Mark notifications as unread in batch"""
+        status = self._check_daemon_status()
+        
         try:
             notification_ids = self._get_notification_ids_for_batch(selection_type, selection_value)
             if not notification_ids:
@@ -586,7 +860,7 @@ class NotificationMCPServer:
                 }
             
             result = self.batch_actions.mark_as_unread(notification_ids, dry_run)
-            result["daemon_status"] = self._check_daemon_status()
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
@@ -594,11 +868,14 @@ class NotificationMCPServer:
             return {
                 "success": False,
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def batch_archive(self, selection_type: str, selection_value: Any, dry_run: bool = False) -> Dict[str, Any]:
         """Archive notifications in batch"""
+        status = self._check_daemon_status()
+        
         try:
             notification_ids = self._get_notification_ids_for_batch(selection_type, selection_value)
             if not notification_ids:
@@ -609,7 +886,10 @@ class NotificationMCPServer:
                 }
             
             result = self.batch_actions.archive_notifications(notification_ids, dry_run)
-            result["daemon_status"] = self._check_daemon_status()
+            if not dry_run:
+                # These actions can remove IDs from cached selections
+                self._selection_cache.clear()
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
@@ -617,16 +897,19 @@ class NotificationMCPServer:
             return {
                 "success": False,
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def batch_delete(self, selection_type: str, selection_value: Any, confirm: bool = False, dry_run: bool = False) -> Dict[str, Any]:
         """Delete notifications in batch"""
+        status = self._check_daemon_status()
+        
         if not confirm and not dry_run:
             return {
                 "success": False,
                 "error": "Deletion requires confirmation. Set confirm=True to proceed.",
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
         
         try:
@@ -639,7 +922,10 @@ class NotificationMCPServer:
                 }
             
             result = self.batch_actions.delete_notifications(notification_ids, dry_run)
-            result["daemon_status"] = self._check_daemon_status()
+            if not dry_run:
+                # These actions can remove IDs from cached selections
+                self._selection_cache.clear()
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
@@ -647,20 +933,22 @@ class NotificationMCPServer:
             return {
                 "success": False,
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def batch_update_priority(self, selection_type: str, selection_value: Any, new_priority: str, dry_run: bool = False) -> Dict[str, Any]:
         """Update priority for notifications in batch"""
+        status = self._check_daemon_status()
+        
         # Convert priority string to number
-        priority_map = {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 3, "LOW": 4}
-        priority_num = priority_map.get(new_priority.upper())
+        priority_num = _PRIORITY_TO_NUM.get(new_priority.upper())
         
-        if not priority_num:
+        if priority_num is None:
             return {
                 "success": False,
                 "error": f"Invalid priority level: {new_priority}. Must be CRITICAL, HIGH, MEDIUM, or LOW.",
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
         
         try:
@@ -673,7 +961,10 @@ class NotificationMCPServer:
                 }
             
             result = self.batch_actions.update_priority(notification_ids, priority_num, dry_run)
-            result["daemon_status"] = self._check_daemon_status()
+            if not dry_run:
+                # These actions can remove IDs from cached selections
+                self._selection_cache.clear()
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
@@ -681,26 +972,43 @@ class NotificationMCPServer:
             return {
                 "success": False,
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def get_smart_summary(self, time_range: str = "1h", detail_level: str = "standard", 
                          focus_apps: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Generate a smart summary of notifications"""
+        """Generate a smart summary of notifications
+        
+        Summaries are cached for a period that grows with ``time_range``, so
+        the digest tools can be polled without regenerating each time.
+        """
+        status = self._check_daemon_status()
+        
+        key = (time_range, detail_level, tuple(focus_apps or ()))
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["daemon_status"] = status
+            return result
+        
         try:
             result = self.summary_generator.generate_summary(
                 time_range=time_range,
                 detail_level=detail_level,
                 focus_apps=focus_apps
             )
-            result["daemon_status"] = self._check_daemon_status()
+            if not result.get("error"):
+                self._summary_cache.set(key, copy.deepcopy(result),
+                                        ttl=_SUMMARY_CACHE_TTLS.get(time_range, 60))
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
             logger.error(f"Error generating smart summary: {e}")
             return {
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
     def get_hourly_digest(self) -> Dict[str, Any]:
@@ -715,82 +1023,167 @@ class NotificationMCPServer:
         """Get ultra-brief executive summary"""
         return self.get_smart_summary(time_range="4h", detail_level="brief")
     
+    def start_analytics_precompute(self):
+        """Start the nightly analytics precompute thread (once)"""
+        if self._precomputer is None or not self._precomputer.is_alive():
+            from ..features.analytics import AnalyticsPrecomputer
+            self._precomputer = AnalyticsPrecomputer(
+                self.analytics,
+                hour=self.settings.ANALYTICS_PRECOMPUTE_HOUR,
+                days_options=self.settings.ANALYTICS_PRECOMPUTE_DAYS
+            )
+            self._precomputer.start()
+    
+    def _bucket_now(self) -> datetime:
+        """Current request time snapped down to an ANALYTICS_BUCKET_MINUTES boundary
+        
+        Requests within the same bucket query the same window, so their
+        results can be shared through the analytics cache.
+        """
+        ts = self._now().timestamp()
+        return datetime.fromtimestamp(ts - ts % self._analytics_bucket)
+    
+    def _analytics_bundle(self, days: int) -> Dict[str, Any]:
+        """All dashboard bundle sections for the bucketed window of ``days``, memoized
+        
+        One scan serves the metrics, heatmap, app and productivity tools, so
+        a client calling them back-to-back hits the database once.
+        """
+        end_date = self._bucket_now()
+        start_date = end_date - timedelta(days=days)
+        key = ("bundle", start_date, end_date)
+        
+        bundle = self._analytics_cache.get(key)
+        if bundle is None:
+            bundle = self.analytics.get_dashboard_bundle(start_date, end_date)
+            self._analytics_cache.set(key, bundle)
+        return bundle
+    
+    def _cached_analytics(self, method: str, days: int) -> Dict[str, Any]:
+        """Result of an analytics query over the bucketed window for ``days``
+        
+        Nightly precomputed results are used for the long windows while they
+        lag the requested window by at most ANALYTICS_PRECOMPUTE_MAX_AGE of
+        its length; otherwise the section is taken from the memoized
+        dashboard bundle.
+        """
+        end_date = self._bucket_now()
+        key = (method, end_date - timedelta(days=days), end_date)
+        
+        cached = self._analytics_cache.get(key)
+        if cached is None:
+            if days in self.settings.ANALYTICS_PRECOMPUTE_DAYS:
+                cached = self.analytics.get_precomputed(
+                    method, days, self.settings.ANALYTICS_PRECOMPUTE_MAX_NEW,
+                    timedelta(days=days) * self.settings.ANALYTICS_PRECOMPUTE_MAX_AGE,
+                    end_date
+                )
+            if cached is None:
+                cached = self._analytics_bundle(days)[self.analytics.BUNDLE_SECTIONS[method]]
+            self._analytics_cache.set(key, cached)
+        # Callers add daemon_status to the result; keep the cached copy clean
+        return copy.deepcopy(cached)
+    
+    @_request_scoped
     def get_analytics_dashboard(self, days: int = 7, output_format: str = "html") -> Dict[str, Any]:
         """Generate analytics dashboard"""
+        status = self._check_daemon_status()
+        
         try:
             result = self.analytics.get_analytics_dashboard(days, output_format)
-            result["daemon_status"] = self._check_daemon_status()
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
             logger.error(f"Error generating analytics dashboard: {e}")
             return {
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def get_notification_metrics(self, days: int = 7) -> Dict[str, Any]:
         """Get key notification metrics"""
+        status = self._check_daemon_status()
+        
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            result = self.analytics.get_key_metrics(start_date, end_date)
-            result["daemon_status"] = self._check_daemon_status()
+            result = self._cached_analytics("get_key_metrics", days)
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
             logger.error(f"Error getting notification metrics: {e}")
             return {
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def get_hourly_heatmap(self, days: int = 7) -> Dict[str, Any]:
         """Get hourly notification heatmap data"""
+        status = self._check_daemon_status()
+        
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            result = self.analytics.get_hourly_pattern(start_date, end_date)
-            result["daemon_status"] = self._check_daemon_status()
+            result = self._cached_analytics("get_hourly_pattern", days)
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
             logger.error(f"Error getting hourly heatmap: {e}")
             return {
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def get_app_analytics(self, days: int = 7) -> Dict[str, Any]:
         """Get per-app analytics"""
+        status = self._check_daemon_status()
+        
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            result = self.analytics.get_app_analytics(start_date, end_date)
-            result["daemon_status"] = self._check_daemon_status()
+            result = self._cached_analytics("get_app_analytics", days)
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
             logger.error(f"Error getting app analytics: {e}")
             return {
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
             }
     
+    @_request_scoped
     def get_productivity_report(self, days: int = 7) -> Dict[str, Any]:
         """Get productivity metrics and focus time analysis"""
+        status = self._check_daemon_status()
+        
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            result = self.analytics.get_productivity_metrics(start_date, end_date)
-            result["daemon_status"] = self._check_daemon_status()
+            result = self._cached_analytics("get_productivity_metrics", days)
+            result["daemon_status"] = status
             return result
             
         except Exception as e:
             logger.error(f"Error getting productivity report: {e}")
             return {
                 "error": str(e),
-                "daemon_status": self._check_daemon_status()
+                "daemon_status": status
+            }
+    
+    @_request_scoped
+    def get_dashboard_bundle(self, days: int = 7) -> Dict[str, Any]:
+        """Get metrics, heatmap, app analytics and productivity from one scan"""
+        status = self._check_daemon_status()
+        
+        try:
+            result = copy.deepcopy(self._analytics_bundle(days))
+            result["daemon_status"] = status
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error getting dashboard bundle: {e}")
+            return {
+                "error": str(e),
+                "daemon_status": status
             }
 
 
@@ -808,11 +1201,15 @@ async def main():
     status = notification_server._check_daemon_status()
     logger.info(f"Daemon status: {status['message']}")
     
+    # Refresh precomputed analytics nightly
+    notification_server.start_analytics_precompute()
+    
     # Import and register all handlers
     from .handlers import register_all_handlers
     register_all_handlers(server, notification_server)
     
-    # Run the MCP server
+    # Run the MCP server; the stdio transport is only needed here
+    import mcp.server.stdio
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -2,9 +2,44 @@
 Tool definitions for the MCP server
 """
 
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
 import mcp.types as types
 
 
+# Selection criteria shared by all batch tools
+_SELECTION_TYPE_PROPERTY = {
+    "type": "string", 
+    "description": "Selection method: 'app', 'app_pattern', 'priority', 'older_than', 'search', 'ids'",
+    "enum": ["app", "app_pattern", "priority", "older_than", "search", "ids"]
+}
+
+
+def _batch_schema(value_description: str, dry_run_description: str,
+                  extra_properties: Optional[Dict[str, Any]] = None,
+                  extra_required: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Build a batch tool input schema around the shared selection properties"""
+    properties = {
+        "selection_type": _SELECTION_TYPE_PROPERTY,
+        "selection_value": {
+            "type": "string", 
+            "description": value_description
+        },
+        **(extra_properties or {}),
+        "dry_run": {
+            "type": "boolean", 
+            "description": dry_run_description, 
+            "default": False
+        }
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": ["selection_type", "selection_value", *extra_required]
+    }
+
+
 # Define all available tools
 TOOL_DEFINITIONS = [
     # Core tools
@@ -114,132 +149,54 @@ TOOL_DEFINITIONS = [
     types.Tool(
         name="batch_mark_read",
         description="Mark multiple notifications as read based on selection criteria",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "selection_type": {
-                    "type": "string", 
-                    "description": "Selection method: 'app', 'app_pattern', 'priority', 'older_than', 'search', 'ids'",
-                    "enum": ["app", "app_pattern", "priority", "older_than", "search", "ids"]
-                },
-                "selection_value": {
-                    "type": "string", 
-                    "description": "Value for selection (e.g., app name, priority level, '7d' for older_than)"
-                },
-                "dry_run": {
-                    "type": "boolean", 
-                    "description": "Preview what would be affected without making changes", 
-                    "default": False
-                }
-            },
-            "required": ["selection_type", "selection_value"]
-        },
+        inputSchema=_batch_schema(
+            "Value for selection (e.g., app name, priority level, '7d' for older_than)",
+            "Preview what would be affected without making changes"
+        ),
     ),
     types.Tool(
         name="batch_mark_unread",
         description="Mark multiple notifications as unread based on selection criteria",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "selection_type": {
-                    "type": "string", 
-                    "description": "Selection method: 'app', 'app_pattern', 'priority', 'older_than', 'search', 'ids'",
-                    "enum": ["app", "app_pattern", "priority", "older_than", "search", "ids"]
-                },
-                "selection_value": {
-                    "type": "string", 
-                    "description": "Value for selection"
-                },
-                "dry_run": {
-                    "type": "boolean", 
-                    "description": "Preview what would be affected", 
-                    "default": False
-                }
-            },
-            "required": ["selection_type", "selection_value"]
-        },
+        inputSchema=_batch_schema("Value for selection", "Preview what would be affected"),
     ),
     types.Tool(
         name="batch_archive",
         description="Archive multiple notifications based on selection criteria",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "selection_type": {
-                    "type": "string", 
-                    "description": "Selection method: 'app', 'app_pattern', 'priority', 'older_than', 'search', 'ids'",
-                    "enum": ["app", "app_pattern", "priority", "older_than", "search", "ids"]
-                },
-                "selection_value": {
-                    "type": "string", 
-                    "description": "Value for selection (e.g., '30d' for notifications older than 30 days)"
-                },
-                "dry_run": {
-                    "type": "boolean", 
-                    "description": "Preview what would be archived", 
-                    "default": False
-                }
-            },
-            "required": ["selection_type", "selection_value"]
-        },
+        inputSchema=_batch_schema(
+            "Value for selection (e.g., '30d' for notifications older than 30 days)",
+            "Preview what would be archived"
+        ),
     ),
     types.Tool(
         name="batch_delete",
         description="Delete multiple notifications based on selection criteria (requires confirmation)",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "selection_type": {
-                    "type": "string", 
-                    "description": "Selection method: 'app', 'app_pattern', 'priority', 'older_than', 'search', 'ids'",
-                    "enum": ["app", "app_pattern", "priority", "older_than", "search", "ids"]
-                },
-                "selection_value": {
-                    "type": "string", 
-                    "description": "Value for selection"
-                },
+        inputSchema=_batch_schema(
+            "Value for selection",
+            "Preview what would be deleted",
+            extra_properties={
                 "confirm": {
                     "type": "boolean", 
                     "description": "Must be true to execute deletion", 
                     "default": False
-                },
-                "dry_run": {
-                    "type": "boolean", 
-                    "description": "Preview what would be deleted", 
-                    "default": False
                 }
-            },
-            "required": ["selection_type", "selection_value"]
-        },
+            }
+        ),
     ),
     types.Tool(
         name="batch_update_priority",
         description="Update priority for multiple notifications based on selection criteria",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "selection_type": {
-                    "type": "string", 
-                    "description": "Selection method: 'app', 'app_pattern', 'priority', 'older_than', 'search', 'ids'",
-                    "enum": ["app", "app_pattern", "priority", "older_than", "search", "ids"]
-                },
-                "selection_value": {
-                    "type": "string", 
-                    "description": "Value for selection"
-                },
+        inputSchema=_batch_schema(
+            "Value for selection",
+            "Preview what would be updated",
+            extra_properties={
                 "new_priority": {
                     "type": "string", 
                     "description": "New priority level: CRITICAL, HIGH, MEDIUM, or LOW",
                     "enum": ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
-                },
-                "dry_run": {
-                    "type": "boolean", 
-                    "description": "Preview what would be updated", 
-                    "default": False
                 }
             },
-            "required": ["selection_type", "selection_value", "new_priority"]
-        },
+            extra_required=("new_priority",)
+        ),
     ),
     
     # Smart summary tools
@@ -361,4 +318,21 @@ TOOL_DEFINITIONS = [
             },
         },
     ),
-]
\ No newline at end of file
+    types.Tool(
+        name="get_dashboard_bundle",
+        description="Get key metrics, hourly heatmap, app analytics and productivity report in one call",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "days": {
+                    "type": "number",
+                    "description": "Number of days to analyze",
+                    "default": 7
+                }
+            },
+        },
+    ),
+]
+
+# Read-only name -> Tool lookup
+TOOL_MAP = MappingProxyType({tool.name: tool for tool in TOOL_DEFINITIONS})
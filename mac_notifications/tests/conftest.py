@@ -2,85 +2,124 @@
 Pytest configuration and fixtures for Mac Notifications tests
 """
 
+import copy
+import os
 import pytest
-import tempfile
 import sqlite3
-from pathlib import Path
 from datetime import datetime, timedelta
 import json
 import random
+import uuid
 
 from mac_notifications.src.database.connection import DatabaseConnection
 from mac_notifications.src.database.models import Notification
+from mac_notifications.src.database.repositories import NOTIFICATIONS_FTS_DDL, NOTIFICATIONS_HOURLY_DDL
 
 
-@pytest.fixture
-def temp_db():
-    """Create a temporary database for testing"""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
+# Test database schema, run as one script
+SCHEMA_DDL = """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        rec_id INTEGER UNIQUE NOT NULL,
+        app_identifier TEXT NOT NULL,
+        delivered_time TEXT NOT NULL,
+        title TEXT,
+        subtitle TEXT,
+        body TEXT,
+        category TEXT,
+        thread TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        priority_score REAL DEFAULT 0,
+        priority_level TEXT DEFAULT 'MEDIUM',
+        priority_factors TEXT DEFAULT '[]',
+        is_read INTEGER DEFAULT 0,
+        is_archived INTEGER DEFAULT 0,
+        archived_at REAL,
+        batch_id TEXT
+    );
     
-    # Initialize schema
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    CREATE TABLE IF NOT EXISTS daemon_metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
     
-    # Create notifications table with all columns
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            rec_id INTEGER UNIQUE NOT NULL,
-            app_identifier TEXT NOT NULL,
-            delivered_time TEXT NOT NULL,
-            title TEXT,
-            subtitle TEXT,
-            body TEXT,
-            category TEXT,
-            thread TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            priority_score REAL DEFAULT 0,
-            priority_level TEXT DEFAULT 'MEDIUM',
-            priority_factors TEXT DEFAULT '[]',
-            is_read INTEGER DEFAULT 0,
-            is_archived INTEGER DEFAULT 0,
-            archived_at REAL,
-            batch_id TEXT
-        )
-    ''')
+    CREATE INDEX IF NOT EXISTS idx_delivered_time ON notifications(delivered_time DESC);
+    CREATE INDEX IF NOT EXISTS idx_app_identifier ON notifications(app_identifier);
+    CREATE INDEX IF NOT EXISTS idx_priority_score ON notifications(priority_score DESC);
+    CREATE INDEX IF NOT EXISTS idx_is_read ON notifications(is_read);
+    CREATE INDEX IF NOT EXISTS idx_archived ON notifications(is_archived);
+    CREATE INDEX IF NOT EXISTS idx_app_time ON notifications(app_identifier, delivered_time DESC);
+    CREATE INDEX IF NOT EXISTS idx_time_prio ON notifications(delivered_time DESC, priority_level);
+    CREATE INDEX IF NOT EXISTS idx_prio_time ON notifications(priority_level, delivered_time DESC);
+    CREATE INDEX IF NOT EXISTS idx_unread_time ON notifications(is_read, delivered_time DESC) WHERE is_read = 0;
+"""
+
+
+@pytest.fixture(scope="session")
+def _schema_template():
+    """Build the test schema once per session in an in-memory database"""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA_DDL)
     
-    # Create daemon metadata table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS daemon_metadata (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    # Full-text index kept in sync by triggers, as created by migration 7
+    for statement in NOTIFICATIONS_FTS_DDL:
+        conn.execute(statement)
     
-    # Create indexes
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_delivered_time ON notifications(delivered_time DESC)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_app_identifier ON notifications(app_identifier)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_priority_score ON notifications(priority_score DESC)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_is_read ON notifications(is_read)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived ON notifications(is_archived)')
+    # Trigger-maintained hourly rollup, so seeded data is aggregated as it
+    # is inserted and the analytics dashboard reads the rollup
+    for statement in NOTIFICATIONS_HOURLY_DDL:
+        conn.execute(statement)
+    
+    yield conn
     
-    conn.commit()
     conn.close()
+
+
+@pytest.fixture
+def memory_db(_schema_template):
+    """Create a private in-memory database, returned as a shared-cache URI
+    
+    Only usable through connections opened with uri=True (e.g.
+    DatabaseConnection); components that open plain paths need temp_db.
+    """
+    uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
     
-    yield db_path
+    # The database lives as long as at least one connection is open
+    keeper = sqlite3.connect(uri, uri=True)
+    _schema_template.backup(keeper)
     
-    # Cleanup
-    Path(db_path).unlink()
+    yield uri
+    
+    keeper.close()
 
 
 @pytest.fixture
-def db_connection(temp_db):
-    """Create a database connection for testing"""
-    return DatabaseConnection(temp_db)
+def temp_db(tmp_path, _schema_template):
+    """Create a temporary on-disk database for testing
+    
+    Lives in the test's own tmp_path, so parallel (xdist) workers never
+    share it and WAL/journal sidecar files are cleaned up with it.
+    """
+    db_path = str(tmp_path / "notifications.db")
+    
+    # Copy the prebuilt schema instead of re-running the DDL
+    conn = sqlite3.connect(db_path)
+    _schema_template.backup(conn)
+    conn.close()
+    
+    return db_path
 
 
 @pytest.fixture
-def sample_notifications():
-    """Provide sample notification data"""
+def db_connection(memory_db):
+    """Create a database connection for testing"""
+    return DatabaseConnection(memory_db)
+
+
+@pytest.fixture(scope="session")
+def _sample_notifications_template():
+    """Build the sample notification data once per session"""
     now = datetime.now()
     notifications = []
     
@@ -140,58 +179,70 @@ def sample_notifications():
         }
     ])
     
-    # Medium priority notifications
-    for i in range(5, 15):
-        notifications.append({
+    # Medium priority notifications (seeded so every run gets the same data)
+    rng = random.Random(0)
+    medium_ids = range(5, 15)
+    apps = rng.choices([
+        "com.apple.mail", 
+        "com.microsoft.outlook",
+        "com.slack.slack",
+        "com.apple.news"
+    ], k=len(medium_ids))
+    scores = [rng.randint(40, 60) for _ in medium_ids]
+    reads = rng.choices([0, 1], k=len(medium_ids))
+    medium_factors = json.dumps(["regular_update"])
+    notifications.extend(
+        {
             "rec_id": i,
-            "app_identifier": random.choice([
-                "com.apple.mail", 
-                "com.microsoft.outlook",
-                "com.slack.slack",
-                "com.apple.news"
-            ]),
+            "app_identifier": app,
             "title": f"Update {i}",
-            "subtitle": f"New content available",
-            "body": f"Check out the latest updates in your feed",
+            "subtitle": "New content available",
+            "body": "Check out the latest updates in your feed",
             "delivered_time": (now - timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'),
-            "priority_score": random.randint(40, 60),
+            "priority_score": score,
             "priority_level": "MEDIUM",
-            "priority_factors": json.dumps(["regular_update"]),
-            "is_read": random.choice([0, 1])
-        })
+            "priority_factors": medium_factors,
+            "is_read": is_read
+        }
+        for i, app, score, is_read in zip(medium_ids, apps, scores, reads)
+    )
     
     # Low priority notifications (security cameras)
+    low_factors = json.dumps(["routine_motion"])
     for i in range(15, 30):
+        delivered = now - timedelta(minutes=i*5)
         notifications.append({
             "rec_id": i,
             "app_identifier": "com.security.batterycam",
             "title": "Motion Detected",
             "subtitle": None,
-            "body": f"Backyard: Vehicle detected at {(now - timedelta(minutes=i*5)).strftime('%I:%M %p')}",
-            "delivered_time": (now - timedelta(minutes=i*5)).strftime('%Y-%m-%d %H:%M:%S'),
+            "body": f"Backyard: Vehicle detected at {delivered.strftime('%I:%M %p')}",
+            "delivered_time": delivered.strftime('%Y-%m-%d %H:%M:%S'),
             "priority_score": 20,
             "priority_level": "LOW",
-            "priority_factors": json.dumps(["routine_motion"]),
+            "priority_factors": low_factors,
             "is_read": 1
         })
     
-    return notifications
+    return tuple(notifications)
 
 
 @pytest.fixture
-def populated_db(temp_db, sample_notifications):
-    """Create a populated test database"""
-    conn = sqlite3.connect(temp_db)
+def sample_notifications(_sample_notifications_template):
+    """Provide sample notification data (a fresh copy tests may modify)"""
+    return copy.deepcopy(list(_sample_notifications_template))
+
+
+def _seed_populated_db(db_path: str, schema_template, sample_notifications):
+    """Write the test schema and sample notifications to a new database file"""
+    conn = sqlite3.connect(db_path)
+    schema_template.backup(conn)
+    conn.execute('PRAGMA journal_mode=MEMORY')
+    conn.execute('PRAGMA synchronous=OFF')
     cursor = conn.cursor()
     
-    # Insert sample notifications
-    for notif in sample_notifications:
-        cursor.execute('''
-            INSERT INTO notifications (
-                rec_id, app_identifier, delivered_time, title, subtitle, body,
-                priority_score, priority_level, priority_factors, is_read
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    rows = [
+        (
             notif['rec_id'],
             notif['app_identifier'],
             notif['delivered_time'],
@@ -202,27 +253,67 @@ def populated_db(temp_db, sample_notifications):
             notif.get('priority_level', 'MEDIUM'),
             notif.get('priority_factors', '[]'),
             notif.get('is_read', 0)
-        ))
+        )
+        for notif in sample_notifications
+    ]
+    metadata = [
+        ('last_update', datetime.now().isoformat()),
+        ('last_rec_id', str(len(sample_notifications))),
+    ]
     
-    # Add daemon metadata
-    cursor.execute(
-        "INSERT INTO daemon_metadata (key, value) VALUES (?, ?)",
-        ('last_update', datetime.now().isoformat())
-    )
-    cursor.execute(
-        "INSERT INTO daemon_metadata (key, value) VALUES (?, ?)",
-        ('last_rec_id', str(len(sample_notifications)))
+    # Insert sample notifications and daemon metadata in one transaction
+    cursor.execute('BEGIN')
+    cursor.executemany('''
+        INSERT INTO notifications (
+            rec_id, app_identifier, delivered_time, title, subtitle, body,
+            priority_score, priority_level, priority_factors, is_read
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    cursor.executemany(
+        "INSERT INTO daemon_metadata (key, value) VALUES (?, ?)", metadata
     )
     
     conn.commit()
+    
+    # Give the query planner statistics for the seeded data, and switch to
+    # WAL (persistent in the file) so concurrent readers never block and
+    # servers opened over it don't each try to convert the journal mode
+    conn.execute('ANALYZE')
+    conn.execute('PRAGMA journal_mode=WAL')
     conn.close()
+
+
+@pytest.fixture(scope="session")
+def populated_db(tmp_path_factory, _schema_template, _sample_notifications_template):
+    """Create a populated test database, seeded once per session
     
-    return temp_db
+    Shared by every test that requests it, so treat it as read-only (batch
+    operations must use dry_run); tests that write need temp_db. Under
+    pytest-xdist all workers share a single copy, seeded by the first
+    worker to take the lock.
+    """
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        db_path = str(tmp_path_factory.mktemp("populated") / "notifications.db")
+        _seed_populated_db(db_path, _schema_template, _sample_notifications_template)
+        return db_path
+    
+    from filelock import FileLock
+    
+    # The parent of the worker's base temp directory is common to the run
+    db_path = tmp_path_factory.getbasetemp().parent / "populated.db"
+    with FileLock(f"{db_path}.lock"):
+        if not db_path.exists():
+            _seed_populated_db(str(db_path), _schema_template, _sample_notifications_template)
+    
+    return str(db_path)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_mcp_server(populated_db):
-    """Create a mock MCP server for testing"""
+    """Create an MCP server over populated_db, shared by the whole session
+    
+    Like populated_db itself, only use it for reads and dry runs.
+    """
     from mac_notifications.src.mcp_server.server import NotificationMCPServer
     return NotificationMCPServer(populated_db)
 
@@ -6,17 +6,15 @@ import pytest
 import asyncio
 from datetime import datetime, timedelta
 
-from mac_notifications.src.mcp_server.server import NotificationMCPServer
 from mac_notifications.src.daemon.notification_daemon import NotificationDaemon
 
 
 class TestEndToEnd:
     """Test complete flow from daemon to MCP server"""
     
-    def test_notification_flow(self, populated_db):
+    def test_notification_flow(self, mock_mcp_server):
         """Test complete notification flow"""
-        # Create MCP server
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get recent notifications
         result = server.get_recent_notifications(limit=5)
@@ -34,9 +32,9 @@ class TestEndToEnd:
             assert 'priority_score' in notif
             assert 'priority_level' in notif
     
-    def test_priority_filtering(self, populated_db):
+    def test_priority_filtering(self, mock_mcp_server):
         """Test priority-based filtering"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get critical notifications
         result = server.get_recent_notifications(
@@ -48,9 +46,9 @@ class TestEndToEnd:
         for notif in result['notifications']:
             assert notif['priority_level'] == 'CRITICAL'
     
-    def test_search_integration(self, populated_db):
+    def test_search_integration(self, mock_mcp_server):
         """Test search functionality"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Search for urgent notifications
         result = server.enhanced_search("urgent", limit=10)
@@ -59,9 +57,9 @@ class TestEndToEnd:
         assert 'notifications' in result
         assert 'parsed_params' in result
     
-    def test_grouping_integration(self, populated_db):
+    def test_grouping_integration(self, mock_mcp_server):
         """Test notification grouping"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get grouped notifications
         result = server.get_grouped_notifications(
@@ -74,9 +72,9 @@ class TestEndToEnd:
         assert 'groups' in result
         assert 'total_notifications' in result
     
-    def test_batch_operations(self, populated_db):
+    def test_batch_operations(self, mock_mcp_server):
         """Test batch operations"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Test marking as read (dry run)
         result = server.batch_mark_read(
@@ -88,9 +86,9 @@ class TestEndToEnd:
         assert result['success']
         assert 'would_affect' in result or 'affected_count' in result
     
-    def test_smart_summary(self, populated_db):
+    def test_smart_summary(self, mock_mcp_server):
         """Test smart summary generation"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get hourly digest
         result = server.get_hourly_digest()
@@ -104,9 +102,9 @@ class TestEndToEnd:
         assert isinstance(result['summary'], str)
         assert len(result['summary']) > 0
     
-    def test_analytics_dashboard(self, populated_db):
+    def test_analytics_dashboard(self, mock_mcp_server):
         """Test analytics dashboard generation"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get analytics for last 7 days
         result = server.get_analytics_dashboard(days=7, output_format='json')
@@ -175,9 +173,9 @@ class TestDatabaseIntegration:
 class TestFeatureIntegration:
     """Test integration of all features"""
     
-    def test_priority_scoring_integration(self, populated_db):
+    def test_priority_scoring_integration(self, mock_mcp_server):
         """Test priority scoring is applied to notifications"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get notifications and check they have priority info
         result = server.get_recent_notifications(limit=10)
@@ -188,9 +186,9 @@ class TestFeatureIntegration:
             assert notif['priority_level'] in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
             assert 0 <= notif['priority_score'] <= 100
     
-    def test_template_formatting(self, populated_db):
+    def test_template_formatting(self, mock_mcp_server):
         """Test template formatting works"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get formatted notifications
         result = server.get_recent_notifications(
@@ -203,9 +201,9 @@ class TestFeatureIntegration:
         assert isinstance(result['formatted_output'], str)
         assert len(result['formatted_output']) > 0
     
-    def test_search_and_batch_integration(self, populated_db):
+    def test_search_and_batch_integration(self, mock_mcp_server):
         """Test search results can be used for batch operations"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Search for low priority notifications
         search_result = server.enhanced_search("priority:low", limit=100)
@@ -221,12 +219,14 @@ class TestFeatureIntegration:
             assert batch_result['success']
             assert 'would_affect' in batch_result or 'affected_count' in batch_result
     
-    def test_grouping_and_summary_integration(self, populated_db):
+    def test_grouping_and_summary_integration(self, mock_mcp_server):
         """Test grouping works with summaries"""
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
         # Get grouped notifications
         grouped = server.get_grouped_notifications(hours=24)
+        assert not grouped.get('error')
+        assert grouped['total_notifications'] > 0
         
         # Get summary for same period
         summary = server.get_smart_summary(time_range="24h")
@@ -238,45 +238,63 @@ class TestFeatureIntegration:
 class TestPerformance:
     """Performance tests"""
     
+    # Under pytest-xdist (--dist loadgroup) keep the timing tests on one worker.
+    # pytest-benchmark disables itself there (and with --benchmark-disable):
+    # each target runs once, its result is still checked, and the test is
+    # skipped before the time limit since no stats were collected
+    pytestmark = pytest.mark.xdist_group("perf")
+    
     @pytest.mark.performance
-    def test_search_performance(self, populated_db):
+    def test_search_performance(self, benchmark, mock_mcp_server):
         """Test search completes in reasonable time"""
-        import time
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
-        start = time.time()
-        result = server.enhanced_search("notifications from last week", limit=1000)
-        duration = time.time() - start
+        result = benchmark(server.enhanced_search, "notifications from last week", limit=1000)
         
-        assert duration < 1.0  # Should complete within 1 second
         assert not result.get('error')
+        
+        if benchmark.disabled:
+            pytest.skip("benchmarking is disabled, no timings to check")
+        assert benchmark.stats['min'] < 1.0  # Should complete within 1 second
     
     @pytest.mark.performance
-    def test_analytics_performance(self, populated_db):
+    def test_analytics_performance(self, benchmark, mock_mcp_server):
         """Test analytics generation performance"""
-        import time
-        server = NotificationMCPServer(populated_db)
-        
-        start = time.time()
-        result = server.get_analytics_dashboard(days=30, output_format='json')
-        duration = time.time() - start
+        server = mock_mcp_server
+        
+        # Time the queries, not hits on the server's analytics cache
+        result = benchmark.pedantic(
+            lambda: server.get_analytics_dashboard(days=30, output_format='json'),
+            setup=server._analytics_cache.clear,
+            rounds=5,
+            warmup_rounds=1
+        )
         
-        assert duration < 3.0  # Should complete within 3 seconds
         assert not result.get('error')
+        
+        if benchmark.disabled:
+            pytest.skip("benchmarking is disabled, no timings to check")
+        assert benchmark.stats['min'] < 3.0  # Should complete within 3 seconds
     
     @pytest.mark.performance
-    def test_batch_operation_performance(self, populated_db):
+    def test_batch_operation_performance(self, benchmark, mock_mcp_server):
         """Test batch operations complete efficiently"""
-        import time
-        server = NotificationMCPServer(populated_db)
+        server = mock_mcp_server
         
-        start = time.time()
-        result = server.batch_mark_read(
-            selection_type='older_than',
-            selection_value='7d',
-            dry_run=True
+        # Resolve the selection every round instead of reusing a cached one
+        result = benchmark.pedantic(
+            lambda: server.batch_mark_read(
+                selection_type='older_than',
+                selection_value='7d',
+                dry_run=True
+            ),
+            setup=server._selection_cache.clear,
+            rounds=5,
+            warmup_rounds=1
         )
-        duration = time.time() - start
         
-        assert duration < 0.5  # Should be very fast for dry run
-        assert result['success']
\ No newline at end of file
+        assert result['success']
+        
+        if benchmark.disabled:
+            pytest.skip("benchmarking is disabled, no timings to check")
+        assert benchmark.stats['min'] < 0.5  # Should be very fast for dry run
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Unit tests for the analytics module
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from mac_notifications.src.features.analytics import NotificationAnalytics
+
+
+COMPUTED_AT = datetime(2024, 1, 15, 3, 0, 0)
+
+
+def _insert_notifications(db_path, count, start, rec_id_start=1):
+    """Insert ``count`` notifications one minute apart from ``start``"""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO notifications (rec_id, app_identifier, delivered_time, title) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (rec_id_start + i, 'com.apple.mail',
+                 (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'), f"Mail {i}")
+                for i in range(count)
+            ]
+        )
+    conn.close()
+
+
+class TestPrecomputedAnalytics:
+    """Freshness and invalidation of precomputed analytics results"""
+    
+    @pytest.fixture
+    def analytics(self, temp_db):
+        """Analytics over 20 notifications, precomputed for 7 and 30 days at COMPUTED_AT"""
+        _insert_notifications(temp_db, 20, COMPUTED_AT - timedelta(days=2))
+        analytics = NotificationAnalytics(temp_db)
+        analytics.precompute((7, 30), now=COMPUTED_AT)
+        return analytics
+    
+    def test_missing_before_first_precompute(self, temp_db):
+        """Test that nothing is served before the first precompute"""
+        analytics = NotificationAnalytics(temp_db)
+        
+        assert analytics.get_precomputed("get_key_metrics", 7, now=COMPUTED_AT) is None
+    
+    def test_matches_bundle_when_fresh(self, analytics):
+        """Test that a fresh result is the matching dashboard bundle section"""
+        bundle = analytics.get_dashboard_bundle(COMPUTED_AT - timedelta(days=7), COMPUTED_AT)
+        
+        for method, section in NotificationAnalytics.BUNDLE_SECTIONS.items():
+            expected = json.loads(json.dumps(bundle[section], default=str))
+            assert analytics.get_precomputed(method, 7, now=COMPUTED_AT) == expected
+    
+    def test_window_not_precomputed(self, analytics):
+        """Test that windows that were not precomputed are not served"""
+        assert analytics.get_precomputed("get_key_metrics", 1, now=COMPUTED_AT) is None
+    
+    @pytest.mark.parametrize("days, lag_hours, fresh", [
+        (7, 16, True),    # a 7-day window may lag by a tenth: 16.8 hours
+        (7, 17, False),
+        (30, 71, True),   # a 30-day window may lag by 72 hours
+        (30, 73, False),
+    ])
+    def test_max_age_scales_with_window(self, analytics, days, lag_hours, fresh):
+        """Test that a result may lag its window by a tenth of the window length"""
+        result = analytics.get_precomputed(
+            "get_key_metrics", days, now=COMPUTED_AT + timedelta(hours=lag_hours)
+        )
+        
+        assert (result is not None) == fresh
+    
+    def test_explicit_max_age(self, analytics):
+        """Test that an explicit max_age overrides the window-based default"""
+        now = COMPUTED_AT + timedelta(hours=2)
+        
+        assert analytics.get_precomputed("get_key_metrics", 30, max_age=timedelta(hours=1), now=now) is None
+        assert analytics.get_precomputed("get_key_metrics", 30, max_age=timedelta(hours=3), now=now) is not None
+    
+    @pytest.mark.parametrize("new_count, fresh", [(5, True), (6, False)])
+    def test_invalidated_by_new_notifications(self, analytics, temp_db, new_count, fresh):
+        """Test that too many notifications since the precompute make it stale"""
+        _insert_notifications(temp_db, new_count, COMPUTED_AT + timedelta(minutes=1), rec_id_start=1000)
+        
+        result = analytics.get_precomputed(
+            "get_key_metrics", 7, max_new_notifications=5, now=COMPUTED_AT + timedelta(hours=1)
+        )
+        
+        assert (result is not None) == fresh
+    
+    def test_older_notifications_do_not_invalidate(self, analytics, temp_db):
+        """Test that only notifications newer than the precompute are counted"""
+        _insert_notifications(temp_db, 10, COMPUTED_AT - timedelta(hours=1), rec_id_start=1000)
+        
+        result = analytics.get_precomputed(
+            "get_key_metrics", 7, max_new_notifications=5, now=COMPUTED_AT + timedelta(hours=1)
+        )
+        
+        assert result is not None
+    
+    def test_precompute_replaces_previous_result(self, analytics, temp_db):
+        """Test that a later precompute replaces the stored result"""
+        _insert_notifications(temp_db, 3, COMPUTED_AT + timedelta(minutes=1), rec_id_start=1000)
+        later = COMPUTED_AT + timedelta(hours=1)
+        analytics.precompute((7,), now=later)
+        
+        result = analytics.get_precomputed("get_key_metrics", 7, now=later)
+        
+        assert result["total_notifications"] == 23
+
+
+class TestDashboardBundle:
+    """get_dashboard_bundle agrees with the individual analytics methods"""
+    
+    LIVE_METHODS = {
+        "metrics": "get_key_metrics",
+        "hourly_pattern": "get_hourly_pattern",
+        "app_analytics": "get_app_analytics",
+        "productivity": "get_productivity_metrics",
+    }
+    
+    @pytest.fixture
+    def analytics(self, temp_db):
+        """Analytics over data full of ties: equal hour counts and app counts"""
+        rows = []
+        # Hours 00, 07 and 19 each get four notifications; the two apps
+        # split them evenly, so every ranking needs its tie-breaker
+        for day in (13, 14):
+            for hour in (0, 7, 19):
+                for minute, app, level in ((5, 'com.apple.mail', 'HIGH'), (40, 'com.apple.MobileSMS', 'CRITICAL')):
+                    rows.append((app, f"2024-01-{day} {hour:02d}:{minute:02d}:00", 8.0, level, day % 2))
+        # One quieter hour
+        rows.append(('com.ring.ring', "2024-01-14 12:10:00", 3.0, 'LOW', 0))
+        
+        conn = sqlite3.connect(temp_db)
+        with conn:
+            conn.executemany(
+                "INSERT INTO notifications (rec_id, app_identifier, delivered_time, title, "
+                "priority_score, priority_level, is_read) VALUES (?, ?, ?, 'Title', ?, ?, ?)",
+                [(i, *row) for i, row in enumerate(rows, 1)]
+            )
+        conn.close()
+        return NotificationAnalytics(temp_db)
+    
+    @pytest.mark.parametrize("start, end", [
+        (datetime(2024, 1, 13, 0, 0), datetime(2024, 1, 15, 0, 0)),      # whole hours: rollup
+        (datetime(2024, 1, 13, 0, 30), datetime(2024, 1, 14, 19, 20)),   # partial hours at both ends
+        (datetime(2024, 1, 14, 7, 1), datetime(2024, 1, 14, 7, 50)),     # inside one hour: raw rows
+    ])
+    def test_matches_live_methods(self, analytics, start, end):
+        """Test that every bundle section equals its live method, ties included"""
+        bundle = analytics.get_dashboard_bundle(start, end)
+        
+        for section, method in self.LIVE_METHODS.items():
+            assert bundle[section] == getattr(analytics, method)(start, end), section
+    
+    def test_ties_resolve_to_earliest(self, analytics):
+        """Test that ties go to the earliest hour and the first app name"""
+        bundle = analytics.get_dashboard_bundle(datetime(2024, 1, 13), datetime(2024, 1, 15))
+        
+        assert bundle["metrics"]["peak_hour"] == "00:00"
+        assert bundle["app_analytics"]["app_time_patterns"]["com.apple.mail"] == ["00:00", "07:00", "19:00"]
+        assert [app["app"] for app in bundle["app_analytics"]["app_distribution"]] == [
+            'com.apple.MobileSMS', 'com.apple.mail', 'com.ring.ring'
+        ]
+        assert bundle["productivity"]["best_focus_hours"] == ["12:00", "00:00", "07:00"]
@@ -0,0 +1,231 @@
+"""
+Unit tests for the response and TTL caches
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mac_notifications.src.mcp_server.handlers.batch import handle_batch_mark_read
+from mac_notifications.src.mcp_server.handlers.common import (
+    cached_handler, clear_response_cache, make_handler, text_response
+)
+from mac_notifications.src.utils import cache as cache_module
+from mac_notifications.src.utils.cache import TTLCache
+
+
+def _payload(response):
+    """Decode the JSON body of a single-TextContent response"""
+    return json.loads(response[0].text)
+
+
+@pytest.fixture
+def clock():
+    """Controllable time.monotonic for the cache module"""
+    with patch.object(cache_module, "time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        yield mock_time.monotonic
+
+
+class TestTTLCache:
+    """TTLCache lookups, expiry and eviction"""
+    
+    def test_hit_within_ttl(self, clock):
+        """Test that a value is returned until its TTL has passed"""
+        cache = TTLCache(ttl=10)
+        cache.set("key", "value")
+        
+        clock.return_value += 9.9
+        assert cache.get("key") == "value"
+        assert "key" in cache
+    
+    def test_expiry(self, clock):
+        """Test that an expired value is dropped and the default returned"""
+        cache = TTLCache(ttl=10)
+        cache.set("key", "value")
+        
+        clock.return_value += 10
+        assert cache.get("key", "default") == "default"
+        assert "key" not in cache
+        assert len(cache) == 0
+    
+    def test_per_entry_ttl(self, clock):
+        """Test that a TTL passed to set overrides the default"""
+        cache = TTLCache(ttl=10)
+        cache.set("short", 1, ttl=1)
+        cache.set("long", 2)
+        
+        clock.return_value += 5
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+    
+    def test_evicts_least_recently_used(self, clock):
+        """Test that the least recently used entry is evicted past maxsize"""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_invalidate_and_clear(self, clock):
+        """Test that single entries and the whole cache can be dropped"""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        
+        cache.invalidate("a")
+        assert "a" not in cache
+        assert "b" in cache
+        
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestCachedHandler:
+    """cached_handler keys, expiry and invalidation by write tools"""
+    
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        """Start and end every test with an empty response cache"""
+        clear_response_cache()
+        yield
+        clear_response_cache()
+    
+    @pytest.fixture
+    def handler(self):
+        """Cached sync handler counting calls to the wrapped function"""
+        calls = Mock(side_effect=lambda server, arguments: text_response(
+            {"server": id(server), "arguments": arguments}
+        ))
+        return cached_handler(ttl=30)(calls), calls
+    
+    def test_hit_within_ttl(self, handler, clock):
+        """Test that a repeated call within the TTL is served from the cache"""
+        wrapped, calls = handler
+        server = Mock()
+        
+        first = wrapped(server, {"days": 7})
+        clock.return_value += 29
+        assert wrapped(server, {"days": 7}) is first
+        assert calls.call_count == 1
+    
+    def test_expiry(self, handler, clock):
+        """Test that the handler runs again once the TTL has passed"""
+        wrapped, calls = handler
+        server = Mock()
+        
+        wrapped(server, {"days": 7})
+        clock.return_value += 30
+        wrapped(server, {"days": 7})
+        
+        assert calls.call_count == 2
+    
+    def test_separate_keys_per_arguments(self, handler):
+        """Test that different arguments are cached separately, in any order"""
+        wrapped, calls = handler
+        server = Mock()
+        
+        assert _payload(wrapped(server, {"days": 7, "app": "mail"}))["arguments"] == {"days": 7, "app": "mail"}
+        assert _payload(wrapped(server, {"days": 30, "app": "mail"}))["arguments"] == {"days": 30, "app": "mail"}
+        assert calls.call_count == 2
+        
+        wrapped(server, {"app": "mail", "days": 7})
+        assert calls.call_count == 2
+    
+    def test_separate_keys_per_server(self, handler):
+        """Test that two servers never share a cached response"""
+        wrapped, calls = handler
+        first, second = Mock(), Mock()
+        
+        assert _payload(wrapped(first, {"days": 7}))["server"] == id(first)
+        assert _payload(wrapped(second, {"days": 7}))["server"] == id(second)
+        assert calls.call_count == 2
+    
+    def test_unhashable_arguments_not_cached(self, handler):
+        """Test that calls with unhashable arguments bypass the cache"""
+        wrapped, calls = handler
+        server = Mock()
+        
+        wrapped(server, {"apps": ["mail"]})
+        wrapped(server, {"apps": ["mail"]})
+        
+        assert calls.call_count == 2
+    
+    def test_async_handler(self, clock):
+        """Test that coroutine handlers are cached the same way"""
+        calls = Mock(return_value=text_response({"total": 3}))
+        
+        @cached_handler(ttl=30)
+        async def handle(server, arguments):
+            return calls(server, arguments)
+        
+        server = Mock()
+        assert _payload(asyncio.run(handle(server, {"days": 7}))) == {"total": 3}
+        assert _payload(asyncio.run(handle(server, {"days": 7}))) == {"total": 3}
+        assert calls.call_count == 1
+    
+    @pytest.mark.parametrize("result, cached", [
+        ({"error": "database is locked"}, False),
+        ({"success": False, "error": "Database not found", "daemon_status": "stopped"}, False),
+        ({"total": 3, "error": None}, True),
+        ({"total": 3, "apps": [{"app": "mail", "error": "unreadable"}]}, True),
+    ])
+    def test_error_responses_not_cached(self, result, cached):
+        """Test that responses reporting a top-level error are not stored"""
+        calls = Mock(return_value=text_response(result))
+        wrapped = cached_handler(ttl=30)(calls)
+        server = Mock()
+        
+        assert _payload(wrapped(server, {"days": 7})) == result
+        wrapped(server, {"days": 7})
+        
+        assert calls.call_count == (1 if cached else 2)
+    
+    def test_async_error_response_not_cached(self):
+        """Test that coroutine handlers do not store error responses either"""
+        calls = Mock(return_value=text_response({"error": "database is locked"}))
+        
+        @cached_handler(ttl=30)
+        async def handle(server, arguments):
+            return calls(server, arguments)
+        
+        server = Mock()
+        asyncio.run(handle(server, {"days": 7}))
+        asyncio.run(handle(server, {"days": 7}))
+        
+        assert calls.call_count == 2
+    
+    @pytest.mark.parametrize("dry_run, cleared", [(False, True), (True, False)])
+    def test_cleared_by_batch_action(self, handler, dry_run, cleared):
+        """Test that a batch action clears cached responses unless it is a dry run"""
+        wrapped, calls = handler
+        server = Mock()
+        server.batch_mark_read.return_value = {"affected": 3}
+        
+        wrapped(server, {"days": 7})
+        handle_batch_mark_read(server, {"selection_type": "app", "selection_value": "mail", "dry_run": dry_run})
+        wrapped(server, {"days": 7})
+        
+        server.batch_mark_read.assert_called_once_with(
+            selection_type="app", selection_value="mail", dry_run=dry_run
+        )
+        assert calls.call_count == (2 if cleared else 1)
+    
+    def test_read_handler_does_not_clear(self, handler):
+        """Test that make_handler leaves the cache alone by default"""
+        wrapped, calls = handler
+        server = Mock()
+        server.get_stats.return_value = {}
+        stats = make_handler("get_stats")
+        
+        wrapped(server, {"days": 7})
+        stats(server, {})
+        wrapped(server, {"days": 7})
+        
+        assert calls.call_count == 1
@@ -5,9 +5,10 @@ Unit tests for the notification daemon
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-import tempfile
+import plistlib
+import pytest
 import sqlite3
-from pathlib import Path
+import uuid
 
 from mac_notifications.src.daemon.notification_daemon import (
     NotificationDaemon, 
@@ -17,6 +18,17 @@ from mac_notifications.src.daemon.notification_daemon import (
     PriorityScorer
 )
 
+# Notification content in the binary plist format macOS stores, built once
+_TEST_PLIST_BYTES = plistlib.dumps({
+    'req': {
+        'titl': 'Test Title',
+        'body': 'Test Body',
+        'subt': 'Test Subtitle',
+        'cate': 'test-category',
+        'thre': 'test-thread'
+    }
+}, fmt=plistlib.FMT_BINARY)
+
 
 class TestNotificationData(unittest.TestCase):
     """Test NotificationData model"""
@@ -56,20 +68,18 @@ class TestDatabaseManager(unittest.TestCase):
     """Test DatabaseManager"""
     
     def setUp(self):
-        """Create temporary database"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.db_path = Path(self.temp_dir) / "test.db"
-        self.db_manager = DatabaseManager(str(self.db_path))
+        """Create a private shared-cache in-memory database"""
+        uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        # The database lives as long as at least one connection is open
+        self.keeper = sqlite3.connect(uri, uri=True)
+        self.db_manager = DatabaseManager(uri)
     
     def tearDown(self):
         """Clean up"""
-        import shutil
-        shutil.rmtree(self.temp_dir)
+        self.keeper.close()
     
     def test_database_creation(self):
         """Test database is created with correct schema"""
-        self.assertTrue(self.db_path.exists())
-        
         # Check tables exist
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
@@ -123,11 +133,23 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(self.db_manager.get_last_rec_id(), 42)
 
 
+class TestDatabaseManagerOnDisk:
+    """Test DatabaseManager with a database file"""
+    
+    def test_database_file_created(self, tmp_path):
+        """Test the database file and its directory are created"""
+        db_path = tmp_path / "data" / "test.db"
+        DatabaseManager(str(db_path))
+        assert db_path.exists()
+
+
 class TestPriorityScorer(unittest.TestCase):
     """Test PriorityScorer"""
     
-    def setUp(self):
-        self.scorer = PriorityScorer()
+    @classmethod
+    def setUpClass(cls):
+        # The scorer is stateless, so one instance serves every test
+        cls.scorer = PriorityScorer()
     
     def test_urgent_keyword_scoring(self):
         """Test urgent keywords increase score"""
@@ -162,6 +184,37 @@ class TestPriorityScorer(unittest.TestCase):
         self.assertTrue(any('payment' in f for f in factors))
         self.assertTrue(any('$500' in f for f in factors))
     
+    def test_batch_priority_scoring(self):
+        """Test batch scoring matches scoring one notification at a time"""
+        notifications = [
+            NotificationData(
+                rec_id=1,
+                app_identifier="com.apple.mail",
+                delivered_time="2024-01-01 10:00:00",
+                title="URGENT: Action required",
+                body="Payment failed\nplease confirm"
+            ),
+            NotificationData(
+                rec_id=2,
+                app_identifier="com.apple.news",
+                delivered_time="2024-01-01 11:00:00",
+                title="Daily briefing"
+            ),
+            NotificationData(
+                rec_id=3,
+                app_identifier="com.apple.security",
+                delivered_time="2024-01-01 12:00:00",
+                title="Security alert",
+                subtitle="urgent",
+                body="urgent urgent"
+            ),
+        ]
+        
+        expected = [self.scorer.calculate_priority(n) for n in notifications]
+        
+        self.assertEqual(self.scorer.calculate_priority_batch(notifications), expected)
+        self.assertEqual(self.scorer.calculate_priority_batch([]), [])
+    
     def test_app_weight(self):
         """Test app-specific weighting"""
         # High priority app
@@ -202,21 +255,7 @@ class TestNotificationExtractor(unittest.TestCase):
     
     def test_parse_notification_content(self):
         """Test parsing notification plist data"""
-        import plistlib
-        
-        # Create test plist data
-        test_data = {
-            'req': {
-                'titl': 'Test Title',
-                'body': 'Test Body',
-                'subt': 'Test Subtitle',
-                'cate': 'test-category',
-                'thre': 'test-thread'
-            }
-        }
-        plist_bytes = plistlib.dumps(test_data)
-        
-        result = self.extractor._parse_notification_content(plist_bytes)
+        result = self.extractor._parse_notification_content(_TEST_PLIST_BYTES)
         
         self.assertEqual(result['title'], 'Test Title')
         self.assertEqual(result['body'], 'Test Body')
@@ -225,39 +264,33 @@ class TestNotificationExtractor(unittest.TestCase):
         self.assertEqual(result['thread'], 'test-thread')
 
 
-class TestNotificationDaemon(unittest.TestCase):
+class TestNotificationDaemon:
     """Test NotificationDaemon main class"""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.db_path = Path(self.temp_dir) / "test.db"
-        self.daemon = NotificationDaemon(str(self.db_path), update_interval=1)
-    
-    def tearDown(self):
-        """Clean up"""
-        import shutil
-        shutil.rmtree(self.temp_dir)
+    @pytest.fixture
+    def daemon(self, tmp_path):
+        return NotificationDaemon(str(tmp_path / "test.db"), update_interval=1)
     
-    def test_daemon_initialization(self):
+    def test_daemon_initialization(self, daemon):
         """Test daemon initializes correctly"""
-        self.assertIsNotNone(self.daemon.db_manager)
-        self.assertIsNotNone(self.daemon.extractor)
-        self.assertIsNotNone(self.daemon.scorer)
-        self.assertEqual(self.daemon.update_interval, 1)
-        self.assertFalse(self.daemon.running)
+        assert daemon.db_manager is not None
+        assert daemon.extractor is not None
+        assert daemon.scorer is not None
+        assert daemon.update_interval == 1
+        assert not daemon.running
     
-    def test_get_stats(self):
+    def test_get_stats(self, daemon):
         """Test getting daemon statistics"""
-        stats = self.daemon.get_stats()
+        stats = daemon.get_stats()
         
-        self.assertIn('total_notifications', stats)
-        self.assertIn('by_priority', stats)
-        self.assertIn('top_apps', stats)
-        self.assertIn('date_range', stats)
-        self.assertIn('metadata', stats)
+        assert 'total_notifications' in stats
+        assert 'by_priority' in stats
+        assert 'top_apps' in stats
+        assert 'date_range' in stats
+        assert 'metadata' in stats
     
     @patch('mac_notifications.src.daemon.notification_daemon.NotificationExtractor.extract_notifications')
-    def test_daemon_loop_processing(self, mock_extract):
+    def test_daemon_loop_processing(self, mock_extract, daemon):
         """Test daemon processes notifications in loop"""
         # Mock some notifications
         mock_extract.return_value = [
@@ -269,29 +302,12 @@ class TestNotificationDaemon(unittest.TestCase):
             )
         ]
         
-        # Run one iteration
-        self.daemon.running = True
+        # Run one iteration of the loop body directly
+        saved = daemon.run_once()
         
-        # Mock the sleep to avoid waiting
-        with patch('time.sleep'):
-            # Run daemon in a thread and stop after one iteration
-            import threading
-            
-            def run_and_stop():
-                # Let it run one iteration
-                import time
-                time.sleep(0.1)
-                self.daemon.running = False
-            
-            stop_thread = threading.Thread(target=run_and_stop)
-            stop_thread.start()
-            
-            # This should process one batch and exit
-            # We're not actually calling run() here to avoid the full loop
-            # Just verify the components work
-            
-        # Verify extractor was set up
-        self.assertTrue(hasattr(self.daemon, 'extractor'))
+        assert mock_extract.called
+        assert saved == 1
+        assert daemon.db_manager.get_last_rec_id() == 1
 
 
 if __name__ == '__main__':
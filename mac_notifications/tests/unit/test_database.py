@@ -0,0 +1,423 @@
+"""
+Unit tests for the database layer
+"""
+
+import queue
+import re
+import sqlite3
+import threading
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from mac_notifications.src.daemon.notification_daemon import DatabaseManager
+from mac_notifications.src.database import migrations
+from mac_notifications.src.database.connection import DatabaseConnection
+from mac_notifications.src.database.pool import SQLiteConnectionPool
+from mac_notifications.src.database.repositories import NotificationRepository
+
+
+# notifications_hourly as it should be: a GROUP BY over notifications
+EXPECTED_ROLLUP_SQL = """
+    SELECT strftime('%Y-%m-%d %H:00:00', delivered_time), app_identifier, priority_level,
+           COUNT(*), ROUND(COALESCE(SUM(priority_score), 0), 6), COUNT(priority_score),
+           COUNT(CASE WHEN is_read = 0 THEN 1 END)
+    FROM notifications
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+"""
+
+ROLLUP_SQL = """
+    SELECT hour, app_identifier, priority_level,
+           notification_count, ROUND(score_sum, 6), score_count, unread_count
+    FROM notifications_hourly
+    WHERE notification_count != 0
+    ORDER BY 1, 2, 3
+"""
+
+INSERT_SQL = """
+    INSERT {verb} INTO notifications (
+        rec_id, app_identifier, delivered_time, title, priority_score, priority_level, is_read
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+ROWS = [
+    (1, 'com.apple.mail', '2024-01-01 10:05:00', 'Mail 1', 4.5, 'MEDIUM', 0),
+    (2, 'com.apple.mail', '2024-01-01 10:55:00', 'Mail 2', 12.0, 'HIGH', 1),
+    (3, 'com.apple.mail', '2024-01-01 11:00:00', 'Mail 3', None, 'LOW', 0),
+    (4, 'com.apple.MobileSMS', '2024-01-01 10:30:00', 'Text 1', 16.25, 'CRITICAL', 0),
+    (5, 'com.apple.MobileSMS', '2024-01-01 10:31:00', 'Text 2', 16.25, 'CRITICAL', 0),
+    (6, 'com.ring.ring', '2024-01-02 03:00:00', 'Motion', 7.1, 'MEDIUM', 1),
+]
+
+
+def _schema_sql(conn, prefix):
+    """Definitions of the tables and triggers named ``prefix*``, whitespace-normalized"""
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE name LIKE ? ORDER BY name", (f"{prefix}%",)
+    ).fetchall()
+    return {name: re.sub(r'\s+', ' ', sql).strip() for name, sql in rows}
+
+
+@pytest.fixture(params=["repository", "daemon"])
+def rollup_conn(request, memory_db):
+    """Connection to a database carrying the hourly rollup triggers
+    
+    Runs each test against the migration's DDL (as used by the test schema)
+    and against the copy DatabaseManager creates.
+    """
+    if request.param == "repository":
+        conn = sqlite3.connect(memory_db, uri=True)
+        keeper = None
+    else:
+        uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        keeper = sqlite3.connect(uri, uri=True)
+        DatabaseManager(uri)
+        conn = sqlite3.connect(uri, uri=True)
+    
+    yield conn
+    
+    conn.close()
+    if keeper is not None:
+        keeper.close()
+
+
+class TestHourlyRollup:
+    """notifications_hourly stays equal to a GROUP BY over notifications"""
+    
+    def assert_rollup_matches(self, conn):
+        """Assert the rollup equals EXPECTED_ROLLUP_SQL over the current rows"""
+        assert conn.execute(ROLLUP_SQL).fetchall() == conn.execute(EXPECTED_ROLLUP_SQL).fetchall()
+        
+        # Groups that were emptied must not keep partial sums
+        leftovers = conn.execute("""
+            SELECT COUNT(*) FROM notifications_hourly
+            WHERE notification_count = 0
+              AND (ABS(score_sum) > 1e-9 OR score_count != 0 OR unread_count != 0)
+        """).fetchone()[0]
+        assert leftovers == 0
+    
+    def test_insert(self, rollup_conn):
+        """Test that inserted rows are added to their hour"""
+        with rollup_conn:
+            rollup_conn.executemany(INSERT_SQL.format(verb=""), ROWS)
+        
+        self.assert_rollup_matches(rollup_conn)
+        assert rollup_conn.execute(
+            "SELECT SUM(notification_count) FROM notifications_hourly"
+        ).fetchone()[0] == len(ROWS)
+    
+    def test_insert_or_replace(self, rollup_conn):
+        """Test that a replaced row is taken out of its old group"""
+        with rollup_conn:
+            rollup_conn.executemany(INSERT_SQL.format(verb=""), ROWS)
+            rollup_conn.executemany(INSERT_SQL.format(verb="OR REPLACE"), [
+                # Moves to another hour, app and level
+                (1, 'com.ring.ring', '2024-01-02 03:15:00', 'Mail 1', 9.0, 'MEDIUM', 1),
+                # Same group, new score and read state
+                (4, 'com.apple.MobileSMS', '2024-01-01 10:30:00', 'Text 1', None, 'CRITICAL', 1),
+                # Not stored yet, so nothing is replaced
+                (7, 'com.apple.mail', '2024-01-01 10:59:59', 'Mail 4', 3.0, 'MEDIUM', 0),
+            ])
+        
+        self.assert_rollup_matches(rollup_conn)
+    
+    def test_update(self, rollup_conn):
+        """Test that updates to grouped or summed columns move the row"""
+        with rollup_conn:
+            rollup_conn.executemany(INSERT_SQL.format(verb=""), ROWS)
+            rollup_conn.execute("UPDATE notifications SET is_read = 1 WHERE app_identifier = 'com.apple.mail'")
+            rollup_conn.execute("UPDATE notifications SET priority_level = 'HIGH', priority_score = 11 WHERE rec_id = 5")
+            rollup_conn.execute("UPDATE notifications SET delivered_time = '2024-01-01 12:00:00' WHERE rec_id = 3")
+            rollup_conn.execute("UPDATE notifications SET app_identifier = 'com.apple.mail' WHERE rec_id = 6")
+            rollup_conn.execute("UPDATE notifications SET priority_score = NULL WHERE rec_id = 2")
+            # Not part of the rollup
+            rollup_conn.execute("UPDATE notifications SET title = 'Renamed'")
+        
+        self.assert_rollup_matches(rollup_conn)
+    
+    def test_delete(self, rollup_conn):
+        """Test that deleted rows are subtracted, emptying whole groups"""
+        with rollup_conn:
+            rollup_conn.executemany(INSERT_SQL.format(verb=""), ROWS)
+            rollup_conn.execute("DELETE FROM notifications WHERE rec_id IN (2, 6)")
+            rollup_conn.execute("DELETE FROM notifications WHERE app_identifier = 'com.apple.MobileSMS'")
+        
+        self.assert_rollup_matches(rollup_conn)
+        assert rollup_conn.execute(
+            "SELECT COUNT(*) FROM notifications_hourly WHERE notification_count = 0"
+        ).fetchone()[0] == 3
+    
+    def test_daemon_backfills_existing_rows(self):
+        """Test that DatabaseManager fills a newly created rollup from stored rows"""
+        uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            DatabaseManager(uri)
+            with conn:
+                for name in ("bi", "ai", "ad", "au"):
+                    conn.execute(f"DROP TRIGGER notifications_hourly_{name}")
+                conn.execute("DROP TABLE notifications_hourly")
+                conn.executemany(INSERT_SQL.format(verb=""), ROWS)
+            
+            DatabaseManager(uri)
+            
+            self.assert_rollup_matches(conn)
+        finally:
+            conn.close()
+    
+    def test_daemon_ddl_matches_migration(self, memory_db):
+        """Test that the daemon's copy of the rollup DDL matches migration 9"""
+        uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        daemon_conn = sqlite3.connect(uri, uri=True)
+        repository_conn = sqlite3.connect(memory_db, uri=True)
+        try:
+            DatabaseManager(uri)
+            
+            expected = _schema_sql(repository_conn, 'notifications_hourly')
+            assert set(expected) == {
+                "notifications_hourly",
+                "notifications_hourly_bi",
+                "notifications_hourly_ai",
+                "notifications_hourly_ad",
+                "notifications_hourly_au",
+            }
+            assert _schema_sql(daemon_conn, 'notifications_hourly') == expected
+        finally:
+            daemon_conn.close()
+            repository_conn.close()
+
+
+
+class TestFullTextIndex:
+    """notifications_fts is created the same way on every schema path"""
+    
+    def test_daemon_ddl_matches_migration(self, memory_db):
+        """Test that the daemon's copy of the FTS DDL matches migration 7"""
+        uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        daemon_conn = sqlite3.connect(uri, uri=True)
+        repository_conn = sqlite3.connect(memory_db, uri=True)
+        try:
+            DatabaseManager(uri)
+            
+            expected = _schema_sql(repository_conn, 'notifications_fts')
+            assert {
+                "notifications_fts",
+                "notifications_fts_ai",
+                "notifications_fts_ad",
+                "notifications_fts_au",
+            } <= set(expected)
+            assert _schema_sql(daemon_conn, 'notifications_fts') == expected
+        finally:
+            daemon_conn.close()
+            repository_conn.close()
+    
+    def test_migrations_without_fts(self):
+        """Test that migration 7 is recorded without the index when FTS is unavailable"""
+        uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        conn = sqlite3.connect(uri, uri=True)
+        unsupported = (
+            "CREATE VIRTUAL TABLE notifications_fts USING fts5(title, tokenize='no_such_tokenizer')",
+        ) + migrations.NOTIFICATIONS_FTS_DDL[1:]
+        try:
+            with patch.object(migrations, "NOTIFICATIONS_FTS_DDL", unsupported):
+                manager = migrations.MigrationManager(DatabaseConnection(uri))
+                manager.migrate_to_latest()
+            
+            assert manager.get_current_version() == max(m.version for m in manager.migrations)
+            assert _schema_sql(conn, 'notifications_fts') == {}
+            assert _schema_sql(conn, 'notifications_hourly')
+        finally:
+            conn.close()
+
+
+class TestConnectionPool:
+    """SQLiteConnectionPool checkout, reuse and limits"""
+    
+    def test_warms_min_size_for_existing_database(self, temp_db):
+        """Test that min_size connections are opened when the file exists"""
+        pool = SQLiteConnectionPool(temp_db, min_size=2, max_size=4)
+        try:
+            assert pool.get_stats() == {"size": 2, "idle": 2, "active": 0, "max_size": 4, "waits": 0}
+        finally:
+            pool.close()
+    
+    def test_does_not_create_missing_database(self, tmp_path):
+        """Test that warming the pool does not create the database file"""
+        db_path = tmp_path / "missing.db"
+        pool = SQLiteConnectionPool(str(db_path), min_size=2)
+        
+        assert pool.get_stats()["size"] == 0
+        assert not db_path.exists()
+        pool.close()
+    
+    def test_checkout_and_return(self, temp_db):
+        """Test that a checked-out connection is active until it is returned"""
+        pool = SQLiteConnectionPool(temp_db, min_size=1, max_size=2)
+        try:
+            with pool.get_connection() as conn:
+                assert conn.row_factory is sqlite3.Row
+                assert conn.execute("SELECT COUNT(*) AS n FROM notifications").fetchone()["n"] == 0
+                assert pool.get_stats()["active"] == 1
+            
+            stats = pool.get_stats()
+            assert stats["active"] == 0
+            assert stats["idle"] == 1
+        finally:
+            pool.close()
+    
+    def test_connections_are_reused(self, temp_db):
+        """Test that returned connections are handed out again instead of reopened"""
+        pool = SQLiteConnectionPool(temp_db, min_size=0, max_size=2)
+        try:
+            conn = pool.acquire()
+            pool.release(conn)
+            
+            assert pool.acquire() is conn
+            assert pool.get_stats()["size"] == 1
+        finally:
+            pool.close()
+    
+    def test_release_rolls_back_open_transaction(self, temp_db):
+        """Test that a connection is returned without its uncommitted writes"""
+        pool = SQLiteConnectionPool(temp_db, min_size=0, max_size=1)
+        try:
+            conn = pool.acquire()
+            conn.execute("BEGIN")
+            conn.execute(INSERT_SQL.format(verb=""), ROWS[0])
+            pool.release(conn)
+            
+            conn = pool.acquire()
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0] == 0
+        finally:
+            pool.close()
+    
+    def test_blocks_when_exhausted(self, temp_db):
+        """Test that acquire waits for a free connection and times out when none frees up"""
+        pool = SQLiteConnectionPool(temp_db, min_size=0, max_size=1, timeout=0.05)
+        try:
+            held = pool.acquire()
+            
+            with pytest.raises(queue.Empty):
+                pool.acquire()
+            assert pool.get_stats()["waits"] == 1
+            
+            # A connection released while waiting is handed to the waiter
+            pool.timeout = 5
+            timer = threading.Timer(0.05, pool.release, args=(held,))
+            timer.start()
+            assert pool.acquire() is held
+            timer.join()
+            
+            assert pool.get_stats() == {"size": 1, "idle": 0, "active": 1, "max_size": 1, "waits": 2}
+        finally:
+            pool.close()
+    
+    def test_closed_pool(self, temp_db):
+        """Test that a closed pool refuses checkouts and closes returned connections"""
+        pool = SQLiteConnectionPool(temp_db, min_size=1, max_size=2)
+        conn = pool.acquire()
+        pool.close()
+        
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+        
+        pool.release(conn)
+        assert pool.get_stats()["size"] == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    
+    def test_thread_safety(self, temp_db):
+        """Test that concurrent checkouts never exceed max_size or share a connection"""
+        max_size = 3
+        pool = SQLiteConnectionPool(temp_db, min_size=0, max_size=max_size, timeout=10)
+        lock = threading.Lock()
+        in_use = set()
+        peak = [0]
+        errors = []
+        
+        def worker(thread_id):
+            try:
+                for i in range(25):
+                    with pool.get_connection() as conn:
+                        with lock:
+                            assert id(conn) not in in_use
+                            in_use.add(id(conn))
+                            peak[0] = max(peak[0], len(in_use))
+                        conn.execute(INSERT_SQL.format(verb=""), (thread_id * 100 + i, *ROWS[0][1:]))
+                        with lock:
+                            in_use.discard(id(conn))
+            except Exception as e:  # Surface failures from the worker threads
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            assert errors == []
+            assert peak[0] <= max_size
+            stats = pool.get_stats()
+            assert stats["size"] <= max_size
+            assert stats["active"] == 0
+            with pool.get_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0] == 8 * 25
+        finally:
+            pool.close()
+
+
+# Twelve CRITICAL/HIGH rows with distinct scores (plus one tie broken by
+# delivery time) and two better-scored rows outside those levels
+PRIORITY_ROWS = [
+    (100 + i, 'com.apple.mail', f'2024-01-01 09:{i:02d}:00', f'Mail {i}', 30.0 - i,
+     'CRITICAL' if i % 2 else 'HIGH', 0)
+    for i in range(12)
+] + [
+    (200, 'com.apple.MobileSMS', '2024-01-01 09:30:00', 'Tie', 29.0, 'HIGH', 0),
+    (300, 'com.apple.mail', '2024-01-01 10:00:00', 'Medium', 99.0, 'MEDIUM', 0),
+    (301, 'com.apple.mail', '2024-01-01 10:01:00', 'Low', 98.0, 'LOW', 0),
+]
+
+# rec_ids of the ten best CRITICAL/HIGH rows: by score, then newest first
+EXPECTED_TOP = [100, 200, 101, 102, 103, 104, 105, 106, 107, 108]
+
+
+class TestNotificationRepository:
+    """NotificationRepository reads that build Notification objects"""
+    
+    @pytest.fixture
+    def priority_db(self, temp_db):
+        """On-disk database holding PRIORITY_ROWS"""
+        conn = sqlite3.connect(temp_db)
+        with conn:
+            conn.executemany(INSERT_SQL.format(verb=""), PRIORITY_ROWS)
+        conn.close()
+        return temp_db
+    
+    def test_get_top_by_priorities(self, priority_db):
+        """Test that the best-scored rows of the given levels come back in order"""
+        repo = NotificationRepository(DatabaseConnection(priority_db))
+        
+        top = repo.get_top_by_priorities(['CRITICAL', 'HIGH'], limit=10)
+        
+        assert [notif.rec_id for notif in top] == EXPECTED_TOP
+        assert {notif.priority_level for notif in top} == {'CRITICAL', 'HIGH'}
+        assert repo.get_top_by_priorities(['CRITICAL', 'HIGH'], limit=3) == top[:3]
+        assert repo.get_top_by_priorities([], limit=10) == []
+    
+    def test_server_statistics_top_priority(self, priority_db):
+        """Test that get_statistics lists the ten best CRITICAL/HIGH notifications"""
+        from mac_notifications.src.mcp_server.server import NotificationMCPServer
+        
+        stats = NotificationMCPServer(priority_db).get_statistics()
+        
+        assert not stats.get('error')
+        assert stats['total'] == len(PRIORITY_ROWS)
+        titles = {row[0]: row[3] for row in PRIORITY_ROWS}
+        assert [notif['title'] for notif in stats['top_priority_notifications']] == [
+            titles[rec_id] for rec_id in EXPECTED_TOP
+        ]
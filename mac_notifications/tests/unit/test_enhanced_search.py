@@ -3,18 +3,31 @@ Test Enhanced Search Feature
 """
 
 import pytest
+import sqlite3
 from datetime import datetime, timedelta
 
 from mac_notifications.src.features.enhanced_search import EnhancedSearch, parse_search_query
 
 
+@pytest.fixture(scope="class")
+def search():
+    """One search engine per test class; it holds no per-query state"""
+    return EnhancedSearch()
+
+
+@pytest.fixture(scope="class")
+def db_conn(populated_db):
+    """One read-only connection to the session's populated database per test class"""
+    conn = sqlite3.connect(f"file:{populated_db}?mode=ro", uri=True, check_same_thread=False)
+    yield conn
+    conn.close()
+
+
 class TestEnhancedSearch:
     """Test enhanced search functionality"""
     
-    def test_parse_natural_language_query(self):
+    def test_parse_natural_language_query(self, search):
         """Test natural language query parsing"""
-        search = EnhancedSearch()
-        
         # Test time-based query
         params = search.parse_natural_language_query("notifications from today")
         assert params['time_range'] is not None
@@ -37,10 +50,8 @@ class TestEnhancedSearch:
         assert params['priority_filter'] == 'important'
         assert params['time_range'] is not None
     
-    def test_security_camera_shortcuts(self):
+    def test_security_camera_shortcuts(self, search):
         """Test security camera specific shortcuts"""
-        search = EnhancedSearch()
-        
         # Test stranger detection shortcut
         params = search.parse_natural_language_query("strangers")
         assert 'stranger' in params['keywords']
@@ -51,47 +62,44 @@ class TestEnhancedSearch:
         assert 'com.security.batterycam' in params['apps']
         assert 'vehicle' in params['exclude_keywords']
     
-    def test_time_range_parsing(self):
+    @pytest.mark.parametrize("query,expected_days", [
+        ("last week", 7),
+        ("this week", 7),
+        ("yesterday", 1),
+        ("last month", 30),
+    ])
+    def test_time_range_parsing(self, search, query, expected_days):
         """Test various time range formats"""
-        search = EnhancedSearch()
-        
-        # Test relative times
-        test_cases = [
-            ("last week", 7),
-            ("this week", 7),
-            ("yesterday", 1),
-            ("last month", 30),
-        ]
-        
-        for query, expected_days in test_cases:
-            params = search.parse_natural_language_query(f"notifications from {query}")
-            assert params['time_range'] is not None
-            start, end = params['time_range']
-            # Check that time range is approximately correct
-            duration = (end - start).days
-            assert abs(duration - expected_days) <= 1
+        params = search.parse_natural_language_query(f"notifications from {query}")
+        assert params['time_range'] is not None
+        start, end = params['time_range']
+        # Check that time range is approximately correct
+        duration = (end - start).days
+        assert abs(duration - expected_days) <= 1
+    
+    def test_relative_time_range_parsing(self, search):
+        """Test "last N units" queries become a time range, not keywords"""
+        params = search.parse_natural_language_query("alerts from last 2 hours")
+        
+        start, end = params['time_range']
+        assert abs((end - start) - timedelta(hours=2)) < timedelta(seconds=1)
+        assert 'hours' not in params['keywords']
+        assert 'last' not in params['keywords']
     
-    def test_app_aliases(self):
+    @pytest.mark.parametrize("alias,expected_apps", [
+        ("messages", ["com.apple.mobilesms", "com.apple.messages"]),
+        ("mail", ["com.apple.mail"]),
+        ("teams", ["com.microsoft.teams", "com.microsoft.teams2"]),
+        ("security camera", ["com.security.batterycam"]),
+        ("wallet", ["com.apple.passbook"]),
+    ])
+    def test_app_aliases(self, search, alias, expected_apps):
         """Test app name aliases"""
-        search = EnhancedSearch()
-        
-        # Test various app aliases
-        test_cases = [
-            ("messages", ["com.apple.mobilesms", "com.apple.messages"]),
-            ("mail", ["com.apple.mail"]),
-            ("teams", ["com.microsoft.teams", "com.microsoft.teams2"]),
-            ("security camera", ["com.security.batterycam"]),
-            ("wallet", ["com.apple.passbook"]),
-        ]
-        
-        for alias, expected_apps in test_cases:
-            params = search.parse_natural_language_query(f"from {alias}")
-            assert any(app in params['apps'] for app in expected_apps)
+        params = search.parse_natural_language_query(f"from {alias}")
+        assert any(app in params['apps'] for app in expected_apps)
     
-    def test_keyword_extraction(self):
+    def test_keyword_extraction(self, search):
         """Test keyword extraction from queries"""
-        search = EnhancedSearch()
-        
         # Test with stop words removed
         params = search.parse_natural_language_query("show me all the notifications about meetings")
         assert "meetings" in params['keywords']
@@ -102,10 +110,8 @@ class TestEnhancedSearch:
         params = search.parse_natural_language_query("payment invoice deadline")
         assert all(word in params['keywords'] for word in ["payment", "invoice", "deadline"])
     
-    def test_regex_pattern_extraction(self):
+    def test_regex_pattern_extraction(self, search):
         """Test regex pattern extraction"""
-        search = EnhancedSearch()
-        
         # Test regex pattern
         params = search.parse_natural_language_query("notifications matching /error.*critical/")
         assert params['regex_pattern'] == 'error.*critical'
@@ -113,15 +119,10 @@ class TestEnhancedSearch:
         # Test that regex is removed from keywords
         assert not any('error' in kw for kw in params['keywords'])
     
-    def test_search_with_database(self, populated_db):
+    def test_search_with_database(self, search, db_conn):
         """Test actual search execution with database"""
-        search = EnhancedSearch()
-        
-        import sqlite3
-        conn = sqlite3.connect(populated_db)
-        
         # Search for urgent notifications
-        results = search.search("urgent", conn, limit=10)
+        results = search.search("urgent", db_conn, limit=10)
         assert 'notifications' in results
         assert 'total_found' in results
         assert 'parsed_params' in results
@@ -133,85 +134,75 @@ class TestEnhancedSearch:
                 urgent_found = True
                 break
         assert urgent_found
-        
-        conn.close()
     
-    def test_search_by_app(self, populated_db):
+    def test_search_by_app(self, search, db_conn):
         """Test searching by app"""
-        search = EnhancedSearch()
-        
-        import sqlite3
-        conn = sqlite3.connect(populated_db)
-        
         # Search for mail notifications
-        results = search.search("from mail", conn, limit=10)
+        results = search.search("from mail", db_conn, limit=10)
         
         # Check that only mail notifications are returned
         for notif in results['notifications']:
             assert 'mail' in notif['app_identifier'].lower()
-        
-        conn.close()
     
-    def test_search_with_time_filter(self, populated_db):
+    def test_search_with_time_filter(self, search, db_conn):
         """Test searching with time filters"""
-        search = EnhancedSearch()
-        
-        import sqlite3
-        conn = sqlite3.connect(populated_db)
-        
         # Search for recent notifications
-        results = search.search("notifications from last 2 hours", conn, limit=10)
+        results = search.search("notifications from last 2 hours", db_conn, limit=10)
         
         # Check that results are recent
         two_hours_ago = datetime.now() - timedelta(hours=2)
         for notif in results['notifications']:
             delivered_time = datetime.strptime(notif['delivered_time'], '%Y-%m-%d %H:%M:%S')
             assert delivered_time >= two_hours_ago
-        
-        conn.close()
     
-    def test_search_with_priority_filter(self, populated_db):
+    def test_search_with_priority_filter(self, search, db_conn):
         """Test searching with priority filters"""
-        search = EnhancedSearch()
-        
-        import sqlite3
-        conn = sqlite3.connect(populated_db)
-        
         # Search for critical notifications
-        results = search.search("critical notifications", conn, limit=10)
+        results = search.search("critical notifications", db_conn, limit=10)
         
         # Check that results are critical priority
         for notif in results['notifications']:
             assert notif.get('priority_level') == 'CRITICAL'
-        
-        conn.close()
     
-    def test_search_with_exclusions(self, populated_db):
+    def test_search_with_exclusions(self, search, db_conn):
         """Test searching with exclusions"""
-        search = EnhancedSearch()
-        
-        import sqlite3
-        conn = sqlite3.connect(populated_db)
-        
         # Search excluding certain keywords
-        results = search.search("notifications but not motion", conn, limit=50)
-        
-        # Check that excluded terms are not in results
-        for notif in results['notifications']:
-            text = f"{notif.get('title', '')} {notif.get('body', '')}".lower()
-            assert 'motion' not in text
-        
-        conn.close()
+        results = search.search("notifications but not motion", db_conn, limit=50)
+        
+        # Check that excluded terms are not in results, with one query
+        rec_ids = [notif['rec_id'] for notif in results['notifications']]
+        placeholders = ','.join('?' * len(rec_ids))
+        matches = db_conn.execute(f"""
+            SELECT COUNT(*) FROM notifications
+            WHERE rec_id IN ({placeholders})
+            AND LOWER(COALESCE(title, '') || ' ' || COALESCE(body, '')) LIKE '%motion%'
+        """, rec_ids).fetchone()[0]
+        assert matches == 0
+    
+    @pytest.mark.parametrize("query,expected_count", [
+        ("server", 1),
+        ("standup meeting", 1),
+        ("backyard", 15),
+        ("content but not update 1", 5),
+        ("card but not tomorrow", 0),
+    ])
+    def test_fulltext_matches_like(self, search, db_conn, query, expected_count):
+        """Test that keywords and exclusions match the same rows via FTS as via LIKE"""
+        params = search.parse_natural_language_query(query)
+        
+        rec_ids = {}
+        for has_fts in (True, False):
+            sql, sql_params = search.build_sql_query(params, has_fts=has_fts)
+            assert ('notifications_fts' in sql) == has_fts
+            rec_ids[has_fts] = sorted(row[1] for row in db_conn.execute(sql, sql_params))
+        
+        assert rec_ids[True] == rec_ids[False]
+        assert len(rec_ids[True]) == expected_count
     
-    def test_search_grouping(self, populated_db):
+    def test_search_grouping(self, search, db_conn):
         """Test search results grouping"""
-        search = EnhancedSearch()
-        
-        import sqlite3
-        conn = sqlite3.connect(populated_db)
-        
         # Search with grouping by app
-        results = search.search("all notifications group by app", conn, limit=100)
+        results = search.search("all notifications group by app", db_conn, limit=100)
         
         assert 'groups' in results
         assert results['grouped_by'] == 'app'
@@ -221,37 +212,29 @@ class TestEnhancedSearch:
             assert 'count' in group_data
             assert 'notifications' in group_data
             assert 'priority_breakdown' in group_data
-        
-        conn.close()
 
 
 class TestSearchSuggestions:
     """Test search suggestion functionality"""
     
-    def test_time_suggestions(self):
+    def test_time_suggestions(self, search):
         """Test time-based search suggestions"""
-        search = EnhancedSearch()
-        
         suggestions = search.get_search_suggestions("tod", None)
         assert any("today" in s for s in suggestions)
         
         suggestions = search.get_search_suggestions("yest", None)
         assert any("yesterday" in s for s in suggestions)
     
-    def test_priority_suggestions(self):
+    def test_priority_suggestions(self, search):
         """Test priority-based search suggestions"""
-        search = EnhancedSearch()
-        
         suggestions = search.get_search_suggestions("crit", None)
         assert any("critical" in s for s in suggestions)
         
         suggestions = search.get_search_suggestions("imp", None)
         assert any("important" in s for s in suggestions)
     
-    def test_app_suggestions(self):
+    def test_app_suggestions(self, search):
         """Test app-based search suggestions"""
-        search = EnhancedSearch()
-        
         suggestions = search.get_search_suggestions("mess", None)
         assert any("messages" in s.lower() for s in suggestions)
         
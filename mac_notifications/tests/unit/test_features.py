@@ -13,8 +13,10 @@ from mac_notifications.src.features.templates import NotificationTemplates
 class TestPriorityScoring(unittest.TestCase):
     """Test priority scoring feature"""
     
-    def setUp(self):
-        self.scorer = PriorityScorer()
+    @classmethod
+    def setUpClass(cls):
+        # The scorer is stateless, so one instance serves every test
+        cls.scorer = PriorityScorer()
     
     def test_scoring_rules(self):
         """Test that scoring rules are applied correctly"""
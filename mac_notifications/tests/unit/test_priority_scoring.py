@@ -6,7 +6,7 @@ import pytest
 import json
 from datetime import datetime, timedelta
 
-from mac_notifications.src.features.priority_scoring import PriorityScorer, calculate_priority_score
+from mac_notifications.src.features.priority_scoring import calculate_priority_score
 from mac_notifications.src.database.models import Notification
 
 
@@ -15,8 +15,6 @@ class TestPriorityScoring:
     
     def test_urgent_keywords(self):
         """Test that urgent keywords increase priority"""
-        scorer = PriorityScorer()
-        
         # Test urgent notification
         urgent_notif = {
             "title": "URGENT: Action Required",
@@ -33,8 +31,6 @@ class TestPriorityScoring:
     
     def test_financial_notifications(self):
         """Test financial notification scoring"""
-        scorer = PriorityScorer()
-        
         # Test fraud alert
         fraud_notif = {
             "title": "Fraud Alert",
@@ -52,8 +48,6 @@ class TestPriorityScoring:
     
     def test_security_camera_stranger(self):
         """Test security camera stranger detection"""
-        scorer = PriorityScorer()
-        
         # Test stranger detection
         stranger_notif = {
             "title": "",
@@ -70,8 +64,6 @@ class TestPriorityScoring:
     
     def test_security_camera_routine(self):
         """Test routine security camera notifications"""
-        scorer = PriorityScorer()
-        
         # Test vehicle detection
         vehicle_notif = {
             "title": "Motion Detected",
@@ -88,8 +80,6 @@ class TestPriorityScoring:
     
     def test_medical_notifications(self):
         """Test medical/health notifications"""
-        scorer = PriorityScorer()
-        
         # Test video visit
         medical_notif = {
             "title": "You may now join your video visit",
@@ -107,8 +97,6 @@ class TestPriorityScoring:
     
     def test_time_decay(self):
         """Test that older notifications get lower scores"""
-        scorer = PriorityScorer()
-        
         # Same notification at different times
         base_notif = {
             "title": "Important Message",
@@ -131,8 +119,6 @@ class TestPriorityScoring:
     
     def test_night_time_boost(self):
         """Test that night-time notifications get priority boost"""
-        scorer = PriorityScorer()
-        
         # Security notification at 3 AM
         night_time = datetime.now().replace(hour=3, minute=0, second=0)
         night_notif = {
@@ -150,8 +136,6 @@ class TestPriorityScoring:
     
     def test_combined_factors(self):
         """Test notifications with multiple priority factors"""
-        scorer = PriorityScorer()
-        
         # Urgent financial notification
         combined_notif = {
             "title": "URGENT: Your payment failed",